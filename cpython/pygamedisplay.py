@@ -127,6 +127,11 @@ class PygameDisplay:
             src_fb = np.frombuffer(framebuffer, dtype=np.uint8).reshape((height, width))
             src_roi = src_fb[y:y+rh, x:x+rw]
             rgba_roi = self._lut332_rgba[src_roi]
+        elif bpp == 3:
+            src_fb = np.frombuffer(framebuffer, dtype=np.uint8).reshape((height, width, 3))
+            src_roi = src_fb[y:y+rh, x:x+rw].astype(np.uint32)
+            rgba_roi = (255 << 24) | (src_roi[..., 2] << 16) | (src_roi[..., 1] << 8) | src_roi[..., 0]
+            rgba_roi = rgba_roi.astype(np.uint32)
         else:
             src_fb = np.frombuffer(framebuffer, dtype=np.uint16).reshape((height, width))
             src_roi = src_fb[y:y+rh, x:x+rw]
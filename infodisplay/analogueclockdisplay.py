@@ -2,6 +2,7 @@ import math
 import asyncio
 import gc
 import textbox
+from array import array
 
 class AnalogueClockDisplay:
     def __init__(self, display, time, start_y):
@@ -23,6 +24,9 @@ class AnalogueClockDisplay:
         self._last_hour = -1
         self._last_minute = -1
         self._last_second = -1
+        self._dial = None
+        # (x, y, w, h) of each hand drawn last tick
+        self._hand_rects = ()
 
     CREATION_PRIORITY = 2
 
@@ -42,14 +46,72 @@ class AnalogueClockDisplay:
         self._last_hour = -1
         self._last_minute = -1
         self._last_second = -1
-        
-        # Clear our section of the screen
+        self._hand_rects = ()
+
+        # Clear our section of the screen and draw the static face once
         self.display.rect(0, self.y_start, self.display_width, self.avail_height, 0x000000, True)
-        
-        while True:
-            await self.update()
-            # Update often enough to feel responsive when the second turns
-            await asyncio.sleep(0.1)
+        await self._draw_dial()
+        self._save_dial()
+        # Ticks only push the hands, so send the cleared section and face now
+        self.display.update((0, self.y_start, self.display_width, self.avail_height))
+
+        try:
+            while True:
+                await self.update()
+                # Update often enough to feel responsive when the second turns
+                await asyncio.sleep(0.1)
+        finally:
+            # Don't hold the face copy while other screens run
+            self._dial = None
+            self._hand_rects = ()
+
+    def _dial_rect(self):
+        # The square the hands and centre point sweep (longest hand plus
+        # half the thickest hand), clipped to our section
+        half = int(self.radius * 0.9) + 6
+        x0 = max(0, self.cx - half)
+        y0 = max(self.y_start, self.cy - half)
+        x1 = min(self.display_width, self.cx + half + 1)
+        y1 = min(self.display_height, self.cy + half + 1)
+        return x0, y0, x1 - x0, y1 - y0
+
+    def _save_dial(self):
+        # Keep the face under the hands so each tick restores it with row
+        # copies instead of redrawing ticks and numerals. Costs
+        # w * h * bytes_per_pixel; without the memory, every tick redraws
+        # the whole clock as before.
+        self._dial = None
+        gc.collect()
+        x, y, w, h = self._dial_rect()
+        bpp = self.display.bytes_per_pixel
+        try:
+            dial = bytearray(w * h * bpp)
+        except MemoryError:
+            return
+        fb = memoryview(self.display._framebuffer)
+        row = w * bpp
+        stride = self.display_width * bpp
+        for r in range(h):
+            o = (y + r) * stride + x * bpp
+            dial[r * row:(r + 1) * row] = fb[o:o + row]
+        self._dial = dial
+
+    def _restore_dial(self, rect):
+        dx, dy, dw, dh = self._dial_rect()
+        x0 = max(rect[0], dx); y0 = max(rect[1], dy)
+        x1 = min(rect[0] + rect[2], dx + dw); y1 = min(rect[1] + rect[3], dy + dh)
+        if x1 <= x0 or y1 <= y0:
+            return
+        bpp = self.display.bytes_per_pixel
+        fb = memoryview(self.display._framebuffer)
+        dial = memoryview(self._dial)
+        n = (x1 - x0) * bpp
+        stride = self.display_width * bpp
+        row = dw * bpp
+        for y in range(y0, y1):
+            o = y * stride + x0 * bpp
+            s = (y - dy) * row + (x0 - dx) * bpp
+            fb[o:o + n] = dial[s:s + n]
 
     async def update(self):
         now = self.time.local_time()
@@ -63,10 +125,34 @@ class AnalogueClockDisplay:
         self._last_hour = hour
         self._last_minute = minute
         self._last_second = second
-        
-        # Clear the display area allocated to this module
-        self.display.rect(0, self.y_start, self.display_width, self.avail_height, 0x000000, True)
-        
+
+        if self._dial is None:
+            # No cached face: clear and redraw the whole clock
+            self.display.rect(0, self.y_start, self.display_width, self.avail_height, 0x000000, True)
+            await self._draw_dial()
+            self._draw_hands(hour, minute, second)
+            self.display.update((0, self.y_start, self.display_width, self.avail_height))
+            return
+
+        # Put back the face under the previous hands, draw the new ones and
+        # push each hand's old and new box. Separate boxes, since the union
+        # of hands pointing different ways is most of the dial.
+        old = self._hand_rects
+        for rect in old:
+            self._restore_dial(rect)
+        new = []
+        for x0, y0, x1, y1 in self._draw_hands(hour, minute, second):
+            x0 = max(x0, 0); y0 = max(y0, self.y_start)
+            x1 = min(x1, self.display_width); y1 = min(y1, self.display_height)
+            new.append((x0, y0, x1 - x0, y1 - y0))
+        self._hand_rects = new
+        for rect in old:
+            if rect not in new:
+                self.display.update(rect)
+        for rect in new:
+            self.display.update(rect)
+
+    async def _draw_dial(self):
         # Draw clock face circle boundary
         try:
             # Thicken the clock frame by drawing multiple concentric ellipses
@@ -110,44 +196,45 @@ class AnalogueClockDisplay:
             
             await textbox.draw_textbox(self.display, str(number), bx, by, box_size, box_size, color=0xFFFFFF, font='small', align='center', valign='middle')
 
-            
-        # Draw hands
-        # Helper to draw a thick line for hands
-        def draw_thick_hand(angle, length, thickness, color):
-            hx = int(self.cx + math.cos(angle) * length)
-            hy = int(self.cy + math.sin(angle) * length)
-            
-            # Try to use poly for filled thick hand, fallback to multiple lines
-            import array
+    def _draw_hand(self, angle, length, thickness, color):
+        """Draw a thick hand from the centre; returns its (x0, y0, x1, y1)
+        bounds, x1/y1 exclusive."""
+        hx = self.cx + math.cos(angle) * length
+        hy = self.cy + math.sin(angle) * length
+        
+        try:
+            # Anti-aliased, fractional end so the tip moves smoothly
+            self.display.aa_line(self.cx, self.cy, hx, hy, thickness, color)
+        except AttributeError:
+            # Fallback to a filled poly for displays without aa_line
             nx = math.cos(angle + math.pi/2) * (thickness / 2.0)
             ny = math.sin(angle + math.pi/2) * (thickness / 2.0)
-            
-            try:
-                pts = array.array('h', [
-                    int(self.cx - nx), int(self.cy - ny),
-                    int(hx - nx), int(hy - ny),
-                    int(hx + nx), int(hy + ny),
-                    int(self.cx + nx), int(self.cy + ny)
-                ])
-                self.display.poly(0, 0, pts, color, True)
-            except (AttributeError, TypeError, ValueError):
-                # Fallback to drawing parallel lines
-                for r in range(-thickness//2, thickness//2 + 1):
-                    ox = int(math.cos(angle + math.pi/2) * r)
-                    oy = int(math.sin(angle + math.pi/2) * r)
-                    self.display.line(self.cx + ox, self.cy + oy, hx + ox, hy + oy, color)
+            pts = array('h', [
+                int(self.cx - nx), int(self.cy - ny),
+                int(hx - nx), int(hy - ny),
+                int(hx + nx), int(hy + ny),
+                int(self.cx + nx), int(self.cy + ny)
+            ])
+            self.display.poly(0, 0, pts, color, True)
+        # Half the thickness plus the edge and butt-end pixels
+        pad = thickness // 2 + 2
+        hx = int(hx); hy = int(hy)
+        return (min(self.cx, hx) - pad, min(self.cy, hy) - pad, max(self.cx, hx) + pad + 2, max(self.cy, hy) + pad + 2)
 
+    def _draw_hands(self, hour, minute, second):
+        """Draw the hands and centre point; returns the (x0, y0, x1, y1) of
+        each hand, each covering the centre point too."""
         # Hour hand (short and very thick)
         hour_angle = (hour % 12 + minute / 60) * math.pi / 6 - math.pi / 2
-        draw_thick_hand(hour_angle, self.radius * 0.5, 8, 0xFFFFFF)
+        hour_box = self._draw_hand(hour_angle, self.radius * 0.5, 8, 0xFFFFFF)
         
         # Minute hand (longer and medium thick)
         min_angle = (minute + second / 60) * math.pi / 30 - math.pi / 2
-        draw_thick_hand(min_angle, self.radius * 0.8, 4, 0xCCCCCC)
+        min_box = self._draw_hand(min_angle, self.radius * 0.8, 4, 0xCCCCCC)
         
         # Second hand (longest and thin)
         sec_angle = second * math.pi / 30 - math.pi / 2
-        draw_thick_hand(sec_angle, self.radius * 0.9, 2, 0xFF0000)
+        sec_box = self._draw_hand(sec_angle, self.radius * 0.9, 2, 0xFF0000)
         
         # Draw center point
         try:
@@ -155,6 +242,6 @@ class AnalogueClockDisplay:
             self.display.ellipse(self.cx, self.cy, 2, 2, 0x000000, True)
         except AttributeError:
             pass
-            
-        # Only update our region
-        self.display.update((0, self.y_start, self.display_width, self.avail_height))
+        cx0 = self.cx - 6; cy0 = self.cy - 6; cx1 = self.cx + 7; cy1 = self.cy + 7
+        return [(min(x0, cx0), min(y0, cy0), max(x1, cx1), max(y1, cy1))
+                for x0, y0, x1, y1 in (hour_box, min_box, sec_box)]
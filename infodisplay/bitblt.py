@@ -141,11 +141,341 @@ def _blit_rect_gs8_to_8bit_palette_viper(dest: ptr8, d_off: int, d_stride: int,
                 if val != key:
                     dest[d_p + x] = palette[val]
 
+# RGB888 destinations (3 bytes per pixel, R,G,B): d_off/d_stride stay in
+# pixels like the other kernels and are scaled to bytes here
+
+@micropython.viper
+def _blit_rect_gs8_to_888_palette_viper(dest: ptr8, d_off: int, d_stride: int,
+                                 src: ptr8, s_off: int, s_stride: int,
+                                 w: int, h: int, palette: ptr8, key: int):
+    for y in range(h):
+        d_p = (d_off + y * d_stride) * 3
+        s_p = s_off + y * s_stride
+        for x in range(w):
+            val = int(src[s_p + x])
+            if val != key:
+                p = val * 3
+                dest[d_p] = palette[p]
+                dest[d_p + 1] = palette[p + 1]
+                dest[d_p + 2] = palette[p + 2]
+            d_p += 3
+
+@micropython.viper
+def _blit_rect_gs8_to_888_direct_viper(dest: ptr8, d_off: int, d_stride: int,
+                                 src: ptr8, s_off: int, s_stride: int,
+                                 w: int, h: int, key: int):
+    for y in range(h):
+        d_p = (d_off + y * d_stride) * 3
+        s_p = s_off + y * s_stride
+        for x in range(w):
+            val = int(src[s_p + x])
+            if val != key:
+                dest[d_p] = val
+                dest[d_p + 1] = val
+                dest[d_p + 2] = val
+            d_p += 3
+
+@micropython.viper
+def _blit_rect_rgb565_to_888_viper(dest: ptr8, d_off: int, d_stride: int,
+                                 src: ptr16, s_off: int, s_stride: int,
+                                 w: int, h: int, key: int):
+    for y in range(h):
+        d_p = (d_off + y * d_stride) * 3
+        s_p = s_off + y * s_stride
+        for x in range(w):
+            val = int(src[s_p + x])
+            if val != key:
+                dest[d_p] = (val >> 8) & 0xF8
+                dest[d_p + 1] = (val >> 3) & 0xFC
+                dest[d_p + 2] = (val << 3) & 0xF8
+            d_p += 3
+
+# --- GS8 coverage blended over the destination ---
+# The source byte is alpha for one packed colour: 0 leaves the
+# destination alone, 255 stores the colour, anything between reads the
+# destination pixel and mixes each channel towards the colour. Edges then
+# blend into whatever is already drawn rather than towards black, so text
+# needs no pre-clear. a + (a >> 7) maps 0..255 onto 0..256, so the
+# rounded >> 8 is exact at both ends.
+
+@micropython.viper
+def _blit_rect_gs8_alpha_to_rgb565_viper(dest: ptr16, d_off: int, d_stride: int,
+                                         src: ptr8, s_off: int, s_stride: int,
+                                         w: int, h: int, color: int):
+    cr = (color >> 11) & 0x1F
+    cg = (color >> 5) & 0x3F
+    cb = color & 0x1F
+    for y in range(h):
+        s_p = s_off + y * s_stride
+        d_p = d_off + y * d_stride
+        for x in range(w):
+            a = int(src[s_p + x])
+            if a == 0:
+                continue
+            if a == 255:
+                dest[d_p + x] = color
+                continue
+            a += a >> 7
+            d = int(dest[d_p + x])
+            dr = (d >> 11) & 0x1F
+            dg = (d >> 5) & 0x3F
+            db = d & 0x1F
+            dr += ((cr - dr) * a + 128) >> 8
+            dg += ((cg - dg) * a + 128) >> 8
+            db += ((cb - db) * a + 128) >> 8
+            dest[d_p + x] = (dr << 11) | (dg << 5) | db
+
+@micropython.viper
+def _blit_rect_gs8_alpha_to_8bit_viper(dest: ptr8, d_off: int, d_stride: int,
+                                       src: ptr8, s_off: int, s_stride: int,
+                                       w: int, h: int, color: int):
+    # RGB332
+    cr = (color >> 5) & 0x07
+    cg = (color >> 2) & 0x07
+    cb = color & 0x03
+    for y in range(h):
+        s_p = s_off + y * s_stride
+        d_p = d_off + y * d_stride
+        for x in range(w):
+            a = int(src[s_p + x])
+            if a == 0:
+                continue
+            if a == 255:
+                dest[d_p + x] = color
+                continue
+            a += a >> 7
+            d = int(dest[d_p + x])
+            dr = (d >> 5) & 0x07
+            dg = (d >> 2) & 0x07
+            db = d & 0x03
+            dr += ((cr - dr) * a + 128) >> 8
+            dg += ((cg - dg) * a + 128) >> 8
+            db += ((cb - db) * a + 128) >> 8
+            dest[d_p + x] = (dr << 5) | (dg << 2) | db
+
+@micropython.viper
+def _blit_rect_gs8_alpha_to_888_viper(dest: ptr8, d_off: int, d_stride: int,
+                                      src: ptr8, s_off: int, s_stride: int,
+                                      w: int, h: int, color: int):
+    cr = (color >> 16) & 0xFF
+    cg = (color >> 8) & 0xFF
+    cb = color & 0xFF
+    for y in range(h):
+        s_p = s_off + y * s_stride
+        d_p = (d_off + y * d_stride) * 3
+        for x in range(w):
+            a = int(src[s_p + x])
+            if a == 255:
+                dest[d_p] = cr; dest[d_p + 1] = cg; dest[d_p + 2] = cb
+            elif a != 0:
+                a += a >> 7
+                d = int(dest[d_p])
+                dest[d_p] = d + (((cr - d) * a + 128) >> 8)
+                d = int(dest[d_p + 1])
+                dest[d_p + 1] = d + (((cg - d) * a + 128) >> 8)
+                d = int(dest[d_p + 2])
+                dest[d_p + 2] = d + (((cb - d) * a + 128) >> 8)
+            d_p += 3
+
+# --- Scaled GS8 blits (palette required) ---
+# Destination-driven: dest pixel (i, j) samples source (fx0 + i*step,
+# fy0 + j*step) in Q16, so any scale_up/scale_down ratio works and
+# clipping is just a start offset. Nearest samples pixel centres; box != 0
+# instead averages the 2x2 source block at the sample point (clamped to
+# the glyph), which keeps thin strokes when shrinking.
+
+@micropython.viper
+def _blit_scaled_gs8_to_rgb565_viper(dest: ptr16, d_off: int, d_stride: int,
+                                     src: ptr8, s_stride: int, s_w: int, s_h: int,
+                                     fx0: int, fy0: int, step: int, w: int, h: int,
+                                     palette: ptr16, key: int, box: int):
+    fy = fy0
+    for y in range(h):
+        sy = fy >> 16
+        if sy >= s_h: sy = s_h - 1
+        row = sy * s_stride
+        row2 = row + s_stride if sy + 1 < s_h else row
+        d_p = d_off + y * d_stride
+        fx = fx0
+        for x in range(w):
+            sx = fx >> 16
+            if sx >= s_w: sx = s_w - 1
+            if box:
+                sx2 = sx + 1 if sx + 1 < s_w else sx
+                val = (int(src[row + sx]) + int(src[row + sx2]) + int(src[row2 + sx]) + int(src[row2 + sx2]) + 2) >> 2
+            else:
+                val = int(src[row + sx])
+            if val != key:
+                dest[d_p + x] = palette[val]
+            fx += step
+        fy += step
+
+@micropython.viper
+def _blit_scaled_gs8_to_8bit_viper(dest: ptr8, d_off: int, d_stride: int,
+                                   src: ptr8, s_stride: int, s_w: int, s_h: int,
+                                   fx0: int, fy0: int, step: int, w: int, h: int,
+                                   palette: ptr8, key: int, box: int):
+    fy = fy0
+    for y in range(h):
+        sy = fy >> 16
+        if sy >= s_h: sy = s_h - 1
+        row = sy * s_stride
+        row2 = row + s_stride if sy + 1 < s_h else row
+        d_p = d_off + y * d_stride
+        fx = fx0
+        for x in range(w):
+            sx = fx >> 16
+            if sx >= s_w: sx = s_w - 1
+            if box:
+                sx2 = sx + 1 if sx + 1 < s_w else sx
+                val = (int(src[row + sx]) + int(src[row + sx2]) + int(src[row2 + sx]) + int(src[row2 + sx2]) + 2) >> 2
+            else:
+                val = int(src[row + sx])
+            if val != key:
+                dest[d_p + x] = palette[val]
+            fx += step
+        fy += step
+
+@micropython.viper
+def _blit_scaled_gs8_to_888_viper(dest: ptr8, d_off: int, d_stride: int,
+                                  src: ptr8, s_stride: int, s_w: int, s_h: int,
+                                  fx0: int, fy0: int, step: int, w: int, h: int,
+                                  palette: ptr8, key: int, box: int):
+    fy = fy0
+    for y in range(h):
+        sy = fy >> 16
+        if sy >= s_h: sy = s_h - 1
+        row = sy * s_stride
+        row2 = row + s_stride if sy + 1 < s_h else row
+        d_p = (d_off + y * d_stride) * 3
+        fx = fx0
+        for x in range(w):
+            sx = fx >> 16
+            if sx >= s_w: sx = s_w - 1
+            if box:
+                sx2 = sx + 1 if sx + 1 < s_w else sx
+                val = (int(src[row + sx]) + int(src[row + sx2]) + int(src[row2 + sx]) + int(src[row2 + sx2]) + 2) >> 2
+            else:
+                val = int(src[row + sx])
+            if val != key:
+                p = val * 3
+                dest[d_p] = palette[p]
+                dest[d_p + 1] = palette[p + 1]
+                dest[d_p + 2] = palette[p + 2]
+            d_p += 3
+            fx += step
+        fy += step
+
+# --- RLE image decode ---
+# Files written by tools/imageconvert.py --rle: a '<HHBB' header (width
+# with RLE_FLAG set, height, bytes per pixel, 0) then each row packed on
+# its own as packets. A control byte c >= 0x80 repeats the next pixel
+# (c & 0x7F) + 1 times; c < 0x80 is followed by c + 1 literal pixels.
+RLE_FLAG = 0x8000
+RLE_HEADER_BYTES = 6
+
+@micropython.viper
+def _rle_decode_row(src: ptr8, s_off: int, s_end: int, row: ptr8, row_bytes: int, bpp: int) -> int:
+    # Returns the offset just past the row's packets, or -1 if the row
+    # isn't complete within src[s_off:s_end] (caller refills and retries)
+    o = 0
+    s = s_off
+    while o < row_bytes:
+        if s >= s_end:
+            return -1
+        c = int(src[s])
+        if c & 0x80:
+            if s + 1 + bpp > s_end:
+                return -1
+            end = o + ((c & 0x7F) + 1) * bpp
+            if end > row_bytes:
+                end = row_bytes
+            if bpp == 1:
+                v = src[s + 1]
+                while o < end:
+                    row[o] = v
+                    o += 1
+            else:
+                while o < end:
+                    k = 0
+                    while k < bpp:
+                        row[o + k] = src[s + 1 + k]
+                        k += 1
+                    o += bpp
+            s += 1 + bpp
+        else:
+            n = (c + 1) * bpp
+            if s + 1 + n > s_end:
+                return -1
+            end = o + n
+            if end > row_bytes:
+                end = row_bytes
+            i = s + 1
+            while o < end:
+                row[o] = src[i]
+                o += 1
+                i += 1
+            s += 1 + n
+    return s
+
+@micropython.viper
+def _move_down(buf: ptr8, off: int, end: int):
+    # Shift buf[off:end] to the front (forward copy: safe as off > 0)
+    i = 0
+    while off < end:
+        buf[i] = buf[off]
+        i += 1
+        off += 1
+
+def _blit_rows(dest_bpp, src_fmt, p_dest, d_off, fb_width, p_src, s_col, s_stride, w, h, p_pal, key, color):
+    if color >= 0 and src_fmt == 6: # GS8 coverage blended in a packed colour
+        if dest_bpp == 2:
+            _blit_rect_gs8_alpha_to_rgb565_viper(p_dest, d_off, fb_width, p_src, s_col, s_stride, w, h, color)
+        elif dest_bpp == 1:
+            _blit_rect_gs8_alpha_to_8bit_viper(p_dest, d_off, fb_width, p_src, s_col, s_stride, w, h, color)
+        elif dest_bpp == 3:
+            _blit_rect_gs8_alpha_to_888_viper(p_dest, d_off, fb_width, p_src, s_col, s_stride, w, h, color)
+        else:
+            raise ValueError(f"Unsupported alpha blit: dest_bpp={dest_bpp}")
+    elif dest_bpp == 2:
+        if src_fmt == 6: # GS8 -> RGB565
+            if p_pal is not None:
+                _blit_rect_gs8_to_rgb565_viper(p_dest, d_off, fb_width, p_src, s_col, s_stride, w, h, p_pal, key)
+            else:
+                _blit_rect_gs8_to_rgb565_direct_viper(p_dest, d_off, fb_width, p_src, s_col, s_stride, w, h, key)
+        elif src_fmt == 1: # RGB565 -> RGB565
+            _blit_rect_rgb565_to_rgb565_viper(p_dest, d_off, fb_width, p_src, s_col, s_stride, w, h, key)
+    elif dest_bpp == 1:
+        if src_fmt == 6: # 8-bit (GS8/RGB332) -> 8-bit
+            if p_pal is not None:
+                _blit_rect_gs8_to_8bit_palette_viper(p_dest, d_off, fb_width, p_src, s_col, s_stride, w, h, p_pal, key)
+            else:
+                _blit_rect_8bit_to_8bit_viper(p_dest, d_off, fb_width, p_src, s_col, s_stride, w, h, key)
+    elif dest_bpp == 3:
+        if src_fmt == 6: # GS8 -> RGB888
+            if p_pal is not None:
+                _blit_rect_gs8_to_888_palette_viper(p_dest, d_off, fb_width, p_src, s_col, s_stride, w, h, p_pal, key)
+            else:
+                _blit_rect_gs8_to_888_direct_viper(p_dest, d_off, fb_width, p_src, s_col, s_stride, w, h, key)
+        elif src_fmt == 1: # RGB565 -> RGB888
+            _blit_rect_rgb565_to_888_viper(p_dest, d_off, fb_width, p_src, s_col, s_stride, w, h, key)
+    else:
+        raise ValueError(f"Unsupported blit: dest_bpp={dest_bpp} src_fmt={src_fmt}")
+
+def _dest_bpp(framebuffer):
+    if not hasattr(framebuffer, '_cached_bpp'):
+        framebuffer._cached_bpp = framebuffer.bytes_per_pixel if hasattr(framebuffer, 'bytes_per_pixel') else 2
+    return framebuffer._cached_bpp
+
 # --- Main Blit API ---
 
 def blit_region(framebuffer, fb_width, fb_height, bytes_per_pixel, fh, header_bytes, src_row_bytes,
-                sx, sy, sw, sh, dx, dy, buffer=None, src_format=None, palette=None, clip=None, key=-1):
-    """ Standard high-performance blit from flash to framebuffer. """
+                sx, sy, sw, sh, dx, dy, buffer=None, src_format=None, palette=None, clip=None, key=-1, color=-1):
+    """ Standard high-performance blit from flash to framebuffer.
+
+    color >= 0 (packed for the destination) treats a GS8 source as
+    coverage and blends that colour over the existing pixels instead of
+    going through palette/key. """
     if sw <= 0 or sh <= 0: return
         
     # 1. Coordinate Clipping
@@ -190,9 +520,7 @@ def blit_region(framebuffer, fb_width, fb_height, bytes_per_pixel, fh, header_by
     rows_per_batch = len(batch_buf) // stride_bytes
 
     # Optimization: Cache dest_bpp and pointers once outside the loop
-    if not hasattr(framebuffer, '_cached_bpp'):
-        framebuffer._cached_bpp = framebuffer.bytes_per_pixel if hasattr(framebuffer, 'bytes_per_pixel') else 2
-    dest_bpp = framebuffer._cached_bpp
+    dest_bpp = _dest_bpp(framebuffer)
 
     p_dest = _as_ptr16(framebuffer) if dest_bpp == 2 else _as_ptr8(framebuffer)
     p_pal = _as_ptr16(palette) if (dest_bpp == 2 and palette is not None) else (_as_ptr8(palette) if palette is not None else None)
@@ -226,22 +554,164 @@ def blit_region(framebuffer, fb_width, fb_height, bytes_per_pixel, fh, header_by
             target[:nbytes] = fh.read(nbytes)
 
         # 4. Fast Path Dispatch
-        if dest_bpp == 2:
-            if src_fmt == 6: # GS8 -> RGB565
-                if p_pal is not None:
-                    _blit_rect_gs8_to_rgb565_viper(p_dest, d_off, fb_width, p_src, s_col, s_stride, copy_width, this_batch_h, p_pal, key)
-                else:
-                    _blit_rect_gs8_to_rgb565_direct_viper(p_dest, d_off, fb_width, p_src, s_col, s_stride, copy_width, this_batch_h, key)
-            elif src_fmt == 1: # RGB565 -> RGB565
-                _blit_rect_rgb565_to_rgb565_viper(p_dest, d_off, fb_width, p_src, s_col, s_stride, copy_width, this_batch_h, key)
-        elif dest_bpp == 1:
-            if src_fmt == 6: # 8-bit (GS8/RGB332) -> 8-bit
-                if p_pal is not None:
-                    _blit_rect_gs8_to_8bit_palette_viper(p_dest, d_off, fb_width, p_src, s_col, s_stride, copy_width, this_batch_h, p_pal, key)
-                else:
-                    _blit_rect_8bit_to_8bit_viper(p_dest, d_off, fb_width, p_src, s_col, s_stride, copy_width, this_batch_h, key)
-        else:
-            raise ValueError(f"Unsupported blit: dest_bpp={dest_bpp} src_fmt={src_fmt}")
+        _blit_rows(dest_bpp, src_fmt, p_dest, d_off, fb_width, p_src, s_col, s_stride,
+                   copy_width, this_batch_h, p_pal, key, color)
 
         d_off += this_batch_h * fb_width
         current_row += this_batch_h
+
+def blit_buffer(framebuffer, fb_width, fb_height, src, src_w, src_h, dx, dy,
+                src_format=6, palette=None, clip=None, key=-1, color=-1):
+    """Blit a packed in-RAM bitmap (rows of src_w pixels) to the framebuffer,
+    clipped like blit_region but without any file access. color blends
+    as in blit_region."""
+    min_x, min_y = 0, 0
+    max_x, max_y = fb_width, fb_height
+    if clip:
+        cx, cy, cw, ch = clip
+        if cx > min_x: min_x = cx
+        if cy > min_y: min_y = cy
+        if cx + cw < max_x: max_x = cx + cw
+        if cy + ch < max_y: max_y = cy + ch
+    if dx >= max_x or dy >= max_y: return
+    if dx + src_w <= min_x or dy + src_h <= min_y: return
+
+    start_row = min_y - dy if dy < min_y else 0
+    end_row = max_y - dy if dy + src_h > max_y else src_h
+    left_clip = min_x - dx if dx < min_x else 0
+    right_clip = dx + src_w - max_x if dx + src_w > max_x else 0
+    copy_width = src_w - left_clip - right_clip
+    if copy_width <= 0 or end_row <= start_row: return
+
+    dest_bpp = _dest_bpp(framebuffer)
+    p_dest = _as_ptr16(framebuffer) if dest_bpp == 2 else _as_ptr8(framebuffer)
+    p_pal = None
+    if palette is not None:
+        p_pal = _as_ptr16(palette) if dest_bpp == 2 else _as_ptr8(palette)
+    p_src = _as_ptr16(src) if src_format == 1 else _as_ptr8(src)
+    _blit_rows(dest_bpp, src_format, p_dest, (dy + start_row) * fb_width + dx + left_clip, fb_width,
+               p_src, start_row * src_w + left_clip, src_w, copy_width, end_row - start_row, p_pal, key, color)
+
+def rle_buffer_size(sw, bytes_per_pixel):
+    """Smallest buffer blit_rle runs in without allocating: one decoded
+    row, then room for two worst-case encoded rows (all literals, a
+    control byte per 128 pixels) of input."""
+    row_bytes = sw * bytes_per_pixel
+    in_min = 2 * (row_bytes + (sw + 127) // 128)
+    return row_bytes + (in_min if in_min > 256 else 256)
+
+def blit_rle(framebuffer, fb_width, fb_height, bytes_per_pixel, fh, sw, sh, dx, dy,
+             buffer=None, src_format=None, palette=None, clip=None, key=-1):
+    """Blit an RLE image (see RLE_FLAG) from fh, positioned just past its
+    header, decoding one row at a time. Rows are converted and clipped
+    exactly as in blit_region; rows below the clip aren't read at all."""
+    if sw <= 0 or sh <= 0: return
+
+    min_x, min_y = 0, 0
+    max_x, max_y = fb_width, fb_height
+    if clip:
+        cx, cy, cw, ch = clip
+        min_x, min_y = max(min_x, cx), max(min_y, cy)
+        max_x, max_y = min(max_x, cx + cw), min(max_y, cy + ch)
+    if dx >= max_x or dy >= max_y: return
+    if dx + sw <= min_x or dy + sh <= min_y: return
+
+    start_row = max(0, min_y - dy)
+    end_row = min(sh, max_y - dy)
+    left_clip = max(0, min_x - dx)
+    right_clip = max(0, dx + sw - max_x)
+    copy_width = sw - left_clip - right_clip
+    if copy_width <= 0: return
+
+    if src_format is None:
+        src_fmt = 1 if bytes_per_pixel == 2 else 6
+    else:
+        src_fmt = src_format
+
+    row_bytes = sw * bytes_per_pixel
+    if buffer is None or len(buffer) < rle_buffer_size(sw, bytes_per_pixel):
+        buffer = bytearray(rle_buffer_size(sw, bytes_per_pixel))
+    mv = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+    row = mv[:row_bytes]
+    inbuf = mv[row_bytes:]
+    in_len = len(inbuf)
+
+    dest_bpp = _dest_bpp(framebuffer)
+    p_dest = _as_ptr16(framebuffer) if dest_bpp == 2 else _as_ptr8(framebuffer)
+    p_pal = _as_ptr16(palette) if (dest_bpp == 2 and palette is not None) else (_as_ptr8(palette) if palette is not None else None)
+    p_row8 = _as_ptr8(row)
+    p_row = _as_ptr16(row) if src_fmt == 1 else p_row8
+    p_in = _as_ptr8(inbuf)
+
+    d_off = (dy + start_row) * fb_width + dx + left_clip
+    off = 0
+    filled = 0
+    for r in range(end_row):
+        while True:
+            nxt = _rle_decode_row(p_in, off, filled, p_row8, row_bytes, bytes_per_pixel)
+            if nxt >= 0: break
+            if off:
+                _move_down(p_in, off, filled)
+                filled -= off
+                off = 0
+            if filled == in_len:
+                raise ValueError("RLE row exceeds buffer")
+            if IS_MICROPYTHON:
+                got = fh.readinto(inbuf[filled:])
+            else:
+                data = fh.read(in_len - filled)
+                got = len(data)
+                inbuf[filled:filled + got] = data
+            if not got: return # truncated file: keep what was drawn
+            filled += got
+        off = nxt
+        if r >= start_row:
+            _blit_rows(dest_bpp, src_fmt, p_dest, d_off, fb_width, p_row, left_clip, sw,
+                       copy_width, 1, p_pal, key, -1)
+            d_off += fb_width
+
+def blit_buffer_scaled(framebuffer, fb_width, fb_height, src, src_w, src_h, dx, dy,
+                       scale_up, scale_down, palette, clip=None, key=-1, box=None):
+    """Blit a packed in-RAM GS8 bitmap through a palette, resized by
+    scale_up/scale_down. Nearest-neighbour by default; box (defaults to
+    on when shrinking by 2 or more) applies a 2x2 box filter instead."""
+    dw = (src_w * scale_up + scale_down - 1) // scale_down
+    dh = (src_h * scale_up + scale_down - 1) // scale_down
+    min_x, min_y = 0, 0
+    max_x, max_y = fb_width, fb_height
+    if clip:
+        cx, cy, cw, ch = clip
+        if cx > min_x: min_x = cx
+        if cy > min_y: min_y = cy
+        if cx + cw < max_x: max_x = cx + cw
+        if cy + ch < max_y: max_y = cy + ch
+    if dx >= max_x or dy >= max_y: return
+    if dx + dw <= min_x or dy + dh <= min_y: return
+
+    start_row = min_y - dy if dy < min_y else 0
+    end_row = max_y - dy if dy + dh > max_y else dh
+    left_clip = min_x - dx if dx < min_x else 0
+    right_clip = dx + dw - max_x if dx + dw > max_x else 0
+    copy_width = dw - left_clip - right_clip
+    if copy_width <= 0 or end_row <= start_row: return
+
+    step = (scale_down << 16) // scale_up
+    if box is None:
+        box = scale_down >= 2 * scale_up
+    bias = 0 if box else step >> 1
+    d_off = (dy + start_row) * fb_width + dx + left_clip
+    dest_bpp = _dest_bpp(framebuffer)
+    p_src = _as_ptr8(src)
+    args = (p_src, src_w, src_w, src_h, left_clip * step + bias, start_row * step + bias, step,
+            copy_width, end_row - start_row)
+    if dest_bpp == 2:
+        _blit_scaled_gs8_to_rgb565_viper(_as_ptr16(framebuffer), d_off, fb_width, *args,
+                                         _as_ptr16(palette), key, 1 if box else 0)
+    elif dest_bpp == 1:
+        _blit_scaled_gs8_to_8bit_viper(_as_ptr8(framebuffer), d_off, fb_width, *args,
+                                       _as_ptr8(palette), key, 1 if box else 0)
+    elif dest_bpp == 3:
+        _blit_scaled_gs8_to_888_viper(_as_ptr8(framebuffer), d_off, fb_width, *args,
+                                      _as_ptr8(palette), key, 1 if box else 0)
+    else:
+        raise ValueError(f"Unsupported scaled blit: dest_bpp={dest_bpp}")
@@ -1,7 +1,7 @@
 import struct
 import gc
 
-from bitblt import blit_region, _as_ptr16, _as_ptr8
+from bitblt import blit_region, blit_buffer, blit_buffer_scaled, _as_ptr16, _as_ptr8
 
 # Glyphs are stored compactly in a bytearray to minimize RAM.
 # Packed layout (little-endian): x,y,width,height (uint16), xoffset,yoffset,xadvance (int16), page (uint8)
@@ -28,6 +28,14 @@ def _build_palette_bytes(tint_color, bytes_per_pixel):
             pal[o] = val & 0xFF
             pal[o + 1] = (val >> 8) & 0xFF
             o += 2
+    elif bytes_per_pixel == 3:
+        pal = bytearray(256 * 3)
+        o = 0
+        for i in range(256):
+            pal[o] = (r * i) // 255
+            pal[o + 1] = (g * i) // 255
+            pal[o + 2] = (b * i) // 255
+            o += 3
     else:
         pal = bytearray(256)
         for i in range(256):
@@ -38,6 +46,14 @@ def _build_palette_bytes(tint_color, bytes_per_pixel):
             pal[i] = val
     return pal
 
+def _palette_color(pal, bytes_per_pixel):
+    """The full-coverage entry of a tinted palette: the packed text colour."""
+    if bytes_per_pixel == 2:
+        return pal[510] | (pal[511] << 8)
+    if bytes_per_pixel == 3:
+        return (pal[765] << 16) | (pal[766] << 8) | pal[767]
+    return pal[255]
+
 _PALETTE_CACHE = {}
 _PALETTE_CACHE_LIMIT = 16
 
@@ -48,7 +64,7 @@ def _resolve_palette(tint_color, bytes_per_pixel):
     tint = tint_color if isinstance(tint_color, int) else 0xFFFFFF
     # int key instead of a tuple: fits a small int, so the cache-hit path
     # (every draw_text call) doesn't allocate
-    cache_key = (tint << 1) | (bytes_per_pixel - 1)
+    cache_key = (tint << 2) | (bytes_per_pixel - 1)
     pal = _PALETTE_CACHE.get(cache_key)
     if pal is not None: return pal
     pal = _build_palette_bytes(tint, bytes_per_pixel)
@@ -58,8 +74,89 @@ def _resolve_palette(tint_color, bytes_per_pixel):
     _PALETTE_CACHE[cache_key] = pal
     return pal
 
+# LRU glyph cache: recently drawn glyphs kept as packed GS8 strips
+# (width * height bytes) so repeat draws never touch the page file.
+# Keys are (font id << 21) | codepoint -- an int, so lookups don't
+# allocate -- and values are [last_use, bitmap]. Hits just restamp the
+# entry; finding the oldest entry is a scan, paid only when a miss has
+# to evict. Off until the display config sets glyph_cache_bytes.
+_GLYPH_CACHE = {}
+_glyph_cache_budget = 0
+_glyph_cache_bytes = 0
+_glyph_cache_tick = 0
+_glyph_cache_hits = 0
+_glyph_cache_misses = 0
+_next_font_id = 0
+
+def set_glyph_cache_budget(nbytes):
+    """Set the glyph cache size in bytes (0 disables it), evicting as needed."""
+    global _glyph_cache_budget
+    _glyph_cache_budget = nbytes
+    _evict_glyphs(0)
+
+def clear_glyph_cache():
+    """Drop every cached glyph and reset the hit/miss counters."""
+    global _glyph_cache_bytes, _glyph_cache_hits, _glyph_cache_misses
+    _GLYPH_CACHE.clear()
+    _glyph_cache_bytes = 0
+    _glyph_cache_hits = 0
+    _glyph_cache_misses = 0
+
+def glyph_cache_stats():
+    """Return (entries, bytes, hits, misses)."""
+    return len(_GLYPH_CACHE), _glyph_cache_bytes, _glyph_cache_hits, _glyph_cache_misses
+
+def _evict_glyphs(incoming):
+    global _glyph_cache_bytes
+    cache = _GLYPH_CACHE
+    while cache and _glyph_cache_bytes + incoming > _glyph_cache_budget:
+        oldest_key = None
+        oldest = 0
+        for k in cache:
+            t = cache[k][0]
+            if oldest_key is None or t < oldest:
+                oldest_key = k
+                oldest = t
+        _glyph_cache_bytes -= len(cache.pop(oldest_key)[1])
+
+# Uncached scaled glyphs are read here when the caller's linebuf is too
+# small, growing only for a bigger glyph than any before
+_glyph_scratch = bytearray(0)
+
+def _scratch_for(linebuf, nbytes):
+    global _glyph_scratch
+    if linebuf is not None and len(linebuf) >= nbytes:
+        return linebuf
+    if len(_glyph_scratch) < nbytes:
+        _glyph_scratch = bytearray(nbytes)
+    return _glyph_scratch
+
+def _read_glyph(fh, row_bytes, src_x, src_y, width, height, bmp=None):
+    # Packed rows at the start of bmp (a new bytearray when None)
+    if bmp is None:
+        bmp = bytearray(width * height)
+    mv = memoryview(bmp)
+    o = 0
+    for r in range(height):
+        fh.seek(4 + (src_y + r) * row_bytes + src_x)
+        fh.readinto(mv[o:o + width])
+        o += width
+    return bmp
+
+def _load_glyph(fh, row_bytes, src_x, src_y, width, height):
+    global _glyph_cache_bytes, _glyph_cache_tick
+    bmp = _read_glyph(fh, row_bytes, src_x, src_y, width, height)
+    _evict_glyphs(len(bmp))
+    _glyph_cache_tick += 1
+    _glyph_cache_bytes += len(bmp)
+    return bmp
+
 class BMFont:
     def __init__(self):
+        global _next_font_id
+        # Distinguishes this font's glyphs in the shared glyph cache
+        self._cache_id = _next_font_id << 21
+        _next_font_id += 1
         self.line_height = 0
         self.base = 0
         self.scale_w = 0
@@ -146,7 +243,11 @@ class BMFont:
                     font.kerning[(first, second)] = amount
         return font
 
-def draw_text(framebuffer, display_width, display_height, font: BMFont, page_files, text, x, y, kerning=False, scale_up=1, scale_down=1, color=None, linebuf=None, clip=None):
+def draw_text(framebuffer, display_width, display_height, font: BMFont, page_files, text, x, y, kerning=False, scale_up=1, scale_down=1, color=None, linebuf=None, clip=None, blend=False):
+    # blend: alpha-blend glyph coverage over what's already drawn instead
+    # of painting the tinted palette with 0 as the transparent key, so
+    # anti-aliased edges don't darken on coloured backgrounds. Scaled
+    # text still goes through the palette.
     # GS8 source atlases: one byte per pixel per row
     row_bytes = font.scale_w
     
@@ -155,6 +256,7 @@ def draw_text(framebuffer, display_width, display_height, font: BMFont, page_fil
     
     # Resolve tinted palette for font rendering (GS8 -> Dest)
     palette = _resolve_palette(color, bytes_per_pixel)
+    blend_color = _palette_color(palette, bytes_per_pixel) if blend else -1
 
     # Dicts keyed by page id and lists/tuples index identically via
     # pages[page], so pass them through rather than rebuilding a dict on
@@ -170,6 +272,17 @@ def draw_text(framebuffer, display_width, display_height, font: BMFont, page_fil
     # Scale fast path
     is_scaled = (scale_up != 1 or scale_down != 1)
 
+    global _glyph_cache_tick, _glyph_cache_hits, _glyph_cache_misses
+    cache = _GLYPH_CACHE
+    if _glyph_cache_tick > 0x10000000:
+        # Keep the stamps small ints (no heap allocation per hit):
+        # restart the clock, keeping only the last-use order
+        for k in cache:
+            cache[k][0] = 0
+        _glyph_cache_tick = 0
+    budget = _glyph_cache_budget
+    font_key = font._cache_id
+
     cx, cy = x, y
     prev_id = None
     for ch in text:
@@ -199,27 +312,60 @@ def draw_text(framebuffer, display_width, display_height, font: BMFont, page_fil
         if is_scaled:
             dest_x = cx + (xo * scale_up) // scale_down
             dest_y = cy + (yo * scale_up) // scale_down
+            dest_w = (width * scale_up + scale_down - 1) // scale_down
+            dest_h = (height * scale_up + scale_down - 1) // scale_down
         else:
             dest_x = cx + xo
             dest_y = cy + yo
+            dest_w = width
+            dest_h = height
         
-        # Quick bounds check (rejection) before calling blit_region.
+        # Quick bounds check (rejection) before touching the cache or
+        # the page file; clipped draws are left to the blitters.
         # Positional args throughout: keyword calls build a dict per
         # glyph in MicroPython, and this runs for every character drawn.
-        if not clip:
-            if dest_x >= display_width or dest_y >= display_height: pass
-            elif dest_x + width <= 0 or dest_y + height <= 0: pass
+        if width == 0 or height == 0: pass
+        elif not clip and (dest_x >= display_width or dest_y >= display_height): pass
+        elif not clip and (dest_x + dest_w <= 0 or dest_y + dest_h <= 0): pass
+        elif is_scaled:
+            # Scaling needs the whole glyph in RAM: take it from the
+            # cache, or read it (caching it when it fits the budget)
+            entry = cache.get(font_key | code)
+            if entry is not None:
+                _glyph_cache_tick += 1
+                entry[0] = _glyph_cache_tick
+                _glyph_cache_hits += 1
+                bmp = entry[1]
+            elif width * height <= budget:
+                _glyph_cache_misses += 1
+                bmp = _load_glyph(pages[page], row_bytes, src_x, src_y, width, height)
+                cache[font_key | code] = [_glyph_cache_tick, bmp]
+            else:
+                # Not cached: read into scratch rather than allocate a
+                # bitmap per glyph per draw
+                bmp = _read_glyph(pages[page], row_bytes, src_x, src_y, width, height,
+                                  _scratch_for(linebuf, width * height))
+            blit_buffer_scaled(framebuffer, display_width, display_height, bmp, width, height,
+                               dest_x, dest_y, scale_up, scale_down, palette, clip, 0)
+        else:
+            entry = cache.get(font_key | code)
+            if entry is not None:
+                _glyph_cache_tick += 1
+                entry[0] = _glyph_cache_tick
+                _glyph_cache_hits += 1
+                blit_buffer(framebuffer, display_width, display_height, entry[1], width, height,
+                            dest_x, dest_y, 6, palette, clip, 0, blend_color)
+            elif width * height <= budget:
+                _glyph_cache_misses += 1
+                bmp = _load_glyph(pages[page], row_bytes, src_x, src_y, width, height)
+                cache[font_key | code] = [_glyph_cache_tick, bmp]
+                blit_buffer(framebuffer, display_width, display_height, bmp, width, height,
+                            dest_x, dest_y, 6, palette, clip, 0, blend_color)
             else:
                 blit_region(framebuffer, display_width, display_height, 1,
                             pages[page], 4, row_bytes,
                             src_x, src_y, width, height,
-                            dest_x, dest_y, linebuf, 6, palette, clip, 0)
-        else:
-            # Complex clipping case - let blit_region handle it
-            blit_region(framebuffer, display_width, display_height, 1,
-                        pages[page], 4, row_bytes,
-                        src_x, src_y, width, height,
-                        dest_x, dest_y, linebuf, 6, palette, clip, 0)
+                            dest_x, dest_y, linebuf, 6, palette, clip, 0, blend_color)
         
         cx += (xa * scale_up) // scale_down if is_scaled else xa
         prev_id = code
@@ -2,6 +2,9 @@ import asyncio
 import sys
 from array import array
 
+from bitblt import _as_ptr8, _as_ptr16
+from raster import pack_rgb
+
 try:
     import micropython
     IS_MICROPYTHON = sys.implementation.name == 'micropython'
@@ -16,22 +19,6 @@ if not IS_MICROPYTHON:
 
     ptr8 = ptr16 = ptr32 = object
 
-    def _as_ptr8(obj):
-        if hasattr(obj, '_framebuffer'): return memoryview(obj._framebuffer).cast('B')
-        if hasattr(obj, '_buf'): return memoryview(obj._buf).cast('B')
-        return memoryview(obj).cast('B')
-
-    def _as_ptr16(obj):
-        if hasattr(obj, '_framebuffer'): return memoryview(obj._framebuffer).cast('H')
-        if hasattr(obj, '_buf'): return memoryview(obj._buf).cast('H')
-        return memoryview(obj).cast('H')
-else:
-    def _as_ptr8(obj):
-        if hasattr(obj, '_framebuffer'): return obj._framebuffer
-        if hasattr(obj, '_buf'): return obj._buf
-        return obj
-    _as_ptr16 = _as_ptr8
-
 def catmull_rom(p0, p1, p2, p3, t):
     return (
         0.5
@@ -261,6 +248,11 @@ def _render_cols_viper(dest8: ptr8, dest16: ptr16, cols: ptr32, p: ptr32):
                         g = (((v >> 3) & 0xFC) * ia + int(p[15]) * cov) >> 8
                         b = (((v << 3) & 0xF8) * ia + int(p[16]) * cov) >> 8
                         dest16[o] = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+                    elif bpp == 3:
+                        o = at * stride + xpix * 3
+                        dest8[o] = (int(dest8[o]) * ia + int(p[14]) * cov) >> 8
+                        dest8[o + 1] = (int(dest8[o + 1]) * ia + int(p[15]) * cov) >> 8
+                        dest8[o + 2] = (int(dest8[o + 2]) * ia + int(p[16]) * cov) >> 8
                     else:
                         o = at * stride + xpix
                         v = int(dest8[o])
@@ -278,6 +270,14 @@ def _render_cols_viper(dest8: ptr8, dest16: ptr16, cols: ptr32, p: ptr32):
                         dest16[o] = a_pack
                         o += fbw
                         j += 1
+                elif bpp == 3:
+                    o = j * stride + xpix * 3
+                    while j < ybase:
+                        dest8[o] = int(p[14])
+                        dest8[o + 1] = int(p[15])
+                        dest8[o + 2] = int(p[16])
+                        o += stride
+                        j += 1
                 else:
                     a_pack = int(p[18])
                     o = j * stride + xpix
@@ -314,6 +314,11 @@ def _render_cols_viper(dest8: ptr8, dest16: ptr16, cols: ptr32, p: ptr32):
                     if cov >= 256:
                         if bpp == 2:
                             dest16[j * fbw + xpix] = int(p[17])
+                        elif bpp == 3:
+                            o = j * stride + xpix * 3
+                            dest8[o] = int(p[11])
+                            dest8[o + 1] = int(p[12])
+                            dest8[o + 2] = int(p[13])
                         else:
                             dest8[j * stride + xpix] = int(p[17])
                     else:
@@ -325,6 +330,11 @@ def _render_cols_viper(dest8: ptr8, dest16: ptr16, cols: ptr32, p: ptr32):
                             g = (((v >> 3) & 0xFC) * ia + int(p[12]) * cov) >> 8
                             b = (((v << 3) & 0xF8) * ia + int(p[13]) * cov) >> 8
                             dest16[o] = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+                        elif bpp == 3:
+                            o = j * stride + xpix * 3
+                            dest8[o] = (int(dest8[o]) * ia + int(p[11]) * cov) >> 8
+                            dest8[o + 1] = (int(dest8[o + 1]) * ia + int(p[12]) * cov) >> 8
+                            dest8[o + 2] = (int(dest8[o + 2]) * ia + int(p[13]) * cov) >> 8
                         else:
                             o = j * stride + xpix
                             v = int(dest8[o])
@@ -336,12 +346,6 @@ def _render_cols_viper(dest8: ptr8, dest16: ptr16, cols: ptr32, p: ptr32):
         c += 1
 
 
-def _pack_color(bpp, r, g, b):
-    if bpp == 2:
-        return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
-    return (r & 0xE0) | ((g & 0xE0) >> 3) | ((b & 0xC0) >> 6)
-
-
 async def _render_columns(display, x, y, width, height, raw_values, normalized_values, color_fn, smoothing, has_area, alpha_divisor, has_line, radius):
     if not normalized_values or not raw_values or len(normalized_values) != len(raw_values):
         return
@@ -385,12 +389,16 @@ async def _render_columns(display, x, y, width, height, raw_values, normalized_v
             p[1] = c_end
             p[11] = r; p[12] = g; p[13] = b
             p[14] = r // d; p[15] = g // d; p[16] = b // d
-            p[17] = _pack_color(bpp, r, g, b)
-            p[18] = _pack_color(bpp, r // d, g // d, b // d)
+            p[17] = pack_rgb(bpp, r, g, b)
+            p[18] = pack_rgb(bpp, r // d, g // d, b // d)
             _render_cols_viper(d8, d16, cols, p)
             c = c_end
             await asyncio.sleep(0)
 
+        # Columns 0..width inclusive; points overshoot by their radius
+        r = int(radius) + 1
+        display.invalidate(x - r, y - r, width + 1 + 2 * r, height + 2 * r)
+
 
 async def draw_segmented_area(display, x, y, width, height, raw_values, normalized_values, color_fn, step=1, smoothing=1.0, alpha_divisor=2):
     # step is accepted for API compatibility; the columnar kernel always
@@ -1,5 +1,7 @@
 import sys
 import framebuf
+import raster
+from framebuf888 import FrameBuffer888
 
 try:
     import micropython
@@ -12,6 +14,27 @@ if not IS_MICROPYTHON:
         @staticmethod
         def viper(f): return f
 
+# Damage is kept as at most this many [x0, y0, x1, y1] rectangles (x1/y1
+# exclusive); past it, new damage is folded into the nearest rectangle
+_MAX_DAMAGE_RECTS = 8
+
+def _fold_nearest(damage, x0, y0, x1, y1):
+    # Grow whichever rectangle in damage grows the least to take in
+    # [x0, y0, x1, y1]
+    best = 0
+    best_growth = -1
+    for j in range(len(damage)):
+        r = damage[j]
+        growth = ((x1 if x1 > r[2] else r[2]) - (x0 if x0 < r[0] else r[0])) * \
+                 ((y1 if y1 > r[3] else r[3]) - (y0 if y0 < r[1] else r[1])) - \
+                 (r[2] - r[0]) * (r[3] - r[1])
+        if best_growth < 0 or growth < best_growth:
+            best = j
+            best_growth = growth
+    r = damage[best]
+    damage[best] = [x0 if x0 < r[0] else r[0], y0 if y0 < r[1] else r[1],
+                    x1 if x1 > r[2] else r[2], y1 if y1 > r[3] else r[3]]
+
 class Drawing:
     def __init__(self, width, height, color_mode='RGB565'):
         self.width = width
@@ -22,12 +45,20 @@ class Drawing:
         if color_mode == 'RGB565':
             self.mode = framebuf.RGB565
             self.bytes_per_pixel = 2
+        elif color_mode == 'RGB888':
+            # framebuf has no 24-bit format; pixels are stored R,G,B so an
+            # 18-bit panel can take the buffer without per-frame conversion
+            self.mode = None
+            self.bytes_per_pixel = 3
         else:
             self.mode = framebuf.GS8
             self.bytes_per_pixel = 1
 
         self._framebuffer = bytearray(width * height * self.bytes_per_pixel)
-        self.fb = framebuf.FrameBuffer(self._framebuffer, width, height, self.mode)
+        if self.mode is None:
+            self.fb = FrameBuffer888(self._framebuffer, width, height)
+        else:
+            self.fb = framebuf.FrameBuffer(self._framebuffer, width, height, self.mode)
         self.fb.fill(0)
         
         # Pre-allocate a scratch buffer to reduce fragmentation during drawing
@@ -36,9 +67,15 @@ class Drawing:
         self._scratch_buffer = bytearray(1024)
         self._scratch_view = memoryview(self._scratch_buffer)
 
+        # Rectangles drawn to since the last flush(), coalesced so that
+        # flush() pays the window-set overhead once per merged rectangle
+        self._damage = []
+
     @micropython.viper
     def pack(self, color24: int) -> int:
         c = int(color24)
+        if int(self.bytes_per_pixel) == 3:
+            return c & 0xFFFFFF
         r = (c >> 16) & 0xFF
         g = (c >> 8) & 0xFF
         b = c & 0xFF
@@ -49,6 +86,9 @@ class Drawing:
 
     # --- Framebuf Wrappers ---
     def pixel(self, x, y, color):
+        # Not tracked: a damage scan per pixel would cost far more than
+        # the write. Callers plotting pixels invalidate() their bounding
+        # box once, or push an explicit region with update()
         self.fb.pixel(x, y, self.pack(color))
 
     def rect(self, x, y, w, h, color, fill=False):
@@ -57,38 +97,72 @@ class Drawing:
             self.fb.fill_rect(x, y, w, h, c)
         else:
             self.fb.rect(x, y, w, h, c)
+        self.invalidate(x, y, w, h)
             
     def fill_rect(self, x, y, w, h, color):
         self.fb.fill_rect(x, y, w, h, self.pack(color))
+        self.invalidate(x, y, w, h)
 
     def fill(self, color):
         self.fb.fill(self.pack(color))
+        self._damage = [[0, 0, self.width, self.height]]
 
     def text(self, s, x, y, color):
         self.fb.text(s, x, y, self.pack(color))
+        self.invalidate(x, y, len(s) * 8, 8)
         
     def line(self, x1, y1, x2, y2, color):
         self.fb.line(x1, y1, x2, y2, self.pack(color))
+        self.invalidate(min(x1, x2), min(y1, y2), abs(x2 - x1) + 1, abs(y2 - y1) + 1)
         
+    def aa_line(self, x0, y0, x1, y1, width, color):
+        """Anti-aliased line of the given width (px, at least 1) between
+        pixel centres, blended into what is already drawn. Endpoints may
+        be fractional. See raster for polygons, discs and rings."""
+        raster.line(self, x0, y0, x1, y1, width, color)
+
     def hline(self, x, y, w, color):
         self.fb.hline(x, y, w, self.pack(color))
+        self.invalidate(x, y, w, 1)
 
     def vline(self, x, y, h, color):
         self.fb.vline(x, y, h, self.pack(color))
+        self.invalidate(x, y, 1, h)
 
     def ellipse(self, x, y, xr, yr, color, fill=False):
         c = self.pack(color)
         self.fb.ellipse(x, y, xr, yr, c, fill)
+        self.invalidate(x - xr, y - yr, 2 * xr + 1, 2 * yr + 1)
         
     def poly(self, x, y, coords, color, fill=False):
         c = self.pack(color)
         self.fb.poly(x, y, coords, c, fill)
+        if len(coords) < 2:
+            return
+        min_x = max_x = coords[0]
+        min_y = max_y = coords[1]
+        for i in range(2, len(coords) - 1, 2):
+            cx = coords[i]
+            cy = coords[i + 1]
+            if cx < min_x: min_x = cx
+            elif cx > max_x: max_x = cx
+            if cy < min_y: min_y = cy
+            elif cy > max_y: max_y = cy
+        self.invalidate(x + min_x, y + min_y, max_x - min_x + 1, max_y - min_y + 1)
         
     def scroll(self, xstep, ystep):
         self.fb.scroll(xstep, ystep)
+        self._damage = [[0, 0, self.width, self.height]]
 
-    def blit(self, fbuf, x, y, key=-1, palette=None):
+    def blit(self, fbuf, x, y, key=-1, palette=None, w=None, h=None):
+        """Blit a FrameBuffer. MicroPython FrameBuffers don't expose their
+        size, so pass w/h to limit the damage; without them the whole
+        framebuffer is marked as changed."""
         self.fb.blit(fbuf, x, y, key, palette)
+        if w is None or h is None:
+            self._damage = [[0, 0, self.width, self.height]]
+        else:
+            self.invalidate(x, y, w, h)
     # -------------------------
 
     def get_scratch_buffer(self, required_size=0):
@@ -114,11 +188,147 @@ class Drawing:
             return
         self._driver.set_backlight(brightness)
 
-    def update(self, region=None):
+    def invalidate(self, x, y, w, h):
+        """Mark a rectangle as changed so the next flush() pushes it.
+
+        Called by every wrapper above except pixel(); code writing into the framebuffer
+        directly (blit_region, viper kernels) must call it itself. The new
+        rectangle absorbs any existing one when their union costs no more
+        pixels than pushing both separately, which merges overlapping
+        draws and adjacent equal-height strips (e.g. weather columns).
+        """
+        x0 = int(x); y0 = int(y)
+        x1 = x0 + int(w); y1 = y0 + int(h)
+        if x0 < 0: x0 = 0
+        if y0 < 0: y0 = 0
+        if x1 > self.width: x1 = self.width
+        if y1 > self.height: y1 = self.height
+        if x1 <= x0 or y1 <= y0:
+            return
+
+        damage = self._damage
+        # Fast path: most draws (text, icons) land inside an area that
+        # was cleared with rect() just before
+        for r in damage:
+            if r[0] <= x0 and r[1] <= y0 and r[2] >= x1 and r[3] >= y1:
+                return
+
+        area = (x1 - x0) * (y1 - y0)
+        i = 0
+        while i < len(damage):
+            r = damage[i]
+            ux0 = x0 if x0 < r[0] else r[0]
+            uy0 = y0 if y0 < r[1] else r[1]
+            ux1 = x1 if x1 > r[2] else r[2]
+            uy1 = y1 if y1 > r[3] else r[3]
+            union = (ux1 - ux0) * (uy1 - uy0)
+            if union <= area + (r[2] - r[0]) * (r[3] - r[1]):
+                damage.pop(i)
+                x0 = ux0; y0 = uy0; x1 = ux1; y1 = uy1
+                area = union
+                # The grown rectangle may now reach ones already passed
+                i = 0
+            else:
+                i += 1
+
+        if len(damage) >= _MAX_DAMAGE_RECTS:
+            _fold_nearest(damage, x0, y0, x1, y1)
+        else:
+            damage.append([x0, y0, x1, y1])
+
+    def get_damage(self):
+        """Return the pending damage as a list of (x, y, w, h) regions."""
+        return [(r[0], r[1], r[2] - r[0], r[3] - r[1]) for r in self._damage]
+
+    def _take_damage(self, region):
+        # Damaged rectangles to push as (x, y, w, h): all of them, or just
+        # their parts inside region, leaving the rest pending
+        damage = self._damage
+        if region is None:
+            self._damage = []
+            return [(r[0], r[1], r[2] - r[0], r[3] - r[1]) for r in damage]
+        cx0, cy0 = region[0], region[1]
+        cx1 = cx0 + region[2]; cy1 = cy0 + region[3]
+        pushed = []
+        kept = []
+        for r in damage:
+            x0 = r[0] if r[0] > cx0 else cx0
+            y0 = r[1] if r[1] > cy0 else cy0
+            x1 = r[2] if r[2] < cx1 else cx1
+            y1 = r[3] if r[3] < cy1 else cy1
+            if x1 <= x0 or y1 <= y0:
+                kept.append(r)
+                continue
+            pushed.append((x0, y0, x1 - x0, y1 - y0))
+            # Up to four pieces of r outside the region stay pending
+            if r[1] < y0:
+                kept.append([r[0], r[1], r[2], y0])
+            if y1 < r[3]:
+                kept.append([r[0], y1, r[2], r[3]])
+            if r[0] < x0:
+                kept.append([r[0], y0, x0, y1])
+            if x1 < r[2]:
+                kept.append([x1, y0, r[2], y1])
+        # Splitting can leave more pieces than the cap allows
+        while len(kept) > _MAX_DAMAGE_RECTS:
+            r = kept.pop()
+            _fold_nearest(kept, r[0], r[1], r[2], r[3])
+        self._damage = kept
+        return pushed
+
+    def flush(self, region=None):
+        """Push every damaged rectangle to the driver in one pass.
+
+        With a region, only damage inside it is pushed, so a component
+        doesn't send out what others have half drawn between awaits.
+        """
+        damage = self._take_damage(region)
         if self._driver is None:
             return
+        fb = self._framebuffer
+        for r in damage:
+            self._driver.render(fb, self.width, self.height, r)
 
+    async def flush_async(self, region=None):
+        """flush() through the driver's render_async where it has one, so
+        large pushes yield to other tasks."""
+        damage = self._take_damage(region)
+        if self._driver is None:
+            return
+        fb = self._framebuffer
+        render_async = getattr(self._driver, 'render_async', None)
+        for r in damage:
+            if render_async is None:
+                self._driver.render(fb, self.width, self.height, r)
+            else:
+                await render_async(fb, self.width, self.height, r)
+
+    def _consume_damage(self, region):
         if region is None:
-            region = (0, 0, self.width, self.height)
+            self._damage = []
+            return (0, 0, self.width, self.height)
+        if self._damage:
+            # Damage inside the pushed region is no longer pending
+            x, y, w, h = region
+            x1 = x + w; y1 = y + h
+            self._damage = [r for r in self._damage
+                            if not (r[0] >= x and r[1] >= y and r[2] <= x1 and r[3] <= y1)]
+        return region
+
+    def update(self, region=None):
+        region = self._consume_damage(region)
+        if self._driver is None:
+            return
         
         self._driver.render(self._framebuffer, self.width, self.height, region)
+
+    async def update_async(self, region=None):
+        """update() that yields during the transfer where the driver can."""
+        region = self._consume_damage(region)
+        if self._driver is None:
+            return
+        render_async = getattr(self._driver, 'render_async', None)
+        if render_async is None:
+            self._driver.render(self._framebuffer, self.width, self.height, region)
+        else:
+            await render_async(self._framebuffer, self.width, self.height, region)
@@ -0,0 +1,237 @@
+"""Software framebuffer for 3-byte R,G,B pixels.
+
+MicroPython's framebuf has no 24-bit format, so Drawing uses this in
+RGB888 mode. It mirrors the subset of the FrameBuffer API that Drawing
+wraps; colours are plain 0xRRGGBB ints. Pixel rows are stored in the
+byte order 18-bit panels (ILI9488) expect on the wire, so MipiDisplay
+can stream them without conversion.
+"""
+
+import sys
+import framebuf
+
+try:
+    import micropython
+    IS_MICROPYTHON = sys.implementation.name == 'micropython'
+except ImportError:
+    IS_MICROPYTHON = False
+
+if not IS_MICROPYTHON:
+    class micropython:
+        @staticmethod
+        def viper(f): return f
+
+    ptr8 = object
+
+@micropython.viper
+def _fill_888(dest: ptr8, offset: int, stride: int, w: int, h: int, color: int):
+    r = (color >> 16) & 0xFF
+    g = (color >> 8) & 0xFF
+    b = color & 0xFF
+    row = offset
+    while h > 0:
+        o = row
+        end = row + w * 3
+        while o < end:
+            dest[o] = r; dest[o + 1] = g; dest[o + 2] = b
+            o += 3
+        row += stride
+        h -= 1
+
+@micropython.viper
+def _blit_888(dest: ptr8, d_off: int, d_stride: int, src: ptr8, s_off: int, s_stride: int,
+              w: int, h: int, key: int):
+    while h > 0:
+        d = d_off
+        s = s_off
+        end = s_off + w * 3
+        if key == -1:
+            while s < end:
+                dest[d] = src[s]; dest[d + 1] = src[s + 1]; dest[d + 2] = src[s + 2]
+                s += 3; d += 3
+        else:
+            while s < end:
+                if ((src[s] << 16) | (src[s + 1] << 8) | src[s + 2]) != key:
+                    dest[d] = src[s]; dest[d + 1] = src[s + 1]; dest[d + 2] = src[s + 2]
+                s += 3; d += 3
+        d_off += d_stride
+        s_off += s_stride
+        h -= 1
+
+class FrameBuffer888:
+    def __init__(self, buffer, width, height):
+        self._buf = buffer
+        self.width = width
+        self.height = height
+        self.stride = width * 3
+
+    def fill_rect(self, x, y, w, h, color):
+        if x < 0:
+            w += x; x = 0
+        if y < 0:
+            h += y; y = 0
+        if x + w > self.width: w = self.width - x
+        if y + h > self.height: h = self.height - y
+        if w <= 0 or h <= 0:
+            return
+        _fill_888(self._buf, y * self.stride + x * 3, self.stride, w, h, color)
+
+    def fill(self, color):
+        _fill_888(self._buf, 0, self.stride, self.width, self.height, color)
+
+    def rect(self, x, y, w, h, color, fill=False):
+        if fill:
+            self.fill_rect(x, y, w, h, color)
+            return
+        self.fill_rect(x, y, w, 1, color)
+        self.fill_rect(x, y + h - 1, w, 1, color)
+        self.fill_rect(x, y, 1, h, color)
+        self.fill_rect(x + w - 1, y, 1, h, color)
+
+    def hline(self, x, y, w, color):
+        self.fill_rect(x, y, w, 1, color)
+
+    def vline(self, x, y, h, color):
+        self.fill_rect(x, y, 1, h, color)
+
+    def pixel(self, x, y, color=None):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None if color is None else 0
+        o = y * self.stride + x * 3
+        buf = self._buf
+        if color is None:
+            return (buf[o] << 16) | (buf[o + 1] << 8) | buf[o + 2]
+        buf[o] = (color >> 16) & 0xFF
+        buf[o + 1] = (color >> 8) & 0xFF
+        buf[o + 2] = color & 0xFF
+
+    def line(self, x0, y0, x1, y1, color):
+        # Bresenham, as framebuf.line
+        dx = abs(x1 - x0)
+        dy = -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx + dy
+        while True:
+            self.pixel(x0, y0, color)
+            if x0 == x1 and y0 == y1:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy; x0 += sx
+            if e2 <= dx:
+                err += dx; y0 += sy
+
+    def ellipse(self, x, y, xr, yr, color, fill=False):
+        if xr <= 0 or yr <= 0:
+            self.fill_rect(x - xr, y - yr, 2 * xr + 1, 2 * yr + 1, color)
+            return
+        # Half-width per row from x^2/xr^2 + y^2/yr^2 <= 1, integer only
+        xr2 = xr * xr
+        yr2 = yr * yr
+        prev = 0
+        for dy in range(yr, -1, -1):
+            lim = xr2 * (yr2 - dy * dy)
+            hw = int((lim / yr2) ** 0.5)
+            # Correct the float estimate to the exact integer bound
+            while hw > 0 and hw * hw * yr2 > lim:
+                hw -= 1
+            while hw < xr and (hw + 1) * (hw + 1) * yr2 <= lim:
+                hw += 1
+            if fill:
+                self.fill_rect(x - hw, y - dy, 2 * hw + 1, 1, color)
+                if dy:
+                    self.fill_rect(x - hw, y + dy, 2 * hw + 1, 1, color)
+            else:
+                # Outline: span from the previous (outer) row's half-width
+                # so steep parts of the curve stay connected
+                lo = prev + 1 if hw > prev else hw
+                n = hw - lo + 1
+                self.fill_rect(x - hw, y - dy, n, 1, color)
+                self.fill_rect(x + lo, y - dy, n, 1, color)
+                if dy:
+                    self.fill_rect(x - hw, y + dy, n, 1, color)
+                    self.fill_rect(x + lo, y + dy, n, 1, color)
+            prev = hw
+
+    def poly(self, x, y, coords, color, fill=False):
+        n = len(coords) // 2
+        if n == 0:
+            return
+        if not fill:
+            for i in range(n):
+                j = (i + 1) % n
+                self.line(x + coords[2 * i], y + coords[2 * i + 1],
+                          x + coords[2 * j], y + coords[2 * j + 1], color)
+            return
+        # Even-odd scanline fill, sampling pixel rows at their integer y
+        min_y = max_y = coords[1]
+        for i in range(1, n):
+            cy = coords[2 * i + 1]
+            if cy < min_y: min_y = cy
+            elif cy > max_y: max_y = cy
+        for py in range(min_y, max_y + 1):
+            nodes = []
+            for i in range(n):
+                j = (i + 1) % n
+                ax = coords[2 * i]; ay = coords[2 * i + 1]
+                bx = coords[2 * j]; by = coords[2 * j + 1]
+                if (ay <= py < by) or (by <= py < ay):
+                    nodes.append(ax + (py - ay) * (bx - ax) // (by - ay))
+                elif ay == by == py:
+                    # Horizontal edge on this row
+                    self.fill_rect(x + min(ax, bx), y + py, abs(bx - ax) + 1, 1, color)
+            nodes.sort()
+            for k in range(0, len(nodes) - 1, 2):
+                self.fill_rect(x + nodes[k], y + py, nodes[k + 1] - nodes[k] + 1, 1, color)
+
+    def text(self, s, x, y, color=0xFFFFFF):
+        # Rasterise through a GS8 framebuf, then copy the set pixels
+        w = len(s) * 8
+        if w == 0:
+            return
+        mask = bytearray(w * 8)
+        fb = framebuf.FrameBuffer(mask, w, 8, framebuf.GS8)
+        fb.text(s, 0, 0, 1)
+        i = 0
+        for row in range(8):
+            for cx in range(w):
+                if mask[i]:
+                    self.pixel(x + cx, y + row, color)
+                i += 1
+
+    def scroll(self, xstep, ystep):
+        # Shift pixels by (xstep, ystep); vacated pixels keep their
+        # contents, as with framebuf.scroll
+        w = self.width; h = self.height; stride = self.stride
+        buf = self._buf
+        if ystep > 0:
+            for r in range(h - 1, ystep - 1, -1):
+                buf[r * stride:(r + 1) * stride] = buf[(r - ystep) * stride:(r - ystep + 1) * stride]
+        elif ystep < 0:
+            for r in range(0, h + ystep):
+                buf[r * stride:(r + 1) * stride] = buf[(r - ystep) * stride:(r - ystep + 1) * stride]
+        if xstep:
+            n = (w - abs(xstep)) * 3
+            if n > 0:
+                for r in range(h):
+                    o = r * stride
+                    if xstep > 0:
+                        buf[o + xstep * 3:o + xstep * 3 + n] = buf[o:o + n]
+                    else:
+                        buf[o:o + n] = buf[o - xstep * 3:o - xstep * 3 + n]
+
+    def blit(self, source, x, y, key=-1, palette=None):
+        """Blit another FrameBuffer888 (palette is not supported)."""
+        sx = 0; sy = 0
+        w = source.width; h = source.height
+        if x < 0:
+            sx = -x; w += x; x = 0
+        if y < 0:
+            sy = -y; h += y; y = 0
+        if x + w > self.width: w = self.width - x
+        if y + h > self.height: h = self.height - y
+        if w <= 0 or h <= 0:
+            return
+        _blit_888(self._buf, y * self.stride + x * 3, self.stride,
+                  source._buf, sy * source.stride + sx * 3, source.stride, w, h, key)
@@ -39,6 +39,8 @@ class FramebufferController:
         if bytes_per_pixel == 1:
             palette_size = 256 * 4
             off_bits = file_header_size + dib_header_size + palette_size
+        elif bytes_per_pixel == 3:
+            off_bits = file_header_size + dib_header_size
         else:
             mask_size = 12  # R/G/B masks (no alpha)
             off_bits = file_header_size + dib_header_size + mask_size
@@ -76,6 +78,11 @@ class FramebufferController:
             bi[16:20] = b'\x00\x00\x00\x00'
             # biClrUsed
             bi[32:36] = b'\x00\x01\x00\x00' # 256 colors
+        elif bytes_per_pixel == 3:
+            # biBitCount
+            bi[14:16] = b'\x18\x00'  # 24 bpp
+            # biCompression = BI_RGB (0)
+            bi[16:20] = b'\x00\x00\x00\x00'
         else:
             # biBitCount
             bi[14:16] = b'\x10\x00'  # 16 bpp
@@ -122,6 +129,8 @@ class FramebufferController:
                 palette[idx+2] = r8
                 palette[idx+3] = 0
             writer.write(palette)
+        elif bytes_per_pixel == 3:
+            pass  # BI_RGB: no palette or masks
         else:
             # Color masks: R=0xF800, G=0x07E0, B=0x001F (little-endian DWORDs)
             writer.write(b'\x00\xf8\x00\x00\xe0\x07\x00\x00\x1f\x00\x00\x00')
@@ -132,9 +141,20 @@ class FramebufferController:
         mv = self.display.framebuffer
         pad_bytes = b'\x00' * pad if pad else b''
         base = 0
+        # 24-bit BMP rows are B,G,R; the framebuffer is R,G,B
+        row_buf = bytearray(row_bytes) if bytes_per_pixel == 3 else None
         for _ in range(height):
             row_end = base + row_bytes
-            writer.write(mv[base:row_end])
+            if row_buf is not None:
+                # (MicroPython slices don't take a step, so swap by hand)
+                row_buf[:] = mv[base:row_end]
+                for i in range(0, row_bytes, 3):
+                    t = row_buf[i]
+                    row_buf[i] = row_buf[i + 2]
+                    row_buf[i + 2] = t
+                writer.write(row_buf)
+            else:
+                writer.write(mv[base:row_end])
             if pad:
                 writer.write(pad_bytes)
             base = row_end
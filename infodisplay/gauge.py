@@ -20,6 +20,9 @@ import math
 import sys
 from array import array
 
+from bitblt import _as_ptr8, _as_ptr16
+from raster import _isqrt, _disc, pack_rgb
+
 try:
     import micropython
     IS_MICROPYTHON = sys.implementation.name == 'micropython'
@@ -34,39 +37,6 @@ if not IS_MICROPYTHON:
 
     ptr8 = ptr16 = ptr32 = object
 
-    def _as_ptr8(obj):
-        if hasattr(obj, '_framebuffer'): return memoryview(obj._framebuffer).cast('B')
-        if hasattr(obj, '_buf'): return memoryview(obj._buf).cast('B')
-        return memoryview(obj).cast('B')
-
-    def _as_ptr16(obj):
-        if hasattr(obj, '_framebuffer'): return memoryview(obj._framebuffer).cast('H')
-        if hasattr(obj, '_buf'): return memoryview(obj._buf).cast('H')
-        return memoryview(obj).cast('H')
-else:
-    def _as_ptr8(obj):
-        if hasattr(obj, '_framebuffer'): return obj._framebuffer
-        if hasattr(obj, '_buf'): return obj._buf
-        return obj
-    _as_ptr16 = _as_ptr8
-
-
-@micropython.viper
-def _isqrt(v: int) -> int:
-    r = 0
-    b = 1 << 28
-    while b > v:
-        b >>= 2
-    while b != 0:
-        t = r + b
-        if v >= t:
-            v -= t
-            r = (r >> 1) + b
-        else:
-            r >>= 1
-        b >>= 2
-    return r
-
 
 # _PARAMS layout (every value non-negative: the kernel reads them via
 # ptr32, which is unsigned on 64-bit builds -- see chart.py):
@@ -81,7 +51,7 @@ def _isqrt(v: int) -> int:
 # 17 ex 18 ey         gap edge direction (sin, cos of gap half-angle, Q14)
 # 19 capx 20 capy     cap centre in folded coords (Q4, centre-relative)
 # 21..23 cap disc (r2p, inv, amax)   24 capbb (Q4 bbox half-extent)
-# 25..27 groove r,g,b   28 packed groove colour (RGB565 word / 8-bit byte)
+# 25..27 groove r,g,b   28 packed groove colour (RGB565 word / 8-bit byte / RGB888)
 # 30 has_sec 31 sxq 32 syq  33..35 sec disc  36 secbb  37..39 sec r,g,b
 # 40 has_notch 41 nxq 42 nyq  43..45 outline disc  46..48 fill disc
 # 49 nbb  50..52 outline r,g,b  53..55 fill r,g,b
@@ -201,6 +171,9 @@ def _render(dest8: ptr8, dest16: ptr16, p: ptr32):
                     if rr < ro2m and rr > ri2p:
                         if bpp == 2:
                             dest16[row16 + x] = g16
+                        elif bpp == 3:
+                            o = row + x * 3
+                            dest8[o] = int(p[25]); dest8[o + 1] = int(p[26]); dest8[o + 2] = int(p[27])
                         else:
                             dest8[row + x] = g16
                     elif rr < ro2p and rr > ri2m:
@@ -216,6 +189,9 @@ def _render(dest8: ptr8, dest16: ptr16, p: ptr32):
                         b = (int(p[27]) * a) >> 8
                         if bpp == 2:
                             dest16[row16 + x] = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+                        elif bpp == 3:
+                            o = row + x * 3
+                            dest8[o] = r; dest8[o + 1] = g; dest8[o + 2] = b
                         else:
                             dest8[row + x] = (r & 0xE0) | ((g & 0xE0) >> 3) | ((b & 0xC0) >> 6)
             else:
@@ -276,6 +252,9 @@ def _render(dest8: ptr8, dest16: ptr16, p: ptr32):
                 if hit != 0:
                     if bpp == 2:
                         dest16[row16 + x] = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+                    elif bpp == 3:
+                        o = row + x * 3
+                        dest8[o] = r; dest8[o + 1] = g; dest8[o + 2] = b
                     else:
                         dest8[row + x] = (r & 0xE0) | ((g & 0xE0) >> 3) | ((b & 0xC0) >> 6)
             rr += (dx << 5) + 256
@@ -284,19 +263,6 @@ def _render(dest8: ptr8, dest16: ptr16, p: ptr32):
         y += 1
 
 
-def _disc(p, i, rq):
-    # AA disc edge: alpha = clamp((r2p - d2) * inv >> 16, 0, 256), which
-    # linearises coverage over the 1px edge band ((r+.5)^2 - (r-.5)^2 = 2r).
-    # rq is the radius in Q4; inv = 65536/(2r) = 524288/rq, amax = 2r*256.
-    p[i] = (rq + 8) * (rq + 8)
-    if rq >= 16:
-        p[i + 1] = 524288 // rq
-        p[i + 2] = rq * 32
-    else:
-        p[i + 1] = 0
-        p[i + 2] = 0
-
-
 def _pct(minimum, maximum, value):
     span = maximum - minimum
     pct = 0.0 if span == 0 else (value - minimum) / span
@@ -399,10 +365,7 @@ def draw_gauge(display, position, size, minimum_temperature=None, maximum_temper
     gg = (groove_color >> 8) & 0xFF
     gb = groove_color & 0xFF
     p[25] = gr; p[26] = gg; p[27] = gb
-    if bpp == 2:
-        p[28] = ((gr & 0xF8) << 8) | ((gg & 0xFC) << 3) | (gb >> 3)
-    else:
-        p[28] = (gr & 0xE0) | ((gg & 0xE0) >> 3) | ((gb & 0xC0) >> 6)
+    p[28] = pack_rgb(bpp, gr, gg, gb)
 
     p[30] = 1 if has_sec else 0
     if has_sec:
@@ -430,3 +393,4 @@ def draw_gauge(display, position, size, minimum_temperature=None, maximum_temper
 
     d8 = _as_ptr8(display)
     _render(d8, _as_ptr16(display) if bpp == 2 else d8, p)
+    display.invalidate((cxq - rmaxq) >> 4, p[0], (rmaxq >> 3) + 2, p[1] - p[0])
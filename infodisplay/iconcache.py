@@ -0,0 +1,180 @@
+import struct
+
+from bitblt import blit_buffer, blit_region, blit_rle, rle_buffer_size, RLE_FLAG, RLE_HEADER_BYTES
+
+class Icon:
+    """A decoded icon: raw rows of width * bytes_per_pixel bytes, in the
+    file's pixel format. Also a blit target (bitblt finds the pixels via
+    the _framebuffer attribute), which is how RLE icons are decoded."""
+    def __init__(self, width, height, bytes_per_pixel):
+        self.width = width
+        self.height = height
+        self.bytes_per_pixel = bytes_per_pixel
+        self._framebuffer = bytearray(width * height * bytes_per_pixel)
+
+# Decoded icons keyed by path -> [last_use, icon]. Icons change at most
+# once per refresh, so after the first draw a column is one blit from RAM
+# with no flash access. LRU by last_use within a byte budget, like the
+# bmfont glyph cache; icons that don't fit (or can't be allocated) are
+# streamed from flash as before. Off until the display config sets
+# icon_cache_bytes: the cache never shrinks when other allocations (HTTP,
+# JSON) later run short of heap.
+_ICON_CACHE = {}
+_icon_cache_budget = 0
+_icon_cache_bytes = 0
+_icon_cache_tick = 0
+_icon_cache_hits = 0
+_icon_cache_misses = 0
+
+# Row buffer for streamed icons, grown on demand
+_scratch = bytearray(256)
+
+def set_icon_cache_budget(nbytes):
+    """Set the icon cache size in bytes (0 disables it)."""
+    global _icon_cache_budget
+    _icon_cache_budget = nbytes
+    _evict_icons(0)
+
+def clear_icon_cache():
+    """Drop every cached icon and reset the hit/miss counters."""
+    global _icon_cache_bytes, _icon_cache_hits, _icon_cache_misses
+    _ICON_CACHE.clear()
+    _icon_cache_bytes = 0
+    _icon_cache_hits = 0
+    _icon_cache_misses = 0
+
+def icon_cache_stats():
+    """Return (entries, bytes, hits, misses)."""
+    return len(_ICON_CACHE), _icon_cache_bytes, _icon_cache_hits, _icon_cache_misses
+
+def _evict_icons(incoming):
+    global _icon_cache_bytes
+    cache = _ICON_CACHE
+    while cache and _icon_cache_bytes + incoming > _icon_cache_budget:
+        oldest_key = None
+        oldest = 0
+        for k in cache:
+            t = cache[k][0]
+            if oldest_key is None or t < oldest:
+                oldest_key = k
+                oldest = t
+        _icon_cache_bytes -= len(cache.pop(oldest_key)[1]._framebuffer)
+
+def _read_header(fh):
+    """Return (width, height, bytes_per_pixel, rle), leaving fh at the pixels."""
+    width, height = struct.unpack('<HH', fh.read(4))
+    if width & RLE_FLAG:
+        return width & ~RLE_FLAG, height, fh.read(2)[0], True
+    # Raw files carry no bpp: infer it from the file size
+    fh.seek(0, 2)
+    file_size = fh.tell()
+    fh.seek(4)
+    bpp = (file_size - 4) // (width * height) if width and height else 1
+    if bpp <= 0: bpp = 1
+    return width, height, bpp, False
+
+def _scratch_for(nbytes):
+    global _scratch
+    if len(_scratch) < nbytes:
+        _scratch = bytearray(nbytes)
+    return _scratch
+
+def _stream(framebuffer, fb_width, fb_height, fh, width, height, bpp, rle, x, y, clip):
+    if rle:
+        blit_rle(framebuffer, fb_width, fb_height, bpp, fh, width, height, x, y,
+                 _scratch_for(rle_buffer_size(width, bpp)), None, None, clip)
+    else:
+        blit_region(framebuffer, fb_width, fb_height, bpp, fh, 4, width * bpp,
+                    0, 0, width, height, x, y, _scratch_for(width * bpp), None, None, clip)
+
+def _load(fh, width, height, bpp, rle):
+    icon = Icon(width, height, bpp)
+    if rle:
+        blit_rle(icon, width, height, bpp, fh, width, height, 0, 0,
+                 _scratch_for(rle_buffer_size(width, bpp)))
+    else:
+        fh.readinto(icon._framebuffer)
+    return icon
+
+def _draw_cached(framebuffer, fb_width, fb_height, key, x, y, box_width, box_height, clip):
+    global _icon_cache_tick, _icon_cache_hits
+    entry = _ICON_CACHE.get(key)
+    if entry is None:
+        return None
+    _icon_cache_tick += 1
+    entry[0] = _icon_cache_tick
+    _icon_cache_hits += 1
+    return _blit_icon(framebuffer, fb_width, fb_height, entry[1], x, y, box_width, box_height, clip)
+
+def _blit_icon(framebuffer, fb_width, fb_height, icon, x, y, box_width, box_height, clip):
+    ix = x + (box_width - icon.width) // 2 if box_width else x
+    iy = y + (box_height - icon.height) // 2 if box_height else y
+    blit_buffer(framebuffer, fb_width, fb_height, icon._framebuffer, icon.width, icon.height,
+                ix, iy, 1 if icon.bytes_per_pixel == 2 else 6, None, clip)
+    return ix, iy, icon.width, icon.height
+
+def _fits(nbytes):
+    """Count a miss and make room; False means stream instead."""
+    global _icon_cache_misses
+    if nbytes > _icon_cache_budget:
+        return False
+    _icon_cache_misses += 1
+    _evict_icons(nbytes)
+    return True
+
+def _store(key, icon):
+    global _icon_cache_tick, _icon_cache_bytes
+    _icon_cache_tick += 1
+    _icon_cache_bytes += len(icon._framebuffer)
+    _ICON_CACHE[key] = [_icon_cache_tick, icon]
+
+def draw_icon(framebuffer, fb_width, fb_height, path, x, y, box_width=0, box_height=0, clip=None):
+    """Draw the raw or RLE icon file at path, centred in the box at (x, y)
+    (or with its top left at (x, y) for an empty box). Returns the
+    (x, y, width, height) drawn, for invalidation. Raises OSError if the
+    file can't be read."""
+    rect = _draw_cached(framebuffer, fb_width, fb_height, path, x, y, box_width, box_height, clip)
+    if rect is not None:
+        return rect
+
+    with open(path, 'rb') as fh:
+        width, height, bpp, rle = _read_header(fh)
+        icon = None
+        if _fits(width * height * bpp):
+            try:
+                icon = _load(fh, width, height, bpp, rle)
+            except MemoryError:
+                # Heap too fragmented for the whole icon: stream it
+                fh.seek(RLE_HEADER_BYTES if rle else 4)
+        if icon is None:
+            ix = x + (box_width - width) // 2 if box_width else x
+            iy = y + (box_height - height) // 2 if box_height else y
+            _stream(framebuffer, fb_width, fb_height, fh, width, height, bpp, rle, ix, iy, clip)
+            return ix, iy, width, height
+
+    _store(path, icon)
+    return _blit_icon(framebuffer, fb_width, fb_height, icon, x, y, box_width, box_height, clip)
+
+def draw_sprite(framebuffer, fb_width, fb_height, sheet, name, x, y, box_width=0, box_height=0, clip=None):
+    """As draw_icon, for image name in a spritesheet.SpriteSheet. Raises
+    KeyError if the sheet has no such image."""
+    key = (sheet.path, name)
+    rect = _draw_cached(framebuffer, fb_width, fb_height, key, x, y, box_width, box_height, clip)
+    if rect is not None:
+        return rect
+
+    width, height, bpp, rle = sheet.info(name)
+    icon = None
+    if _fits(width * height * bpp):
+        try:
+            icon = sheet.load(name)
+        except MemoryError:
+            pass
+    if icon is None:
+        ix = x + (box_width - width) // 2 if box_width else x
+        iy = y + (box_height - height) // 2 if box_height else y
+        sheet.draw(framebuffer, fb_width, fb_height, name, ix, iy, clip=clip)
+        return ix, iy, width, height
+
+    _store(key, icon)
+    return _blit_icon(framebuffer, fb_width, fb_height, icon, x, y, box_width, box_height, clip)
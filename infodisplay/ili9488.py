@@ -2,7 +2,8 @@ from time import sleep_ms
 import gc
 import micropython
 from mipidcs import LANDSCAPE, REFLECT, USD, PORTRAIT, get_madctl, get_window_coords, MipiDisplay, \
-    _rgb565_to_888_line, _rgb565_to_888_upscale_line, _rgb332_to_888_line, build_rgb332_888_lut
+    _rgb565_to_888_line, _rgb565_to_888_upscale_line, _rgb332_to_888_line, _rgb332_to_888_upscale_line, \
+    _rgb565_to_888_lines, _rgb332_to_888_lines, _rgb888_upscale_line, build_rgb332_888_lut
 
 # Display types
 GENERIC = (0, 0, 1, True, True) # Default (x, y, orientation, bgr, inv)
@@ -10,15 +11,23 @@ GENERIC = (0, 0, 1, True, True) # Default (x, y, orientation, bgr, inv)
 class ILI9488(MipiDisplay):
     def __init__(self, spi, cs, dc, rst, backlight=None, width=480, height=320, 
                  disp_mode=LANDSCAPE, display=GENERIC, scale=1, 
-                 source_color_mode='RGB565'):
+                 source_color_mode='RGB565', dma_buffer_bytes=0, bulk_commands=None):
         
-        super().__init__(spi, cs, dc, backlight, width, height, scale, source_color_mode, 3, chunked_command_data=True)
+        super().__init__(spi, cs, dc, backlight, width, height, scale, source_color_mode, 3, chunked_command_data=True,
+                         dma_buffer_bytes=dma_buffer_bytes)
         
         self._offset = display[:2]
         self._rst = rst
         self._display = display
+        # None: probe whether the board takes multi-byte command data in one
+        # CS frame; True/False: force bulk/chunked parameter writes
+        self._bulk_commands = bulk_commands
         
-        if source_color_mode == 'RGB332':
+        if source_color_mode == 'RGB888':
+            # Sent as-is (the panel's 18-bit mode takes R,G,B bytes); the
+            # converters still take a lut buffer argument
+            self._lut = bytearray(1)
+        elif source_color_mode == 'RGB332':
             # Full 768-byte RGB332->888 table (only the 332 converter runs)
             self._lut = build_rgb332_888_lut()
         else:
@@ -34,9 +43,19 @@ class ILI9488(MipiDisplay):
         self._init(disp_mode, display[2], display[3:])
 
     def _get_line_conv(self, scale):
+        if self.source_color_mode == 'RGB888':
+            # Unscaled renders bypass conversion entirely (_render_spi_direct)
+            return _rgb888_upscale_line
         if self.source_color_mode == 'RGB565':
             return _rgb565_to_888_line if scale == 1 else _rgb565_to_888_upscale_line
-        return _rgb332_to_888_line # No upscale for 332->888 yet
+        return _rgb332_to_888_line if scale == 1 else _rgb332_to_888_upscale_line
+
+    def _get_block_conv(self):
+        if self.source_color_mode == 'RGB888':
+            return None
+        if self.source_color_mode == 'RGB565':
+            return _rgb565_to_888_lines
+        return _rgb332_to_888_lines
 
     def _init(self, user_mode, orientation, cfg):
         bgr = cfg[0] if len(cfg) else False
@@ -62,12 +81,17 @@ class ILI9488(MipiDisplay):
         mode = get_madctl(user_mode, orientation, bgr)
         self._current_mode = mode
         self._wcd(b"\x36", int.to_bytes(mode, 1, "little"))
+        if self._bulk_commands is None:
+            self._probe_bulk_commands()
+        else:
+            self._spi_ctrl.chunked_data = not self._bulk_commands
         self.set_window(mode)
-        self._spi_ctrl.clear(self.width, self.height, self._linebuf)
+        self._spi_ctrl.clear(self.width, self.height, memoryview(self._linebuf)[:self.width * self._bpp])
 
     def set_rotation(self, disp_mode):
         mode = get_madctl(disp_mode, self._orientation, self._bgr)
         self._current_mode = mode
+        self.invalidate_tiles()
         self.set_window(mode)
         self._wcd(b"\x36", int.to_bytes(mode, 1, "little"))
 
@@ -87,18 +111,52 @@ class ILI9488(MipiDisplay):
         self._wcmd(b"\x2b")
         self._wcd_data(self._cmd_buf)
 
-    def _set_region_window(self, x, y, rw, rh):
-        xs, xe, ys, ye = get_window_coords(320, 480, self.width, self.height, self._offset[0], self._offset[1], self._current_mode, x, y, rw, rh)
-        self._cmd_buf[0] = xs >> 8
-        self._cmd_buf[1] = xs & 0xFF
-        self._cmd_buf[2] = xe >> 8
-        self._cmd_buf[3] = xe & 0xFF
-        self._wcmd(b"\x2a")
-        self._wcd_data(self._cmd_buf)
-        
-        self._cmd_buf[0] = ys >> 8
-        self._cmd_buf[1] = ys & 0xFF
-        self._cmd_buf[2] = ye >> 8
-        self._cmd_buf[3] = ye & 0xFF
-        self._wcmd(b"\x2b")
-        self._wcd_data(self._cmd_buf)
+    def _window_coords(self, x, y, rw, rh):
+        return get_window_coords(320, 480, self.width, self.height, self._offset[0], self._offset[1], self._current_mode, x, y, rw, rh)
+
+    def _probe_bulk_commands(self):
+        """Return True if window parameters sent in one CS frame take effect.
+
+        Writes two test colours to pixel (1, 1) through a bulk-sent window
+        and reads each back (RAMRD) through a chunked one. A panel that
+        ignored the bulk window would have taken the pixel at the previous
+        window origin instead. Boards without MISO, or whose front end
+        needs a CS frame per byte, fail the readback and stay chunked.
+        """
+        ctrl = self._spi_ctrl
+        spi = self._spi
+        # RAMRD is specified well below write speeds; read at 5MHz and
+        # restore the configured rate after
+        try:
+            baudrate = int(str(spi).split('baudrate=', 1)[1].split(',', 1)[0])
+        except (IndexError, ValueError):
+            return False
+        got = bytearray(4)  # dummy byte, then R, G, B
+        ok = True
+        try:
+            for color in (b"\xa8\x54\xfc", b"\x54\xa8\x00"):
+                ctrl.chunked_data = True
+                ctrl.invalidate_window()
+                ctrl.begin_write(0, 0, 0, 0)
+                spi.write(b"\x00\x00\x00")
+                ctrl.end_data()
+                ctrl.chunked_data = False
+                ctrl.begin_write(1, 1, 1, 1)
+                spi.write(color)
+                ctrl.end_data()
+                ctrl.chunked_data = True
+                ctrl.invalidate_window()
+                ctrl.set_window(1, 1, 1, 1)
+                spi.init(baudrate=5_000_000)
+                try:
+                    ctrl.read_cmd(b"\x2e", got)
+                finally:
+                    spi.init(baudrate=baudrate)
+                for i in range(3):
+                    if got[i + 1] & 0xFC != color[i]:
+                        ok = False
+        except Exception:
+            ok = False
+        ctrl.chunked_data = not ok
+        ctrl.invalidate_window()
+        return ok
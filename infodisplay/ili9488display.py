@@ -2,6 +2,9 @@ import asyncio
 from machine import SPI, Pin
 from ili9488 import ILI9488, REFLECT, PORTRAIT, USD
 from drawing import Drawing
+from bmfont import set_glyph_cache_budget
+from textbox import set_text_cache_budget
+from iconcache import set_icon_cache_budget
 
 # Default display dimensions
 DEFAULT_WIDTH = 480
@@ -48,9 +51,34 @@ class ILI9488Display:
             disp_mode=disp_mode,
             display=(0, 0, 1, True, True),
             scale=scale,
-            source_color_mode=mode
+            source_color_mode=mode,
+            # Optional: bytes for the DMA ping-pong buffers (e.g. 8192)
+            dma_buffer_bytes=config.get('dma_buffer_bytes', 0),
+            # Optional: true/false to force bulk/per-byte command parameters
+            # (default: probe, which needs the panel's MISO line)
+            bulk_commands=config.get('bulk_commands')
         )
 
+        # Optional: skip unchanged tiles (size in framebuffer pixels, 0 = off)
+        tile_cache = config.get('tile_cache', 0)
+        if tile_cache:
+            ili.set_tile_cache(int(tile_cache))
+
+        # Optional: RAM budget for cached font glyphs (bytes, 0 = off)
+        glyph_cache = config.get('glyph_cache_bytes')
+        if glyph_cache is not None:
+            set_glyph_cache_budget(int(glyph_cache))
+
+        # Optional: RAM budget for rendered text runs (bytes, 0 = off)
+        text_cache = config.get('text_cache_bytes')
+        if text_cache is not None:
+            set_text_cache_budget(int(text_cache))
+
+        # Optional: RAM budget for decoded icons (bytes, 0 = off)
+        icon_cache = config.get('icon_cache_bytes')
+        if icon_cache is not None:
+            set_icon_cache_budget(int(icon_cache))
+
         # Drawing uses reduced framebuffer dimensions
         drawing = Drawing(fb_width, fb_height, color_mode=mode)
         drawing.set_driver(ili)
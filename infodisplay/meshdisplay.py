@@ -1,11 +1,40 @@
+import sys
 import math
 import utime
 import asyncio
-import gc
 from array import array
 
+from bitblt import _as_ptr8
 
+try:
+    import micropython
+    IS_MICROPYTHON = sys.implementation.name == 'micropython'
+except ImportError:
+    IS_MICROPYTHON = False
 
+if not IS_MICROPYTHON:
+    class micropython:
+        @staticmethod
+        def viper(f): return f
+
+    ptr8 = ptr16 = ptr32 = object
+
+# Fixed point: vertices are Q10 model units and the rotation matrix Q14,
+# so a rotated coordinate (sum of three products) stays inside a 32-bit
+# viper int for models within +/-8 units. Perspective is fov / (z + 4)
+# as before, looked up per 1/64 unit of depth instead of divided (no
+# divide on the M0+).
+_VERT_SHIFT = 10
+_MAT_SHIFT = 14
+_FOV = 256
+_RECIP_SHIFT = 4       # recip index = (z + camera) >> 4: 1/64 unit steps
+_RECIP_MIN = 32        # near plane at half a unit from the camera
+_RECIP_SIZE = 1024     # far plane at 16 units
+
+_BASE_COLORS = (
+    0xFF0000, 0x00FF00, 0x0000FF,
+    0xFFFF00, 0x00FFFF, 0xFF00FF
+)
 
 def load_obj(filename):
     vertices = []
@@ -22,76 +51,207 @@ def load_obj(filename):
                 faces.append(face)
     return vertices, faces
 
-def project(x, y, z, width, height, angle):
-    # Simple perspective projection
-    fov = 256
-    distance = fov / (z + 4)
-    x_proj = int(x * distance + width // 2)
-    y_proj = int(-y * distance + height // 2)
-    return x_proj, y_proj
+def _build_recip():
+    # recip[i] * x >> 16 == x * fov / z for z around i << _RECIP_SHIFT (Q10)
+    recip = array('i', bytes(4 * _RECIP_SIZE))
+    for i in range(_RECIP_MIN, _RECIP_SIZE):
+        z = (i << _RECIP_SHIFT) + (1 << (_RECIP_SHIFT - 1))
+        recip[i] = (_FOV << 16) // z
+    return recip
+
+@micropython.viper
+def _transform(verts: ptr32, n: int, m: ptr32, recip: ptr32, out: ptr32, cx: int, cy: int):
+    # out[i*3 : i*3+3] = projected x, projected y, rotated z (Q10)
+    m0 = m[0]; m1 = m[1]; m2 = m[2]
+    m3 = m[3]; m4 = m[4]; m5 = m[5]
+    m6 = m[6]; m7 = m[7]; m8 = m[8]
+    i = 0
+    end = n * 3
+    while i < end:
+        vx = verts[i]; vy = verts[i + 1]; vz = verts[i + 2]
+        x = (m0 * vx + m1 * vy + m2 * vz) >> 14
+        y = (m3 * vx + m4 * vy + m5 * vz) >> 14
+        z = (m6 * vx + m7 * vy + m8 * vz) >> 14
+        k = (z + 4096) >> 4
+        if k < 32: k = 32
+        if k > 1023: k = 1023
+        r = recip[k]
+        out[i] = cx + ((x * r) >> 16)
+        out[i + 1] = cy - ((y * r) >> 16)
+        out[i + 2] = z
+        i += 3
+
+@micropython.viper
+def _sort_faces(tris: ptr16, n: int, screen: ptr32, depth: ptr32, order: ptr16):
+    # Depth is the sum of the three vertex z (same order as the mean).
+    # Insertion sort, farthest first: the order carries over between
+    # frames and barely changes, so this is close to one pass.
+    for t in range(n):
+        o = t * 3
+        depth[t] = screen[tris[o] * 3 + 2] + screen[tris[o + 1] * 3 + 2] + screen[tris[o + 2] * 3 + 2]
+    for i in range(1, n):
+        f = order[i]
+        d = depth[f]
+        j = i - 1
+        while j >= 0 and depth[order[j]] < d:
+            order[j + 1] = order[j]
+            j -= 1
+        order[j + 1] = f
+
+@micropython.viper
+def _fill_triangle(fb: ptr8, width: int, height: int, bpp: int, y0: int, y1: int, y2: int,
+                   xa: int, xb1: int, da: int, db0: int, db1: int, color: int):
+    # Vertices sorted by y. xa walks the long edge (v0 -> v2) and xb the
+    # short ones (v0 -> v1, then v1 -> v2), both Q16 with per-row steps
+    # da/db*. Each row fills the span between them.
+    xb = xa
+    db = db0
+    c0 = color & 0xFF
+    c1 = (color >> 8) & 0xFF
+    c2 = (color >> 16) & 0xFF
+    y = y0
+    while y <= y2:
+        if y == y1:
+            xb = xb1
+            db = db1
+        if y >= height:
+            break
+        if y >= 0:
+            if xa < xb:
+                l = xa >> 16; r = xb >> 16
+            else:
+                l = xb >> 16; r = xa >> 16
+            if l < 0: l = 0
+            if r >= width: r = width - 1
+            if l <= r:
+                o = y * width + l
+                end = y * width + r
+                if bpp == 2:
+                    o = o * 2
+                    end = end * 2
+                    while o <= end:
+                        fb[o] = c0; fb[o + 1] = c1
+                        o += 2
+                elif bpp == 1:
+                    while o <= end:
+                        fb[o] = c0
+                        o += 1
+                else:
+                    o = o * 3
+                    end = end * 3
+                    while o <= end:
+                        fb[o] = c2; fb[o + 1] = c1; fb[o + 2] = c0
+                        o += 3
+        xa += da
+        xb += db
+        y += 1
 
-def draw_mesh(display, angle, vertices, faces):
+class Mesh:
+    """A mesh prepared for drawing: fixed-point vertices, faces fanned
+    into triangles, unique edges, and every per-frame buffer allocated
+    up front."""
+    def __init__(self, vertices, faces):
+        scale = 1 << _VERT_SHIFT
+        self.vertex_count = len(vertices)
+        self.verts = array('i', (int(round(c * scale)) for v in vertices for c in v))
+        tris = []
+        tri_face = []
+        edges = set()
+        for fi, face in enumerate(faces):
+            for k in range(1, len(face) - 1):
+                tris.extend((face[0], face[k], face[k + 1]))
+                tri_face.append(fi)
+            for k in range(len(face)):
+                a, b = face[k], face[(k + 1) % len(face)]
+                edges.add((a, b) if a < b else (b, a))
+        self.tri_count = len(tri_face)
+        self.tris = array('H', tris)
+        # Colour cycles per original face, as before triangulation
+        self.tri_color = array('B', (fi % len(_BASE_COLORS) for fi in tri_face))
+        self.edges = array('H', (i for e in sorted(edges) for i in e))
+        self.screen = array('i', bytes(12 * self.vertex_count))
+        self.depth = array('i', bytes(4 * self.tri_count))
+        self.order = array('H', range(self.tri_count))
+        self.matrix = array('i', bytes(36))
+
+    def set_rotation(self, angle):
+        # Y rotation then X rotation by the same angle, as one matrix
+        s = math.sin(angle)
+        c = math.cos(angle)
+        one = 1 << _MAT_SHIFT
+        m = self.matrix
+        m[0] = int(c * one); m[1] = 0; m[2] = int(-s * one)
+        m[3] = int(-s * s * one); m[4] = int(c * one); m[5] = int(-s * c * one)
+        m[6] = int(s * c * one); m[7] = int(s * one); m[8] = int(c * c * one)
+
+_recip = None
+
+def draw_mesh(display, angle, mesh, colors, edge_color, edge_width=0):
+    """Draw mesh rotated by angle: painter-sorted filled triangles, then
+    edges. colors are packed with display.pack (one per base colour),
+    as is edge_color. With edge_width, edges are anti-aliased lines of
+    that width via display.aa_line instead, and edge_color is 0xRRGGBB.
+    Writes the framebuffer directly: callers update the screen region
+    themselves."""
+    global _recip
+    if _recip is None:
+        _recip = _build_recip()
     width, height = display.get_bounds()
-    # Rotate vertices
-    rotated = []
-    for v in vertices:
-        # Rotate around the Y-axis
-        x = v[0] * math.cos(angle) - v[2] * math.sin(angle)
-        z = v[0] * math.sin(angle) + v[2] * math.cos(angle)
-        # Rotate around the X-axis for a better 3D effect
-        y = v[1] * math.cos(angle) - z * math.sin(angle)
-        z2 = v[1] * math.sin(angle) + z * math.cos(angle)
-        rotated.append([x, y, z2])
-
-    # Project vertices
-    projected = [project(v[0], v[1], v[2], width, height, angle) for v in rotated]
-
-    # Calculate average Z for each face for painter's algorithm
-    face_depths = []
-    for i, face in enumerate(faces):
-        avg_z = sum(rotated[idx][2] for idx in face) / len(face)
-        face_depths.append((avg_z, i))
-    face_depths.sort(reverse=True)  # Draw farthest faces first
-
-    # Simple color cycling for faces
-    base_colors = [
-        0xFF0000, 0x00FF00, 0x0000FF,
-        0xFFFF00, 0x00FFFF, 0xFF00FF
-    ]
-
-    # Draw filled faces
-    for _, face_idx in face_depths:
-        face = faces[face_idx]
-        points = [projected[idx] for idx in face]
-        color = base_colors[face_idx % len(base_colors)]
-        # Expecting callers to pass ints; here we convert the static palette to ints inline
-        r = (color >> 16) & 0xFF
-        g = (color >> 8) & 0xFF
-        b = color & 0xFF
-        face_pen = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
-        flat = []
-        for (px, py) in points:
-            flat.append(int(px))
-            flat.append(int(py))
-        display.poly(0, 0, array('h', flat), face_pen, True)
-
-    # Draw edges on top
-    edge_pen = 0xFFFFFF
-    for face in faces:
-        for i in range(len(face)):
-            start = face[i]
-            end = face[(i + 1) % len(face)]
-            x1, y1 = projected[start]
-            x2, y2 = projected[end]
-            display.line(x1, y1, x2, y2, edge_pen)
+    mesh.set_rotation(angle)
+    screen = mesh.screen
+    _transform(mesh.verts, mesh.vertex_count, mesh.matrix, _recip, screen, width // 2, height // 2)
+    tris = mesh.tris
+    order = mesh.order
+    _sort_faces(tris, mesh.tri_count, screen, mesh.depth, order)
+
+    fb = _as_ptr8(display)
+    bpp = display.bytes_per_pixel
+    tri_color = mesh.tri_color
+    for k in range(mesh.tri_count):
+        t = order[k]
+        o = t * 3
+        a = tris[o] * 3; b = tris[o + 1] * 3; c = tris[o + 2] * 3
+        # Sort the three vertices by y (swaps only: no tuples)
+        if screen[b + 1] < screen[a + 1]: a, b = b, a
+        if screen[c + 1] < screen[b + 1]: b, c = c, b
+        if screen[b + 1] < screen[a + 1]: a, b = b, a
+        x0 = screen[a]; y0 = screen[a + 1]
+        x1 = screen[b]; y1 = screen[b + 1]
+        x2 = screen[c]; y2 = screen[c + 1]
+        if y2 < 0 or y0 >= height:
+            continue
+        da = ((x2 - x0) << 16) // (y2 - y0) if y2 > y0 else 0
+        db0 = ((x1 - x0) << 16) // (y1 - y0) if y1 > y0 else 0
+        db1 = ((x2 - x1) << 16) // (y2 - y1) if y2 > y1 else 0
+        _fill_triangle(fb, width, height, bpp, y0, y1, y2,
+                       x0 << 16, x1 << 16, da, db0, db1, colors[tri_color[t]])
+
+    edges = mesh.edges
+    if edge_width:
+        aa_line = display.aa_line
+        for i in range(0, len(edges), 2):
+            a = edges[i] * 3
+            b = edges[i + 1] * 3
+            aa_line(screen[a], screen[a + 1], screen[b], screen[b + 1], edge_width, edge_color)
+        return
+
+    line = display.fb.line
+    for i in range(0, len(edges), 2):
+        a = edges[i] * 3
+        b = edges[i + 1] * 3
+        line(screen[a], screen[a + 1], screen[b], screen[b + 1], edge_color)
 
 class MeshDisplay:
-    def __init__(self, display, mesh_vertices, mesh_faces):
+    def __init__(self, display, mesh_vertices, mesh_faces, edge_width=0):
         self.display = display
         self.display_width, self.display_height = self.display.get_bounds()
         self.angle = 0
-        self.vertices = mesh_vertices
-        self.faces = mesh_faces
+        self.mesh = Mesh(mesh_vertices, mesh_faces)
+        self.colors = array('i', (display.pack(c) for c in _BASE_COLORS))
+        # Anti-aliased edges take the colour unpacked
+        self.edge_width = edge_width
+        self.edge_color = 0xFFFFFF if edge_width else display.pack(0xFFFFFF)
+        self.frame_ms = 0
 
     CREATION_PRIORITY = 1
     @staticmethod
@@ -99,23 +259,23 @@ class MeshDisplay:
         # You can set the OBJ file path in your config or hardcode it here
         obj_path = provider['config'].get('obj_path', 'mesh.obj')
         vertices, faces = load_obj(obj_path)
-        return MeshDisplay(provider['display'], vertices, faces)
+        edge_width = provider['config'].get('mesh_edge_width', 0)
+        return MeshDisplay(provider['display'], vertices, faces, edge_width)
 
     async def start(self):
         while True:
             self.angle += 0.05
+            if self.angle > 2 * math.pi:
+                self.angle -= 2 * math.pi
             self.update()
             await asyncio.sleep(0.01)
 
     def update(self):
         start_update_ms = utime.ticks_ms()
-        mem_before = gc.mem_alloc()
         # Clear with black
         self.display.fill(0x000000)
-        draw_mesh(self.display, self.angle, self.vertices, self.faces)
+        draw_mesh(self.display, self.angle, self.mesh, self.colors, self.edge_color, self.edge_width)
 
         # Render full screen for mesh display
         self.display.update((0, 0, self.display_width, self.display_height))
-        update_time_ms = utime.ticks_diff(utime.ticks_ms(), start_update_ms)
-        mem_after = gc.mem_alloc()
-        print(f"MeshDisplay: {update_time_ms}ms, mem: {mem_before} -> {mem_after} ({mem_after - mem_before:+d})")
+        self.frame_ms = utime.ticks_diff(utime.ticks_ms(), start_update_ms)
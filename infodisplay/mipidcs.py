@@ -1,9 +1,20 @@
+import asyncio
 import micropython
+from array import array
 from machine import PWM
 
+try:
+    from time import ticks_us, ticks_diff
+except ImportError:
+    # CPython (tests, simulator) has no ticks API
+    from time import perf_counter_ns
+    def ticks_us(): return perf_counter_ns() // 1000
+    def ticks_diff(a, b): return a - b
+
 try:
     import rp2
     import time
+    import uctypes
     from machine import mem32
     _HAS_RP2_DMA = hasattr(rp2, 'DMA')
 except ImportError:
@@ -15,6 +26,9 @@ _SPI_TX_DMA_MAP = {
     'RP2040': {0: (0x4003c000, 16), 1: (0x40040000, 18)},
 }
 
+# Framebuffer bytes per pixel for each source colour mode
+_SOURCE_BPP = {'RGB565': 2, 'RGB888': 3}
+
 # User orientation constants
 LANDSCAPE = 0
 REFLECT = 1
@@ -94,6 +108,119 @@ def _rgb565_swap_upscale_line(dest: ptr16, source: ptr16, src_offset: int, src_p
             d += 1
         s += 1; src_pixels -= 1
 
+@micropython.viper
+def _rgb332_to_565_upscale_line(dest: ptr8, source: ptr8, src_offset: int, src_pixels: int, scale: int, lut: ptr8):
+    s: int = src_offset
+    d: int = 0
+    while src_pixels:
+        idx: int = source[s] << 1
+        hi = lut[idx]
+        lo = lut[idx + 1]
+        for _ in range(scale):
+            dest[d] = hi; dest[d + 1] = lo
+            d += 2
+        s += 1; src_pixels -= 1
+
+# --- Multi-line converters: `lines` source rows, `src_stride` pixels
+# apart, packed back to back into dest for one DMA transfer ---
+
+@micropython.viper
+def _rgb565_to_888_lines(dest: ptr8, source: ptr16, src_offset: int, src_stride: int, pixels: int, lines: int, lut: ptr8):
+    # Each line as _rgb565_to_888_line - Unrolled 4x
+    d: int = 0
+    while lines:
+        s: int = src_offset
+        n: int = pixels
+        while n >= 4:
+            c = source[s]
+            dest[d] = lut[(c >> 11) & 0x1F]
+            dest[d + 1] = lut[((c >> 5) & 0x3F) + 32]
+            dest[d + 2] = lut[(c & 0x1F) + 96]
+            c = source[s + 1]
+            dest[d + 3] = lut[(c >> 11) & 0x1F]
+            dest[d + 4] = lut[((c >> 5) & 0x3F) + 32]
+            dest[d + 5] = lut[(c & 0x1F) + 96]
+            c = source[s + 2]
+            dest[d + 6] = lut[(c >> 11) & 0x1F]
+            dest[d + 7] = lut[((c >> 5) & 0x3F) + 32]
+            dest[d + 8] = lut[(c & 0x1F) + 96]
+            c = source[s + 3]
+            dest[d + 9] = lut[(c >> 11) & 0x1F]
+            dest[d + 10] = lut[((c >> 5) & 0x3F) + 32]
+            dest[d + 11] = lut[(c & 0x1F) + 96]
+            s += 4; d += 12; n -= 4
+        while n:
+            c = source[s]
+            dest[d] = lut[(c >> 11) & 0x1F]
+            dest[d + 1] = lut[((c >> 5) & 0x3F) + 32]
+            dest[d + 2] = lut[(c & 0x1F) + 96]
+            s += 1; d += 3; n -= 1
+        src_offset += src_stride; lines -= 1
+
+@micropython.viper
+def _rgb565_swap_lines(dest: ptr16, source: ptr16, src_offset: int, src_stride: int, pixels: int, lines: int, lut: ptr8):
+    # Each line as _rgb565_swap_line - Unrolled 4x
+    d: int = 0
+    while lines:
+        s: int = src_offset
+        n: int = pixels
+        while n >= 4:
+            c = source[s]; dest[d] = (c << 8) | (c >> 8)
+            c = source[s+1]; dest[d+1] = (c << 8) | (c >> 8)
+            c = source[s+2]; dest[d+2] = (c << 8) | (c >> 8)
+            c = source[s+3]; dest[d+3] = (c << 8) | (c >> 8)
+            s += 4; d += 4; n -= 4
+        while n:
+            c = source[s]; dest[d] = (c << 8) | (c >> 8)
+            s += 1; d += 1; n -= 1
+        src_offset += src_stride; lines -= 1
+
+@micropython.viper
+def _rgb332_to_888_lines(dest: ptr8, source: ptr8, src_offset: int, src_stride: int, pixels: int, lines: int, lut: ptr8):
+    # Each line as _rgb332_to_888_line - Unrolled 4x
+    d: int = 0
+    while lines:
+        s: int = src_offset
+        n: int = pixels
+        while n >= 4:
+            i: int = source[s] * 3
+            dest[d] = lut[i]; dest[d + 1] = lut[i + 1]; dest[d + 2] = lut[i + 2]
+            i = source[s + 1] * 3
+            dest[d + 3] = lut[i]; dest[d + 4] = lut[i + 1]; dest[d + 5] = lut[i + 2]
+            i = source[s + 2] * 3
+            dest[d + 6] = lut[i]; dest[d + 7] = lut[i + 1]; dest[d + 8] = lut[i + 2]
+            i = source[s + 3] * 3
+            dest[d + 9] = lut[i]; dest[d + 10] = lut[i + 1]; dest[d + 11] = lut[i + 2]
+            s += 4; d += 12; n -= 4
+        while n:
+            i2: int = source[s] * 3
+            dest[d] = lut[i2]; dest[d + 1] = lut[i2 + 1]; dest[d + 2] = lut[i2 + 2]
+            s += 1; d += 3; n -= 1
+        src_offset += src_stride; lines -= 1
+
+@micropython.viper
+def _rgb332_to_565_lines(dest: ptr8, source: ptr8, src_offset: int, src_stride: int, pixels: int, lines: int, lut: ptr8):
+    # Each line as _rgb332_to_565_line - Unrolled 4x
+    d: int = 0
+    while lines:
+        s: int = src_offset
+        n: int = pixels
+        while n >= 4:
+            idx: int = source[s] << 1
+            dest[d] = lut[idx]; dest[d+1] = lut[idx+1]
+            idx = source[s+1] << 1
+            dest[d+2] = lut[idx]; dest[d+3] = lut[idx+1]
+            idx = source[s+2] << 1
+            dest[d+4] = lut[idx]; dest[d+5] = lut[idx+1]
+            idx = source[s+3] << 1
+            dest[d+6] = lut[idx]; dest[d+7] = lut[idx+1]
+            s += 4; d += 8; n -= 4
+        while n:
+            idx = source[s] << 1
+            dest[d] = lut[idx]; dest[d+1] = lut[idx+1]
+            s += 1; d += 2; n -= 1
+        src_offset += src_stride; lines -= 1
+
 def build_rgb332_888_lut():
     """256-entry RGB332 -> RGB888 table (768 bytes) for _rgb332_to_888_line."""
     lut = bytearray(256 * 3)
@@ -123,6 +250,33 @@ def _rgb332_to_888_line(dest: ptr8, source: ptr8, src_offset: int, pixels: int,
         dest[d] = lut[i2]; dest[d + 1] = lut[i2 + 1]; dest[d + 2] = lut[i2 + 2]
         s += 1; d += 3; pixels -= 1
 
+@micropython.viper
+def _rgb332_to_888_upscale_line(dest: ptr8, source: ptr8, src_offset: int, src_pixels: int, scale: int, lut: ptr8):
+    s: int = src_offset
+    d: int = 0
+    while src_pixels:
+        i: int = source[s] * 3
+        r8 = lut[i]
+        g8 = lut[i + 1]
+        b8 = lut[i + 2]
+        for _ in range(scale):
+            dest[d] = r8; dest[d + 1] = g8; dest[d + 2] = b8
+            d += 3
+        s += 1; src_pixels -= 1
+
+@micropython.viper
+def _rgb888_upscale_line(dest: ptr8, source: ptr8, src_offset: int, src_pixels: int, scale: int, lut: ptr8):
+    s: int = src_offset * 3
+    d: int = 0
+    while src_pixels:
+        r8 = source[s]
+        g8 = source[s + 1]
+        b8 = source[s + 2]
+        for _ in range(scale):
+            dest[d] = r8; dest[d + 1] = g8; dest[d + 2] = b8
+            d += 3
+        s += 3; src_pixels -= 1
+
 @micropython.viper
 def _rgb332_to_565_line(dest: ptr8, source: ptr8, src_offset: int, pixels: int, lut: ptr8):
     s: int = src_offset
@@ -142,6 +296,39 @@ def _rgb332_to_565_line(dest: ptr8, source: ptr8, src_offset: int, pixels: int,
         dest[d] = lut[idx]; dest[d+1] = lut[idx+1]
         s += 1; d += 2; pixels -= 1
 
+@micropython.viper
+def _tile_band_diff(source: ptr8, offset: int, stride: int, tile_bytes: int, last_bytes: int,
+                    ntiles: int, rows: int, table: ptr32, t_off: int, flags: ptr8) -> int:
+    # djb2 over each tile's bytes (masked to a small int so CPython and
+    # viper agree), compared against and written back to the table.
+    # flags[t] = 1 for tiles whose checksum changed; returns their count.
+    changed: int = 0
+    t: int = 0
+    base: int = offset
+    while t < ntiles:
+        n: int = tile_bytes
+        if t == ntiles - 1:
+            n = last_bytes
+        h: int = 5381
+        p: int = base
+        r: int = 0
+        while r < rows:
+            i: int = 0
+            while i < n:
+                h = ((h << 5) + h + source[p + i]) & 0x3FFFFFFF
+                i += 1
+            p += stride
+            r += 1
+        if int(table[t_off + t]) != h:
+            table[t_off + t] = h
+            flags[t] = 1
+            changed += 1
+        else:
+            flags[t] = 0
+        base += tile_bytes
+        t += 1
+    return changed
+
 def get_madctl(user_mode, panel_orientation, bgr):
     """Calculate MADCTL register value based on orientation and color order."""
     if not panel_orientation:
@@ -248,15 +435,43 @@ class _SpiTxDma:
         while self._dma.active():
             pass
 
+    def drain(self):
+        """Wait for the transfer and for the SPI block to go idle, so CS
+        can be raised straight after."""
+        self.wait()
+        while mem32[self._sr] & 0x10:
+            pass
+
 class SpiController:
+    """Command/data framing for a 4-wire MIPI DBI panel.
+
+    chunked_data sends each parameter byte in its own CS frame, which
+    some SPI-to-parallel front ends (e.g. ILI9488 boards) need; otherwise
+    parameters go out in one write. The last CASET/RASET is remembered
+    so set_window()/begin_write() skip resending an unchanged window.
+    """
     def __init__(self, spi, dc, cs, chunked_data=True):
         self.spi = spi
         self.dc = dc
         self.cs = cs
         self.chunked_data = chunked_data
         self._byte_buf = bytearray(1)
+        self._win_buf = bytearray(4)
+        # Last window sent, as (start << 16) | end; -1 = unknown
+        self._caset = -1
+        self._raset = -1
+
+    def invalidate_window(self):
+        """Forget the cached window (after a reset or an arbitrary command)."""
+        self._caset = -1
+        self._raset = -1
 
     def write_cmd(self, cmd):
+        self._caset = -1
+        self._raset = -1
+        self._cmd(cmd)
+
+    def _cmd(self, cmd):
         self.cs(1)
         self.dc(0)
         self.cs(0)
@@ -265,6 +480,11 @@ class SpiController:
 
     def write_cd(self, c, d):
         """Write command followed by data."""
+        self._caset = -1
+        self._raset = -1
+        self._cd(c, d)
+
+    def _cd(self, c, d):
         self.cs(1)
         self.dc(0)
         self.cs(0)
@@ -285,6 +505,8 @@ class SpiController:
 
     def write_data(self, d):
         """Write raw data (usually coordinates for window set)."""
+        self._caset = -1
+        self._raset = -1
         if self.chunked_data:
             for byte in d:
                 self.dc(1)
@@ -298,6 +520,74 @@ class SpiController:
             self.spi.write(d)
             self.cs(1)
 
+    def read_cmd(self, cmd, buf):
+        """Send a command and read its response into buf (needs MISO)."""
+        self.cs(1)
+        self.dc(0)
+        self.cs(0)
+        self.spi.write(cmd)
+        self.dc(1)
+        self.spi.readinto(buf)
+        self.cs(1)
+
+    def _coords(self, start, end):
+        b = self._win_buf
+        b[0] = start >> 8
+        b[1] = start & 0xFF
+        b[2] = end >> 8
+        b[3] = end & 0xFF
+        return b
+
+    def set_window(self, xs, xe, ys, ye):
+        """Send CASET/RASET (inclusive panel coordinates), skipping either
+        when it matches what the panel already has."""
+        c = (xs << 16) | xe
+        if c != self._caset:
+            self._cd(b"\x2a", self._coords(xs, xe))
+            self._caset = c
+        r = (ys << 16) | ye
+        if r != self._raset:
+            self._cd(b"\x2b", self._coords(ys, ye))
+            self._raset = r
+
+    def begin_write(self, xs, xe, ys, ye):
+        """Set the window and open a RAMWR data phase; close it with end_data().
+
+        In bulk mode the whole sequence shares one CS frame, with DC alone
+        separating each command from its parameters.
+        """
+        if self.chunked_data:
+            self.set_window(xs, xe, ys, ye)
+            self._cmd(b"\x2c")  # RAMWR
+            self.start_data()
+            return
+        spi = self.spi
+        dc = self.dc
+        self.cs(1)
+        self.cs(0)
+        c = (xs << 16) | xe
+        if c != self._caset:
+            dc(0)
+            spi.write(b"\x2a")
+            dc(1)
+            spi.write(self._coords(xs, xe))
+            self._caset = c
+        r = (ys << 16) | ye
+        if r != self._raset:
+            dc(0)
+            spi.write(b"\x2b")
+            dc(1)
+            spi.write(self._coords(ys, ye))
+            self._raset = r
+        dc(0)
+        spi.write(b"\x2c")  # RAMWR
+        dc(1)
+
+    def resume_write(self):
+        """Open a Write Memory Continue (RAMWC) data phase in the current window."""
+        self._cmd(b"\x3c")
+        self.start_data()
+
     def start_data(self):
         """Start a bulk data transfer (RAMWR)."""
         self.dc(1)
@@ -319,7 +609,8 @@ class SpiController:
 
 class MipiDisplay:
     """Base class for MIPI DCS compatible displays (ILI9488, ST7789, etc)."""
-    def __init__(self, spi, cs, dc, backlight, width, height, scale, color_mode, bpp, chunked_command_data=True):
+    def __init__(self, spi, cs, dc, backlight, width, height, scale, color_mode, bpp, chunked_command_data=True,
+                 dma_buffer_bytes=0):
         self._spi = spi
         self._cs = cs
         self._dc = dc
@@ -332,6 +623,9 @@ class MipiDisplay:
         self._linebuf = bytearray(width * bpp)
         self._cmd_buf = bytearray(4)
         self._lut = None # To be initialized by subclass
+        # Source pixels already in the wire format: unscaled renders send
+        # framebuffer rows as they are, with no conversion pass
+        self._passthrough = color_mode == 'RGB888' and bpp == 3
 
         self._spi_ctrl = SpiController(spi, dc, cs, chunked_data=chunked_command_data)
 
@@ -340,19 +634,194 @@ class MipiDisplay:
         if _HAS_RP2_DMA:
             try:
                 self._spi_dma = _SpiTxDma(spi)
-                self._linebuf2 = bytearray(width * bpp)
+                # dma_buffer_bytes is the budget for both ping-pong
+                # buffers; past one panel line each, unscaled renders
+                # pack as many rect lines as fit into every transfer
+                buf_len = dma_buffer_bytes // 2
+                if buf_len > width * bpp:
+                    self._linebuf = bytearray(buf_len)
+                else:
+                    buf_len = width * bpp
+                self._linebuf2 = bytearray(buf_len)
             except Exception:
                 self._spi_dma = None
 
+        # Per-render timing, see get_render_stats
+        self._render_count = 0
+        self._render_us_total = 0
+        self._render_us_max = 0
+        self.last_render_us = 0
+
+        # render_async holds the panel across yields; plain render() calls
+        # arriving meanwhile are queued and drawn when it finishes
+        self._async_lock = asyncio.Lock()
+        self._async_active = False
+        self._deferred = []
+
+        # Optional tile checksum cache (see set_tile_cache)
+        self._tile_size = 0
+        self._tile_table = None
+        self._tile_flags = None
+        self._tile_dims = None
+
+    def set_tile_cache(self, tile_size=16):
+        """Skip framebuffer tiles whose checksum matches what was last sent.
+
+        Each tile_size x tile_size tile of the source framebuffer keeps a
+        32-bit checksum of its last pushed contents; render() only sends
+        the runs of tiles whose checksum changed. Tiles are always sent
+        whole, so the table keeps matching the panel even when a bbox
+        cuts through a tile. Pass 0 to disable.
+        """
+        self._tile_size = tile_size
+        self._tile_table = None
+        self._tile_flags = None
+        self._tile_dims = None
+
+    def invalidate_tiles(self):
+        """Forget the panel contents, e.g. after a clear or rotation."""
+        if self._tile_table is not None:
+            table = self._tile_table
+            for i in range(len(table)):
+                table[i] = 0xFFFFFFFF
+
     def render(self, fb, width, height, bbox):
         x, y, rw, rh = bbox
         if x < 0 or y < 0 or rw <= 0 or rh <= 0: return
         if x + rw > width or y + rh > height: return
-            
+        if self._async_active:
+            # Interleaving would corrupt the window render_async is writing
+            self._deferred.append((fb, width, height, bbox))
+            return
+        t0 = ticks_us()
+        if self._tile_size:
+            for r in self._changed_tile_rects(fb, width, height, x, y, rw, rh):
+                self._render_rect(fb, width, r[0], r[1], r[2], r[3])
+        else:
+            self._render_rect(fb, width, x, y, rw, rh)
+        self._record_render(ticks_diff(ticks_us(), t0))
+
+    async def render_async(self, fb, width, height, bbox, lines_per_yield=16):
+        """render() that yields to the scheduler every lines_per_yield
+        source lines, so large pushes don't stall other tasks.
+
+        CS is raised before each yield and the transfer resumes with
+        Write Memory Continue (0x3C), so other devices on a shared SPI bus
+        can run in between. Sync render() calls made meanwhile are
+        deferred until this push completes.
+        """
+        x, y, rw, rh = bbox
+        if x < 0 or y < 0 or rw <= 0 or rh <= 0: return
+        if x + rw > width or y + rh > height: return
+        async with self._async_lock:
+            self._async_active = True
+            try:
+                t0 = ticks_us()
+                if self._tile_size:
+                    for r in self._changed_tile_rects(fb, width, height, x, y, rw, rh):
+                        await self._render_rect_async(fb, width, r[0], r[1], r[2], r[3], lines_per_yield)
+                else:
+                    await self._render_rect_async(fb, width, x, y, rw, rh, lines_per_yield)
+                # Wall-clock time, including the yields
+                self._record_render(ticks_diff(ticks_us(), t0))
+            except BaseException:
+                # Cancelled mid-push: checksums were stored for tiles that
+                # never reached the panel
+                self.invalidate_tiles()
+                raise
+            finally:
+                self._async_active = False
+                deferred = self._deferred
+                if deferred:
+                    self._deferred = []
+                    for args in deferred:
+                        self.render(*args)
+
+    def _record_render(self, dt):
+        self.last_render_us = dt
+        self._render_count += 1
+        self._render_us_total += dt
+        if dt > self._render_us_max:
+            self._render_us_max = dt
+
+    def get_render_stats(self, reset=False):
+        """Return (renders, last_us, average_us, max_us) since the last reset."""
+        count = self._render_count
+        stats = (count, self.last_render_us,
+                 self._render_us_total // count if count else 0, self._render_us_max)
+        if reset:
+            self._render_count = 0
+            self._render_us_total = 0
+            self._render_us_max = 0
+        return stats
+
+    def _changed_tile_rects(self, fb, width, height, x, y, rw, rh):
+        """Return (x, y, w, h) runs of tiles under the bbox that changed."""
+        t = self._tile_size
+        cols = (width + t - 1) // t
+        if self._tile_dims != (width, height):
+            # The checksum table is sized from the framebuffer, which is
+            # only known once render() is called; 0xFFFFFFFF never matches
+            # a (30-bit) checksum, so every tile starts out dirty
+            self._tile_table = array('I', (0xFFFFFFFF for _ in range(cols * ((height + t - 1) // t))))
+            self._tile_flags = bytearray(cols)
+            self._tile_dims = (width, height)
+        table = self._tile_table
+        flags = self._tile_flags
+        src_bpp = _SOURCE_BPP.get(self.source_color_mode, 1)
+        stride = width * src_bpp
+
+        tx0 = x // t
+        ntiles = (x + rw + t - 1) // t - tx0
+        last_w = width - (tx0 + ntiles - 1) * t
+        if last_w > t:
+            last_w = t
+
+        # Runs of changed tiles as [x0, x1, y0, y1]; a run whose columns
+        # match one in the band below is extended instead of restarted
+        out = []
+        pending = []
+        ty = y // t
+        ty_end = (y + rh + t - 1) // t
+        while ty < ty_end:
+            by0 = ty * t
+            rows = height - by0
+            if rows > t:
+                rows = t
+            changed = _tile_band_diff(fb, by0 * stride + tx0 * t * src_bpp, stride, t * src_bpp,
+                                      last_w * src_bpp, ntiles, rows, table, ty * cols + tx0, flags)
+            runs = []
+            if changed:
+                i = 0
+                while i < ntiles:
+                    if flags[i]:
+                        j = i + 1
+                        while j < ntiles and flags[j]:
+                            j += 1
+                        rx0 = (tx0 + i) * t
+                        rx1 = (tx0 + j) * t
+                        if rx1 > width:
+                            rx1 = width
+                        runs.append([rx0, rx1, by0, by0 + rows])
+                        i = j
+                    else:
+                        i += 1
+            for run in pending:
+                for new in runs:
+                    if new[0] == run[0] and new[1] == run[1]:
+                        new[2] = run[2]
+                        break
+                else:
+                    out.append((run[0], run[2], run[1] - run[0], run[3] - run[2]))
+            pending = runs
+            ty += 1
+        for run in pending:
+            out.append((run[0], run[2], run[1] - run[0], run[3] - run[2]))
+        return out
+
+    def _render_rect(self, fb, width, x, y, rw, rh):
         scale = self._scale
-        self._set_region_window(x * scale, y * scale, rw * scale, rh * scale)
-        self._spi_ctrl.write_cmd(b"\x2c")  # RAMWR
-        self._spi_ctrl.start_data()
+        self._begin_region_write(x * scale, y * scale, rw * scale, rh * scale)
         
         line_conv = self._get_line_conv(scale)
         fb_ptr = y * width + x
@@ -362,52 +831,156 @@ class MipiDisplay:
         self._render_spi(fb, width, fb_ptr, rw, rh, scale, bpp, lut, line_conv)
         self._spi_ctrl.end_data()
 
+    async def _render_rect_async(self, fb, width, x, y, rw, rh, lines_per_yield):
+        scale = self._scale
+        line_conv = self._get_line_conv(scale)
+        fb_ptr = y * width + x
+        lut = self._lut
+        bpp = self._bpp
+        self._begin_region_write(x * scale, y * scale, rw * scale, rh * scale)
+        while True:
+            n = lines_per_yield if rh > lines_per_yield else rh
+            self._render_spi(fb, width, fb_ptr, rw, n, scale, bpp, lut, line_conv)
+            self._spi_ctrl.end_data()
+            fb_ptr += n * width
+            rh -= n
+            if rh <= 0:
+                break
+            await asyncio.sleep(0)
+            # RAMWC: carry on where the last batch stopped
+            self._spi_ctrl.resume_write()
+
 
 
     def _render_spi(self, fb, width, fb_ptr, rw, rh, scale, bpp, lut, line_conv):
+        if scale == 1 and self._passthrough:
+            self._render_spi_direct(fb, width, fb_ptr, rw, rh, bpp)
+            return
+
         write_len = rw * scale * bpp
         out_view = memoryview(self._linebuf)[:write_len]
-        if scale > 1:
-            for _ in range(rh):
-                lb = self._linebuf
-                line_conv(lb, fb, fb_ptr, rw, scale, lut)
-                fb_ptr += width
-                for _ in range(scale):
-                    self._spi.write(out_view)
-            return
 
         dma = self._spi_dma
-        if dma is not None and rh > 1:
+        if dma is not None and scale == 1 and rh > 1 and len(self._linebuf2) >= 2 * write_len:
+            block_conv = self._get_block_conv()
+            if block_conv is not None:
+                self._render_spi_batched(fb, width, fb_ptr, rw, rh, write_len, lut, block_conv, dma)
+                return
+
+        if dma is not None and rh * scale > 1:
             # Double-buffered: DMA line N to the panel while converting
-            # line N+1. The final line goes through blocking spi.write,
-            # which drains the FIFO and BSY so end_data() can raise CS.
+            # line N+1. A scaled line is converted once and DMAed `scale`
+            # times; the next line converts during its first repeat. The
+            # very last transfer goes through blocking spi.write, which
+            # drains the FIFO and BSY so end_data() can raise CS.
             buf_a = self._linebuf
             buf_b = self._linebuf2
-            line_conv(buf_a, fb, fb_ptr, rw, lut)
+            if scale > 1:
+                line_conv(buf_a, fb, fb_ptr, rw, scale, lut)
+            else:
+                line_conv(buf_a, fb, fb_ptr, rw, lut)
             fb_ptr += width
             for _ in range(rh - 1):
                 dma.start(buf_a, write_len)
-                line_conv(buf_b, fb, fb_ptr, rw, lut)
+                if scale > 1:
+                    line_conv(buf_b, fb, fb_ptr, rw, scale, lut)
+                else:
+                    line_conv(buf_b, fb, fb_ptr, rw, lut)
                 fb_ptr += width
                 dma.wait()
+                for _ in range(scale - 1):
+                    dma.start(buf_a, write_len)
+                    dma.wait()
                 buf_a, buf_b = buf_b, buf_a
+            for _ in range(scale - 1):
+                dma.start(buf_a, write_len)
+                dma.wait()
             if buf_a is not self._linebuf:
                 out_view = memoryview(buf_a)[:write_len]
             self._spi.write(out_view)
             return
 
+        if scale > 1:
+            for _ in range(rh):
+                lb = self._linebuf
+                line_conv(lb, fb, fb_ptr, rw, scale, lut)
+                fb_ptr += width
+                for _ in range(scale):
+                    self._spi.write(out_view)
+            return
+
         for _ in range(rh):
             lb = self._linebuf
             line_conv(lb, fb, fb_ptr, rw, lut)
             fb_ptr += width
             self._spi.write(out_view)
 
+    def _render_spi_batched(self, fb, width, fb_ptr, rw, rh, write_len, lut, block_conv, dma):
+        # As the double-buffered path above, but every DMA transfer
+        # carries as many whole lines as fit in a buffer
+        per_batch = len(self._linebuf2) // write_len
+        buf_a = self._linebuf
+        buf_b = self._linebuf2
+        n = per_batch if rh > per_batch else rh
+        block_conv(buf_a, fb, fb_ptr, width, rw, n, lut)
+        fb_ptr += n * width
+        rh -= n
+        length = n * write_len
+        while rh:
+            dma.start(buf_a, length)
+            n = per_batch if rh > per_batch else rh
+            block_conv(buf_b, fb, fb_ptr, width, rw, n, lut)
+            fb_ptr += n * width
+            rh -= n
+            dma.wait()
+            buf_a, buf_b = buf_b, buf_a
+            length = n * write_len
+        self._spi.write(memoryview(buf_a)[:length])
+
+    def _render_spi_direct(self, fb, width, fb_ptr, rw, rh, bpp):
+        # The framebuffer is already in wire format: full-width rects are
+        # one contiguous run, narrower ones one transfer per row straight
+        # out of the framebuffer
+        start = fb_ptr * bpp
+        row_bytes = width * bpp
+        if rw == width:
+            self._spi.write(memoryview(fb)[start:start + rh * row_bytes])
+            return
+        n = rw * bpp
+        dma = self._spi_dma
+        if dma is not None:
+            # DMA from the buffer address: no memoryview slice per row
+            addr = uctypes.addressof(fb)
+            for _ in range(rh):
+                dma.start(addr + start, n)
+                start += row_bytes
+                dma.wait()
+            dma.drain()
+            return
+        mv = memoryview(fb)
+        for _ in range(rh):
+            self._spi.write(mv[start:start + n])
+            start += row_bytes
+
     def _get_line_conv(self, scale):
         raise NotImplementedError
 
-    def _set_region_window(self, x, y, rw, rh):
+    def _get_block_conv(self):
+        """Multi-line converter for unscaled batched DMA, or None."""
+        return None
+
+    def _window_coords(self, x, y, rw, rh):
+        """Map a display-space rect to inclusive panel (xs, xe, ys, ye)."""
         raise NotImplementedError
 
+    def _set_region_window(self, x, y, rw, rh):
+        xs, xe, ys, ye = self._window_coords(x, y, rw, rh)
+        self._spi_ctrl.set_window(xs, xe, ys, ye)
+
+    def _begin_region_write(self, x, y, rw, rh):
+        xs, xe, ys, ye = self._window_coords(x, y, rw, rh)
+        self._spi_ctrl.begin_write(xs, xe, ys, ye)
+
     def _wcmd(self, buf):
         self._spi_ctrl.write_cmd(buf)
 
@@ -3,7 +3,7 @@ import asyncio
 import gc
 import textbox
 import random
-from httpstream import HttpRequest
+from httpstream import HttpRequest, NotModified
 from flatjson import load_array
 
 class NewsDisplay:
@@ -16,7 +16,7 @@ class NewsDisplay:
         self.story_index = 0
 
         # Pre-allocate HTTP request helper
-        self._http_request = HttpRequest(url)
+        self._http_request = HttpRequest(url, conditional=True, compressed=True)
 
     CREATION_PRIORITY = 1
     def create(provider):
@@ -51,6 +51,8 @@ class NewsDisplay:
 
             print(f"News data fetched: {len(self.stories)} stories")
 
+        except NotModified:
+            pass
         except Exception as e:
             print(f"Error fetching news data: {e}")
 
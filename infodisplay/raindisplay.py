@@ -4,7 +4,7 @@ import chart
 import colors
 import textbox
 import random
-from httpstream import HttpRequest
+from httpstream import HttpRequest, NotModified
 from flatjson import load_array
 
 def rain_color_fn(idx, value):
@@ -51,7 +51,7 @@ class RainDisplay:
         self._rate_ints = []
 
         # Pre-allocate HTTP request helper
-        self._http_request = HttpRequest(url)
+        self._http_request = HttpRequest(url, conditional=True)
     
     CREATION_PRIORITY = 2
     def create(provider):
@@ -162,7 +162,9 @@ class RainDisplay:
                 self._normalized_r = []
                 self._beaufort_values = []
                 self._rate_ints = []
-                
+
+        except NotModified:
+            pass
         except Exception as e:
             print(f"Error fetching weather data: {e}")
        
@@ -192,12 +194,12 @@ class RainDisplay:
         wind_row_y = self.display_height - row_height
         chart_height = wind_row_y - chart_y
 
-        # Draw key labels
+        # Draw key labels, blended into the grey key column
         white_pen = 0xFFFFFF
-        await textbox.draw_textbox(self.display, 't', 0, hour_row_y, key_width, row_height, color=white_pen, font=font_name)
-        await textbox.draw_textbox(self.display, 'mm', 0, precip_row_y, key_width, row_height, color=white_pen, font=font_name)
-        await textbox.draw_textbox(self.display, '%', 0, chart_y, key_width, chart_height, color=white_pen, font=font_name)
-        await textbox.draw_textbox(self.display, 'Bft', 0, wind_row_y, key_width, row_height, color=white_pen, font=font_name)
+        await textbox.draw_textbox(self.display, 't', 0, hour_row_y, key_width, row_height, color=white_pen, font=font_name, blend=True)
+        await textbox.draw_textbox(self.display, 'mm', 0, precip_row_y, key_width, row_height, color=white_pen, font=font_name, blend=True)
+        await textbox.draw_textbox(self.display, '%', 0, chart_y, key_width, chart_height, color=white_pen, font=font_name, blend=True)
+        await textbox.draw_textbox(self.display, 'Bft', 0, wind_row_y, key_width, row_height, color=white_pen, font=font_name, blend=True)
 
         # Draw separator lines
         self.display.rect(key_width, precip_row_y, data_width, 2, 0x424142, True)
@@ -254,4 +256,4 @@ class RainDisplay:
         await chart.draw_colored_points(self.display, key_width, chart_y, self.display_width - key_width, chart_height,
                                     self._r_values, self._normalized_r, rain_color_fn, radius=2)
 
-        self.display.update((0, y_start, self.display_width, self.display_height - y_start))
\ No newline at end of file
+        await self.display.flush_async((0, y_start, self.display_width, self.display_height - y_start))
\ No newline at end of file
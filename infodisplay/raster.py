@@ -0,0 +1,390 @@
+"""Anti-aliased shape rasterisers shared by widgets.
+
+Two kernels cover the shapes:
+
+- _convex: any convex polygon (lines, triangles, hands, arrows) as the
+  intersection of half-planes. Each edge carries a Q14 outward normal
+  and offset, so a pixel's coverage is the smallest of its per-edge
+  ramps (signed distance to the edge, over one pixel). No sqrt, one
+  divide per edge per row to bound the span.
+- _round: the set of points within [ri, ro] of an axis-aligned box.
+  An empty box gives discs (ri 0) and rings; a non-empty one rounded
+  rectangles. Edge coverage comes from squared distances as in
+  gauge.py (alpha ~ (r_edge^2 - d^2) / 2r), so again no per-pixel sqrt.
+
+Both blend against what is already in the framebuffer, so shapes can be
+drawn over anything. Fixed point throughout: coordinates Q4 (16ths of a
+pixel, pixel centres at +8), squared distances Q8, alpha 0..256.
+"""
+
+import sys
+from array import array
+
+from bitblt import _as_ptr8, _as_ptr16
+
+try:
+    import micropython
+    IS_MICROPYTHON = sys.implementation.name == 'micropython'
+except ImportError:
+    IS_MICROPYTHON = False
+
+if not IS_MICROPYTHON:
+    class micropython:
+        @staticmethod
+        def viper(f): return f
+
+    ptr8 = ptr16 = ptr32 = object
+
+
+@micropython.viper
+def _isqrt(v: int) -> int:
+    r = 0
+    b = 1 << 28
+    while b > v:
+        b >>= 2
+    while b != 0:
+        t = r + b
+        if v >= t:
+            v -= t
+            r = (r >> 1) + b
+        else:
+            r >>= 1
+        b >>= 2
+    return r
+
+
+def _disc(p, i, rq):
+    # AA disc edge: alpha = clamp((r2p - d2) * inv >> 16, 0, 256), which
+    # linearises coverage over the 1px edge band ((r+.5)^2 - (r-.5)^2 = 2r).
+    # rq is the radius in Q4; inv = 65536/(2r) = 524288/rq, amax = 2r*256.
+    p[i] = (rq + 8) * (rq + 8)
+    if rq >= 16:
+        p[i + 1] = 524288 // rq
+        p[i + 2] = rq * 32
+    else:
+        p[i + 1] = 0
+        p[i + 2] = 0
+
+
+def pack_rgb(bpp, r, g, b):
+    """Pack 8-bit channels into a framebuffer word/byte for bpp."""
+    if bpp == 3:
+        return (r << 16) | (g << 8) | b
+    if bpp == 2:
+        return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+    return (r & 0xE0) | ((g & 0xE0) >> 3) | ((b & 0xC0) >> 6)
+
+
+# _PARAMS layout, common to both kernels. Signed values carry _BIAS:
+# kernels read them via ptr32, unsigned on 64-bit builds (see chart.py)
+#  0 y0  1 y1  2 x0  3 x1   pixel bounds (clipped, exclusive ends)
+#  4 stride (bytes)  5 bpp  6 fbw (px)
+#  7..9 r, g, b  10 packed colour
+# _convex:
+# 11 n                     edge count (at most _MAX_EDGES)
+# 12.. per edge nx, ny, c  outward unit normal (Q14, biased) and offset
+#                          (Q4, biased): signed distance = p.n - c
+# _round:
+# 11 cxq 12 cyq            box centre (Q4, biased)
+# 13 ex  14 ey             box half extents (Q4)
+# 15..17 outer edge (r2p, inv, amax) as _disc   18 ro (Q4)
+# 19..21 inner edge, all 0 for none
+#
+# Scratch: only the single active display renders at a time
+_MAX_EDGES = 8
+_BIAS = 1 << 24
+_PARAMS = array('i', (0 for _ in range(12 + 3 * _MAX_EDGES)))
+
+
+@micropython.viper
+def _convex(dest8: ptr8, dest16: ptr16, p: ptr32):
+    bias = 1 << 24
+    y = int(p[0]); y1 = int(p[1]); bx0 = int(p[2]); bx1 = int(p[3])
+    stride = int(p[4]); bpp = int(p[5]); fbw = int(p[6])
+    cr = int(p[7]); cg = int(p[8]); cb = int(p[9]); packed = int(p[10])
+    n = int(p[11])
+    ee = 12 + n * 3
+    while y < y1:
+        yq = (y << 4) + 8
+        # Narrow the row to the columns no edge rules out (a pixel past
+        # each edge), widened a pixel either side for rounding
+        xs = bx0; xe = bx1
+        e = 12
+        while e < ee:
+            nx = int(p[e]) - bias
+            if nx != 0:
+                t = ((int(p[e + 2]) - bias + 8) << 14) - yq * (int(p[e + 1]) - bias)
+                if nx > 0:
+                    t = ((t // nx - 8) >> 4) + 2
+                    if t < xe: xe = t
+                else:
+                    t = ((t // nx - 8) >> 4) - 1
+                    if t > xs: xs = t
+            e += 3
+        x = xs
+        while x < xe:
+            xq = (x << 4) + 8
+            a = 256
+            e = 12
+            while e < ee:
+                d = ((xq * (int(p[e]) - bias) + yq * (int(p[e + 1]) - bias) + 8192) >> 14) - (int(p[e + 2]) - bias)
+                c = (8 - d) << 4
+                if c < a:
+                    a = c
+                    if a <= 0:
+                        break
+                e += 3
+            if a > 0:
+                if bpp == 2:
+                    o = y * fbw + x
+                    if a >= 256:
+                        dest16[o] = packed
+                    else:
+                        v = dest16[o]
+                        r = (v >> 8) & 0xF8; g = (v >> 3) & 0xFC; b = (v << 3) & 0xF8
+                        r += ((cr - r) * a) >> 8
+                        g += ((cg - g) * a) >> 8
+                        b += ((cb - b) * a) >> 8
+                        dest16[o] = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+                elif bpp == 3:
+                    o = y * stride + x * 3
+                    if a > 256: a = 256
+                    r = dest8[o]; g = dest8[o + 1]; b = dest8[o + 2]
+                    dest8[o] = r + (((cr - r) * a) >> 8)
+                    dest8[o + 1] = g + (((cg - g) * a) >> 8)
+                    dest8[o + 2] = b + (((cb - b) * a) >> 8)
+                else:
+                    o = y * stride + x
+                    if a >= 256:
+                        dest8[o] = packed
+                    else:
+                        v = dest8[o]
+                        r = v & 0xE0; g = (v << 3) & 0xE0; b = (v << 6) & 0xC0
+                        r += ((cr - r) * a) >> 8
+                        g += ((cg - g) * a) >> 8
+                        b += ((cb - b) * a) >> 8
+                        dest8[o] = (r & 0xE0) | ((g & 0xE0) >> 3) | ((b & 0xC0) >> 6)
+            x += 1
+        y += 1
+
+
+@micropython.viper
+def _round(dest8: ptr8, dest16: ptr16, p: ptr32):
+    bias = 1 << 24
+    y = int(p[0]); y1 = int(p[1]); bx0 = int(p[2]); bx1 = int(p[3])
+    stride = int(p[4]); bpp = int(p[5]); fbw = int(p[6])
+    cr = int(p[7]); cg = int(p[8]); cb = int(p[9]); packed = int(p[10])
+    cxq = int(p[11]) - bias; cyq = int(p[12]) - bias
+    ex = int(p[13]); ey = int(p[14])
+    ro2p = int(p[15]); inv_o = int(p[16]); amax_o = int(p[17]); ro = int(p[18])
+    ri2m = int(p[19]); inv_i = int(p[20]); amax_i = int(p[21])
+    while y < y1:
+        qy = (y << 4) + 8 - cyq
+        if qy < 0: qy = 0 - qy
+        qy -= ey
+        if qy < 0: qy = 0
+        qy2 = qy * qy
+        if qy2 >= ro2p:
+            y += 1
+            continue
+        # Span: box half width plus the outer radius at this height
+        half = ex + int(_isqrt(ro2p - qy2))
+        xs = (cxq - half) >> 4
+        xe = ((cxq + half) >> 4) + 1
+        if xs < bx0: xs = bx0
+        if xe > bx1: xe = bx1
+        x = xs
+        while x < xe:
+            qx = (x << 4) + 8 - cxq
+            if qx < 0: qx = 0 - qx
+            qx -= ex
+            if qx < 0: qx = 0
+            d2 = qx * qx + qy2
+            a = ro2p - d2
+            if a > 0:
+                a = 256 if a >= amax_o else (a * inv_o) >> 16
+                if ri2m > 0:
+                    c = d2 - ri2m
+                    if c <= 0:
+                        a = 0
+                    elif c < amax_i:
+                        c = (c * inv_i) >> 16
+                        if c < a: a = c
+            if a > 0:
+                if bpp == 2:
+                    o = y * fbw + x
+                    if a >= 256:
+                        dest16[o] = packed
+                    else:
+                        v = dest16[o]
+                        r = (v >> 8) & 0xF8; g = (v >> 3) & 0xFC; b = (v << 3) & 0xF8
+                        r += ((cr - r) * a) >> 8
+                        g += ((cg - g) * a) >> 8
+                        b += ((cb - b) * a) >> 8
+                        dest16[o] = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+                elif bpp == 3:
+                    o = y * stride + x * 3
+                    r = dest8[o]; g = dest8[o + 1]; b = dest8[o + 2]
+                    dest8[o] = r + (((cr - r) * a) >> 8)
+                    dest8[o + 1] = g + (((cg - g) * a) >> 8)
+                    dest8[o + 2] = b + (((cb - b) * a) >> 8)
+                else:
+                    o = y * stride + x
+                    if a >= 256:
+                        dest8[o] = packed
+                    else:
+                        v = dest8[o]
+                        r = v & 0xE0; g = (v << 3) & 0xE0; b = (v << 6) & 0xC0
+                        r += ((cr - r) * a) >> 8
+                        g += ((cg - g) * a) >> 8
+                        b += ((cb - b) * a) >> 8
+                        dest8[o] = (r & 0xE0) | ((g & 0xE0) >> 3) | ((b & 0xC0) >> 6)
+            x += 1
+        y += 1
+
+
+def _setup(display, x0, y0, x1, y1, color):
+    """Fill the common block for pixel bounds [x0, x1) x [y0, y1);
+    returns (fbw, bpp), or None when nothing is on screen."""
+    fbw, fbh = display.get_bounds()
+    if x0 < 0: x0 = 0
+    if y0 < 0: y0 = 0
+    if x1 > fbw: x1 = fbw
+    if y1 > fbh: y1 = fbh
+    if x1 <= x0 or y1 <= y0:
+        return None
+    bpp = display.bytes_per_pixel
+    r = (color >> 16) & 0xFF
+    g = (color >> 8) & 0xFF
+    b = color & 0xFF
+    p = _PARAMS
+    p[0] = y0; p[1] = y1; p[2] = x0; p[3] = x1
+    p[4] = fbw * bpp; p[5] = bpp; p[6] = fbw
+    p[7] = r; p[8] = g; p[9] = b
+    p[10] = pack_rgb(bpp, r, g, b)
+    return fbw, bpp
+
+
+def _run(kernel, display, bpp):
+    p = _PARAMS
+    d8 = _as_ptr8(display)
+    kernel(d8, _as_ptr16(display) if bpp == 2 else d8, p)
+    display.invalidate(p[2], p[0], p[3] - p[2], p[1] - p[0])
+
+
+def _edges(coords):
+    # Outward unit normals for a convex polygon of Q4 points, whichever
+    # way it winds
+    n = len(coords) // 2
+    area = 0
+    for i in range(n):
+        j = (i + 1) % n
+        area += coords[i * 2] * coords[j * 2 + 1] - coords[j * 2] * coords[i * 2 + 1]
+    sign = 1 if area >= 0 else -1
+    p = _PARAMS
+    count = 0
+    for i in range(n):
+        j = (i + 1) % n
+        ax = coords[i * 2]; ay = coords[i * 2 + 1]
+        dx = coords[j * 2] - ax; dy = coords[j * 2 + 1] - ay
+        length = (dx * dx + dy * dy) ** 0.5
+        if length < 1:
+            continue
+        nx = int(sign * dy * 16384 / length)
+        ny = int(-sign * dx * 16384 / length)
+        o = 12 + count * 3
+        p[o] = nx + _BIAS
+        p[o + 1] = ny + _BIAS
+        p[o + 2] = ((ax * nx + ay * ny + 8192) >> 14) + _BIAS
+        count += 1
+    p[11] = count
+    return count
+
+
+def polygon(display, coords, color):
+    """Fill the convex polygon with vertices (x0, y0, x1, y1, ...) at
+    pixel centres (fractional allowed), in either winding, up to
+    _MAX_EDGES vertices."""
+    n = len(coords) // 2
+    if n < 3 or n > _MAX_EDGES:
+        raise ValueError(f"polygon needs 3 to {_MAX_EDGES} vertices")
+    q = [int(c * 16) + 8 for c in coords]
+    xs = q[0::2]; ys = q[1::2]
+    if _setup(display, (min(xs) >> 4) - 1, (min(ys) >> 4) - 1,
+              (max(xs) >> 4) + 2, (max(ys) >> 4) + 2, color) is None:
+        return
+    if _edges(q) < 3:
+        return
+    _run(_convex, display, display.bytes_per_pixel)
+
+
+def line(display, x0, y0, x1, y1, width, color):
+    """Line of the given width (px, at least 1) between pixel centres,
+    butt ends half a pixel past each endpoint."""
+    axq = int(x0 * 16) + 8; ayq = int(y0 * 16) + 8
+    bxq = int(x1 * 16) + 8; byq = int(y1 * 16) + 8
+    dx = bxq - axq; dy = byq - ayq
+    length = (dx * dx + dy * dy) ** 0.5
+    if length < 1:
+        ux = 16384; uy = 0
+    else:
+        ux = int(dx * 16384 / length); uy = int(dy * 16384 / length)
+    hwq = int(width * 8) if width > 1 else 8
+    pad = hwq + 24
+    if _setup(display, (min(axq, bxq) - pad) >> 4, (min(ayq, byq) - pad) >> 4,
+              ((max(axq, bxq) + pad) >> 4) + 1, ((max(ayq, byq) + pad) >> 4) + 1, color) is None:
+        return
+    # Four half-planes: either side of the centre line, and the two ends
+    p = _PARAMS
+    along = (axq * ux + ayq * uy + 8192) >> 14
+    across = (axq * -uy + ayq * ux + 8192) >> 14
+    lenq = int(length)
+    for i, (nx, ny, c) in enumerate(((-uy, ux, across + hwq), (uy, -ux, -across + hwq),
+                                     (-ux, -uy, -along + 8), (ux, uy, along + lenq + 8))):
+        o = 12 + i * 3
+        p[o] = nx + _BIAS; p[o + 1] = ny + _BIAS; p[o + 2] = c + _BIAS
+    p[11] = 4
+    _run(_convex, display, display.bytes_per_pixel)
+
+
+def _rounded(display, cx, cy, ex, ey, ro, ri, color):
+    # Centre and extents Q4; ro/ri radii Q4 around the box (ri 0: solid)
+    pad = ro + 24
+    if _setup(display, (cx - ex - pad) >> 4, (cy - ey - pad) >> 4,
+              ((cx + ex + pad) >> 4) + 1, ((cy + ey + pad) >> 4) + 1, color) is None:
+        return
+    p = _PARAMS
+    p[11] = cx + _BIAS; p[12] = cy + _BIAS
+    p[13] = ex; p[14] = ey
+    _disc(p, 15, ro)
+    p[18] = ro
+    if ri > 0:
+        # Inner edge: alpha rises from (ri - .5)^2 over the same 2r band
+        v = ri - 8
+        p[19] = v * v if v > 0 else 1
+        p[20] = 524288 // ri if ri >= 16 else 0
+        p[21] = ri * 32 if ri >= 16 else 0
+    else:
+        p[19] = 0; p[20] = 0; p[21] = 0
+    _run(_round, display, display.bytes_per_pixel)
+
+
+def disc(display, cx, cy, r, color):
+    """Filled circle covering the same pixels as ellipse(cx, cy, r, r)."""
+    _rounded(display, int(cx * 16) + 8, int(cy * 16) + 8, 0, 0, int(r * 16) + 8, 0, color)
+
+
+def ring(display, cx, cy, outer, inner, color):
+    """Annulus between radii inner and outer (px) about (cx, cy)."""
+    _rounded(display, int(cx * 16) + 8, int(cy * 16) + 8, 0, 0,
+             int(outer * 16) + 8, int(inner * 16) + 8, color)
+
+
+def rounded_rect(display, x, y, w, h, radius, color):
+    """Filled rectangle covering pixels (x, y)..(x + w - 1, y + h - 1)
+    with corners rounded to radius (px)."""
+    rq = int(radius * 16)
+    if rq * 2 > w * 16: rq = w * 8
+    if rq * 2 > h * 16: rq = h * 8
+    if rq < 8: rq = 8
+    _rounded(display, int(x * 16) + w * 8, int(y * 16) + h * 8, w * 8 - rq, h * 8 - rq, rq, 0, color)
@@ -1,8 +1,74 @@
+import sys
 import math
 import utime
 import asyncio
 import textbox
 import random
+from array import array
+
+from bitblt import _as_ptr8
+
+try:
+    import micropython
+    IS_MICROPYTHON = sys.implementation.name == 'micropython'
+except ImportError:
+    IS_MICROPYTHON = False
+
+if not IS_MICROPYTHON:
+    class micropython:
+        @staticmethod
+        def viper(f): return f
+
+    ptr8 = ptr16 = ptr32 = object
+
+def _clamp16(v):
+    # Screen coordinates are stored as 'h': far off-screen points stay far
+    # off-screen
+    return -32768 if v < -32768 else 32767 if v > 32767 else v
+
+def _touches(x, y, w, h, rects):
+    for rx, ry, rw, rh in rects:
+        if x < rx + rw and rx < x + w and y < ry + rh and ry < y + h:
+            return True
+    return False
+
+@micropython.viper
+def _fill_runs(fb: ptr8, width: int, bpp: int, runs: ptr16, n: int, color: int,
+               cx0: int, cy0: int, cx1: int, cy1: int):
+    # runs holds n (x, y, length) spans, already on screen; each is drawn
+    # in color where it falls inside the clip (cx0, cy0)-(cx1, cy1)
+    c0 = color & 0xFF
+    c1 = (color >> 8) & 0xFF
+    c2 = (color >> 16) & 0xFF
+    i = 0
+    end = n * 3
+    while i < end:
+        y = runs[i + 1]
+        l = runs[i]
+        r = l + runs[i + 2]
+        i += 3
+        if y < cy0 or y >= cy1:
+            continue
+        if l < cx0: l = cx0
+        if r > cx1: r = cx1
+        o = y * width + l
+        e = y * width + r
+        if bpp == 2:
+            o = o * 2
+            e = e * 2
+            while o < e:
+                fb[o] = c0; fb[o + 1] = c1
+                o += 2
+        elif bpp == 1:
+            while o < e:
+                fb[o] = c0
+                o += 1
+        else:
+            o = o * 3
+            e = e * 3
+            while o < e:
+                fb[o] = c2; fb[o + 1] = c1; fb[o + 2] = c0
+                o += 3
 
 class SolarSystemDisplay:
     def __init__(self, display, start_y):
@@ -77,6 +143,15 @@ class SolarSystemDisplay:
         self.view_pitch_rad = math.asin(0.53) # ~32 degrees
         self.sin_pitch = math.sin(self.view_pitch_rad)
         self.cos_pitch = math.cos(self.view_pitch_rad)
+
+        # Planets then comets, indexed as in the ephemeris table
+        self._bodies = self.planets + self.comets
+        self._comet_start = len(self.planets)
+        # Planets whose moons move every day even when the planet doesn't
+        self._moons = set(i for i, p in enumerate(self.planets) if p['name'] in ('Earth', 'Jupiter', 'Saturn'))
+        self._eph_day = None
+        self._eph = None
+        self._orbit_runs = None
     
     def _true_anomaly_approx(self, mean_anomaly, eccentricity):
         """Equation of center approximation for elliptical orbits (good for e < 0.3)"""
@@ -204,14 +279,7 @@ class SolarSystemDisplay:
     def should_activate(self):
         return True
 
-    async def activate(self):
-        # Clear background
-        self.display.rect(0, self.top_margin, self.display_width, self.display_height - self.top_margin, self.bg_color, True)
-
-        # Draw Sun
-        self.display.ellipse(self.center_x, self.center_y, 6, 6, self.sun_color, fill=True)
-        
-        # Get constant for time
+    def _days_since_j2000(self):
         # Detect epoch (MicroPython Pico: 2000, Unix/CPython: 1970)
         # J2000 epoch: Jan 1, 2000, 12:00 TT (~11:58:55.816 UTC)
         t_seconds = utime.time()
@@ -224,74 +292,194 @@ class SolarSystemDisplay:
             j2000_offset = 946728000
         else:
             j2000_offset = 0  # Fallback, may be inaccurate
-        days_since_j2000 = (t_seconds - j2000_offset) / 86400.0
-        
-        # Process Planets
-        for p in self.planets:
-            # Mean Anomaly
-            # M = L - varpi (where varpi = Omega + omega_arg)
-            # here we have L0 (Mean Longitude) directly.
-            # M = L0 + n*t - varpi
-            # But we can just use M = (L - varpi)
-            
-            # Calculate Mean Longitude at time t
-            L = p['L0'] + (360.0 / p['period']) * days_since_j2000
-            
-            # Varpi (Longitude of Perihelion) = Node + Arg_Per
-            varpi = p['node'] + p['arg_p']
-            
-            M_deg = L - varpi
-            M_rad = math.radians(M_deg % 360)
-            
-            # True Anomaly
-            true_anom = self._solve_kepler(M_rad, p['e'])
-            
-            # Radius (AU)
-            r_au = self._get_orbital_radius(p['a'], p['e'], true_anom)
-            
-            # 3D Coordinates
-            x, y, z = self._to_heliocentric_coords(r_au, true_anom, p['node'], p['i'], p['arg_p'])
-            
-            # Project to Screen
+        return (t_seconds - j2000_offset) / 86400.0
+
+    def _body_coords(self, body, days_since_j2000):
+        """Heliocentric (x, y, z, r) in AU of a body at a time."""
+        # Mean Anomaly M = L - varpi, with the Mean Longitude at time t
+        # from L0 and Varpi (Longitude of Perihelion) = Node + Arg_Per
+        L = body['L0'] + (360.0 / body['period']) * days_since_j2000
+        varpi = body['node'] + body['arg_p']
+        M_rad = math.radians((L - varpi) % 360)
+
+        true_anom = self._solve_kepler(M_rad, body['e'])
+        r_au = self._get_orbital_radius(body['a'], body['e'], true_anom)
+        x, y, z = self._to_heliocentric_coords(r_au, true_anom, body['node'], body['i'], body['arg_p'])
+        return x, y, z, r_au
+
+    def _ephemeris(self, day):
+        """Screen positions of every body for a day (days since J2000),
+        computed once per day: per body (x, y, tail_x, tail_y), where the
+        tail tip is only meaningful for comets."""
+        if day == self._eph_day:
+            return self._eph
+        bodies = self._bodies
+        eph = array('h', bytes(8 * len(bodies)))
+        for i, body in enumerate(bodies):
+            x, y, z, r_au = self._body_coords(body, day)
             px, py = self._project_to_screen(x, y, z)
-            
-            # Draw Orbit Path
-            self._draw_orbit_path(p)
-            
-            # Draw Planet
-            self._draw_planet(p['name'], px, py, p['size'], p['color'])
-            await asyncio.sleep(0)
-        
-        # Process Comets
-        for c in self.comets:
-            await self._draw_comet(c, days_since_j2000)
+            tx, ty = px, py
+            if i >= self._comet_start and r_au > 0.1:
+                # Tail points away from the Sun: its tip is P + P_norm * length
+                tail_len_au = min(2.0, 5.0 / r_au)
+                k = 1 + tail_len_au / r_au
+                tx, ty = self._project_to_screen(x * k, y * k, z * k)
+            o = i * 4
+            eph[o] = _clamp16(px); eph[o + 1] = _clamp16(py)
+            eph[o + 2] = _clamp16(tx); eph[o + 3] = _clamp16(ty)
+        self._eph_day = day
+        self._eph = eph
+        return eph
+
+    def _build_orbits(self):
+        # Orbits are static for a layout: sample each once (fewer dots for
+        # comets) and rasterise its 2x2 dots into horizontal runs, packed
+        # as (x, y, length) on screen, so drawing an orbit is one kernel
+        # call rather than dozens of rects
+        self._orbit_runs = []
+        top = self.top_margin
+        width = self.display_width
+        height = self.display_height
+        for i, body in enumerate(self._bodies):
+            steps = 40 if i >= self._comet_start else 60
+            pixels = set()
+            for k in range(steps):
+                M_rad = (k / steps) * 2 * math.pi
+                v = self._solve_kepler(M_rad, body['e'])
+                r = self._get_orbital_radius(body['a'], body['e'], v)
+                x, y, z = self._to_heliocentric_coords(r, v, body['node'], body['i'], body['arg_p'])
+                px, py = self._project_to_screen(x, y, z)
+                if not (top <= py < height):
+                    continue
+                for dy in (0, 1):
+                    for dx in (0, 1):
+                        if 0 <= px + dx < width and py + dy < height:
+                            pixels.add((py + dy, px + dx))
+            runs = []
+            for y, x in sorted(pixels):
+                if runs and runs[-2] == y and runs[-3] + runs[-1] == x:
+                    runs[-1] += 1
+                else:
+                    runs.extend((x, y, 1))
+            self._orbit_runs.append(array('h', runs))
+        self._orbit_colors = array('i', (self.display.pack(0x212021 if i >= self._comet_start else self.orbit_color)
+                                         for i in range(len(self._bodies))))
+
+    def _visible(self, i, eph):
+        # Comets (and their orbits) only show while the nucleus is on screen
+        if i < self._comet_start:
+            return True
+        cx = eph[i * 4]; cy = eph[i * 4 + 1]
+        return self.top_margin <= cy < self.display_height and 0 <= cx < self.display_width
+
+    def _body_rect(self, i, eph):
+        """Screen area a body can touch (moons, rings, tail), or None."""
+        if not self._visible(i, eph):
+            return None
+        o = i * 4
+        cx = eph[o]; cy = eph[o + 1]
+        body = self._bodies[i]
+        if i >= self._comet_start:
+            pad = body['size'] + 1
+            x0 = min(cx, eph[o + 2]) - pad; y0 = min(cy, eph[o + 3]) - pad
+            x1 = max(cx, eph[o + 2]) + pad; y1 = max(cy, eph[o + 3]) + pad
+        else:
+            # Outermost moon sits at radius + 13
+            pad = body['size'] + 15
+            x0 = cx - pad; y0 = cy - pad; x1 = cx + pad; y1 = cy + pad
+        if x0 < 0: x0 = 0
+        if y0 < self.top_margin: y0 = self.top_margin
+        if x1 > self.display_width: x1 = self.display_width
+        if y1 > self.display_height: y1 = self.display_height
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return (x0, y0, x1 - x0, y1 - y0)
 
+    def _draw_orbits(self, eph, rects=None):
+        # Planet orbits in orbit_color, comet orbits dimmer; with rects,
+        # only inside them. Writes the framebuffer directly.
+        if rects is None:
+            rects = ((0, self.top_margin, self.display_width, self.display_height - self.top_margin),)
+        fb = _as_ptr8(self.display)
+        bpp = self.display.bytes_per_pixel
+        width = self.display_width
+        colors = self._orbit_colors
+        for i, runs in enumerate(self._orbit_runs):
+            if not self._visible(i, eph):
+                continue
+            for x, y, w, h in rects:
+                _fill_runs(fb, width, bpp, runs, len(runs) // 3, colors[i], x, y, x + w, y + h)
+
+    def _draw_sun(self):
+        self.display.ellipse(self.center_x, self.center_y, 6, 6, self.sun_color, fill=True)
+
+    def _draw_body(self, i, eph, day):
+        o = i * 4
+        body = self._bodies[i]
+        if i >= self._comet_start:
+            self._draw_comet(body, eph[o], eph[o + 1], eph[o + 2], eph[o + 3])
+        else:
+            self._draw_planet(body['name'], eph[o], eph[o + 1], body['size'], body['color'], day)
+
+    def _draw_all(self, eph, day):
+        # Clear background
+        self.display.rect(0, self.top_margin, self.display_width, self.display_height - self.top_margin, self.bg_color, True)
+        self._draw_orbits(eph)
+        self._draw_sun()
+        for i in range(len(self._bodies)):
+            if self._visible(i, eph):
+                self._draw_body(i, eph, day)
         self.display.update((0, self.top_margin, self.display_width, self.display_height - self.top_margin))
 
-    def _draw_orbit_path(self, body):
-        # Sample points along the orbit to draw 3D ellipse
-        # This is static for a body (elements don't change fast)
-        # We can calculate ~60 points
-        
-        steps = 60
-        color = self.orbit_color
-        
-        for i in range(steps):
-            M_rad = (i / steps) * 2 * math.pi
-            # Get v from M
-            v = self._solve_kepler(M_rad, body['e'])
-            r = self._get_orbital_radius(body['a'], body['e'], v)
-            
-            x, y, z = self._to_heliocentric_coords(r, v, body['node'], body['i'], body['arg_p'])
-            
-            px, py = self._project_to_screen(x, y, z)
-            
-            if self.top_margin <= py < self.display_height:
-                self.display.rect(px, py, 2, 2, color, fill=True)
+    async def activate(self):
+        day = int(self._days_since_j2000() // 1)
+        if self._orbit_runs is None:
+            self._build_orbits()
+        self._draw_all(self._ephemeris(day), day)
+
+        # Positions are per day: sleep until the next one, then redraw
+        # only what moved
+        while True:
+            days = self._days_since_j2000()
+            await asyncio.sleep(int((1 - (days - days // 1)) * 86400) + 1)
+            self._redraw_moved(int(self._days_since_j2000() // 1))
 
-    def _draw_moon(self, cx, cy, radius_px, angle_offset, color):
-        t = utime.time() / 86400.0
-        angle = angle_offset + (t * 10.0)
+    def _redraw_moved(self, day):
+        if day == self._eph_day:
+            return
+        old = self._eph
+        eph = self._ephemeris(day)
+        for i in range(self._comet_start, len(self._bodies)):
+            if self._visible(i, old) != self._visible(i, eph):
+                # A comet (and its orbit) came into or left view
+                self._draw_all(eph, day)
+                return
+        rects = []
+        for i in range(len(self._bodies)):
+            o = i * 4
+            if old[o] != eph[o] or old[o + 1] != eph[o + 1] or old[o + 2] != eph[o + 2] \
+                    or old[o + 3] != eph[o + 3] or i in self._moons:
+                for rect in (self._body_rect(i, old), self._body_rect(i, eph)):
+                    if rect is not None and rect not in rects:
+                        rects.append(rect)
+        if not rects:
+            return
+
+        for x, y, w, h in rects:
+            self.display.rect(x, y, w, h, self.bg_color, True)
+        self._draw_orbits(eph, rects)
+        if _touches(self.center_x - 6, self.center_y - 6, 13, 13, rects):
+            self._draw_sun()
+        # Redraw every body overlapping the erased areas, not just movers
+        for i in range(len(self._bodies)):
+            rect = self._body_rect(i, eph)
+            if rect is not None and _touches(rect[0], rect[1], rect[2], rect[3], rects):
+                self._draw_body(i, eph, day)
+        for rect in rects:
+            self.display.update(rect)
+
+    def _draw_moon(self, cx, cy, radius_px, angle_offset, color, day):
+        angle = angle_offset + (day * 10.0)
         
         # Simple 2D orbit for moons around planet (projected with global tilt)
         mx = int(cx + math.cos(angle) * radius_px)
@@ -300,7 +488,7 @@ class SolarSystemDisplay:
         
         self.display.pixel(mx, my, color)
 
-    def _draw_planet(self, name, cx, cy, radius, color):
+    def _draw_planet(self, name, cx, cy, radius, color, day):
         # Draw base planet
         self.display.ellipse(cx, cy, radius, radius, color, fill=True)
         
@@ -315,7 +503,7 @@ class SolarSystemDisplay:
             self.display.pixel(cx + 2, cy + 1, land_color)
             self.display.pixel(cx, cy + 1, land_color)
             self.display.pixel(cx, cy - 2, 0xFFFFFF) 
-            self._draw_moon(cx, cy, radius + 5, 0, 0x848284)
+            self._draw_moon(cx, cy, radius + 5, 0, 0x848284, day)
         elif name == 'Mars':
              self.display.pixel(cx, cy, 0x800000)
              self.display.pixel(cx, cy - 1, 0xFFFFFF)
@@ -336,17 +524,17 @@ class SolarSystemDisplay:
             self.display.pixel(spot_cx, spot_cy - 1, spot_color)
             self.display.pixel(spot_cx, spot_cy + 1, spot_color)
             
-            self._draw_moon(cx, cy, radius + 4, 1.0, 0xFFFFFF)
-            self._draw_moon(cx, cy, radius + 7, 2.5, 0xFFFFFF)
-            self._draw_moon(cx, cy, radius + 10, 4.0, 0xFFFFFF)
-            self._draw_moon(cx, cy, radius + 13, 5.5, 0xFFFFFF)
+            self._draw_moon(cx, cy, radius + 4, 1.0, 0xFFFFFF, day)
+            self._draw_moon(cx, cy, radius + 7, 2.5, 0xFFFFFF, day)
+            self._draw_moon(cx, cy, radius + 10, 4.0, 0xFFFFFF, day)
+            self._draw_moon(cx, cy, radius + 13, 5.5, 0xFFFFFF, day)
         elif name == 'Saturn':
             # Rings
             ring_rad_x = int(radius * 1.8)
             ring_rad_y = int(ring_rad_x * self.sin_pitch)
             self.display.ellipse(cx, cy, ring_rad_x, ring_rad_y, 0x848284, False)
             self.display.pixel(cx, cy - radius - 1, 0x000000)
-            self._draw_moon(cx, cy, radius + 12, 0.5, 0xDBD800)
+            self._draw_moon(cx, cy, radius + 12, 0.5, 0xDBD800, day)
         elif name == 'Uranus':
             self.display.vline(cx, cy - 2, 4, 0x00BFFF)
             # Rings (vertical-ish)
@@ -356,74 +544,24 @@ class SolarSystemDisplay:
         elif name == 'Neptune':
             self.display.pixel(cx + 1, cy - 1, 0x000084)
 
-    async def _draw_comet(self, c, days_since_j2000):
-        # Calculate position Same as planets
-        L = c['L0'] + (360.0 / c['period']) * days_since_j2000
-        varpi = c['node'] + c['arg_p']
-        M_deg = L - varpi
-        M_rad = math.radians(M_deg % 360)
-        
-        true_anom = self._solve_kepler(M_rad, c['e'])
-        r_au = self._get_orbital_radius(c['a'], c['e'], true_anom)
-        x, y, z = self._to_heliocentric_coords(r_au, true_anom, c['node'], c['i'], c['arg_p'])
-        
-        cx, cy = self._project_to_screen(x, y, z)
-        
-        if not (self.top_margin <= cy < self.display_height and 0 <= cx < self.display_width):
-            return
-
-        # Draw Orbit
-        # Fewer dots for comet
-        # Draw logic similar to planet but separate method or inline?
-        # Let's reuse internal logic manually for efficiency/custom color
-        steps = 40
-        for i in range(steps):
-             M_samp = (i / steps) * 2 * math.pi
-             v = self._solve_kepler(M_samp, c['e'])
-             r = self._get_orbital_radius(c['a'], c['e'], v)
-             ox, oy, oz = self._to_heliocentric_coords(r, v, c['node'], c['i'], c['arg_p'])
-             opx, opy = self._project_to_screen(ox, oy, oz)
-             if self.top_margin <= opy < self.display_height:
-                 self.display.rect(opx, opy, 2, 2, 0x212021, fill=True)
-
+    def _draw_comet(self, c, cx, cy, tx_s, ty_s):
         # Draw Nucleus
         self.display.ellipse(cx, cy, c['size'], c['size'], c['color'], fill=True)
-        
-        # Draw Tail (Away from Sun)
-        # Vector from Sun0x000000 to Comet(x,y,z) is (x,y,z)
-        # Tail is in direction (x,y,z).
-        # We need to project the tail vector.
-        # Actually in 3D, tail points radially out.
-        # So we can just take point P2 = P + (P_norm * length)
-        # And project P2.
-        
-        dist = r_au # calculated above
-        if dist > 0.1:
-            tail_len_au = min(2.0, 5.0 / dist) # AU length of tail
-            # Tail tip position
-            tx = x * (1 + tail_len_au/dist)
-            ty = y * (1 + tail_len_au/dist)
-            tz = z * (1 + tail_len_au/dist)
-            
-            tx_s, ty_s = self._project_to_screen(tx, ty, tz)
-            
-            # Draw line from cx,cy to tx_s, ty_s with fade
-            # Simple interpolation
-            dx = tx_s - cx
-            dy = ty_s - cy
-            steps = int(math.sqrt(dx*dx + dy*dy))
-            if steps > 0:
-                dx /= steps
-                dy /= steps
-                for i in range(steps):
-                    fade = max(0, 255 - i * (255/steps)*1.5) # Fade out
-                    fade = int(fade)
-                    col = (fade << 16) | (fade << 8) | fade
-                    
-                    px = int(cx + dx * i)
-                    py = int(cy + dy * i)
-                     
-                    if self.top_margin <= py < self.display_height:
-                        self.display.pixel(px, py, col)
-        
-        await asyncio.sleep(0)
+
+        # Draw Tail (away from the Sun) from the nucleus to the tip with fade
+        dx = tx_s - cx
+        dy = ty_s - cy
+        steps = int(math.sqrt(dx*dx + dy*dy))
+        if steps > 0:
+            dx /= steps
+            dy /= steps
+            for i in range(steps):
+                fade = max(0, 255 - i * (255/steps)*1.5) # Fade out
+                fade = int(fade)
+                col = (fade << 16) | (fade << 8) | fade
+
+                px = int(cx + dx * i)
+                py = int(cy + dy * i)
+
+                if self.top_margin <= py < self.display_height:
+                    self.display.pixel(px, py, col)
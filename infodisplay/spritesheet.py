@@ -0,0 +1,82 @@
+import struct
+
+from bitblt import blit_region, blit_rle, rle_buffer_size
+from iconcache import _load
+
+# Bundle written by tools/imageconvert.py bundle:
+#   magic, '<H' image count, then per image a '<B' name length, the
+#   UTF-8 name and '<IHHBB' (offset, width, height, bytes per pixel,
+#   flags), then the pixel blocks. A block is raw rows, or RLE rows as in
+#   single RLE files (without their header) when flags has FLAG_RLE.
+BUNDLE_MAGIC = b'AEIB'
+FLAG_RLE = 0x01
+_ENTRY_FMT = '<IHHBB'
+_ENTRY_SIZE = struct.calcsize(_ENTRY_FMT)
+
+class SpriteSheet:
+    """Many images in one file behind a single open handle: drawing an
+    image is a seek and a blit, with no per-image open() or directory
+    lookup."""
+    def __init__(self, path):
+        self.path = path
+        self._fh = open(path, 'rb')
+        self._index = {}
+        self._buf = bytearray(256)
+        try:
+            if self._fh.read(4) != BUNDLE_MAGIC:
+                raise ValueError(f"Not an image bundle: {path}")
+            count = struct.unpack('<H', self._fh.read(2))[0]
+            for _ in range(count):
+                name = self._fh.read(self._fh.read(1)[0]).decode()
+                self._index[name] = struct.unpack(_ENTRY_FMT, self._fh.read(_ENTRY_SIZE))
+        except Exception:
+            self._fh.close()
+            raise
+
+    def close(self):
+        self._fh.close()
+
+    def names(self):
+        return self._index.keys()
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def info(self, name):
+        """Return (width, height, bytes_per_pixel, rle) for an image."""
+        offset, width, height, bpp, flags = self._index[name]
+        return width, height, bpp, bool(flags & FLAG_RLE)
+
+    def _scratch(self, nbytes):
+        if len(self._buf) < nbytes:
+            self._buf = bytearray(nbytes)
+        return self._buf
+
+    def draw(self, framebuffer, fb_width, fb_height, name, x, y, sx=0, sy=0, sw=-1, sh=-1, clip=None):
+        """Blit the (sx, sy, sw, sh) part of an image (all of it by default)
+        with its top left at (x, y)."""
+        offset, width, height, bpp, flags = self._index[name]
+        if sw < 0: sw = width - sx
+        if sh < 0: sh = height - sy
+        if flags & FLAG_RLE:
+            # RLE rows only decode from the start: draw the whole image
+            # shifted, clipped to the requested part
+            part = (x, y, sw, sh)
+            if clip:
+                cx, cy, cw, ch = clip
+                x0 = max(x, cx); y0 = max(y, cy)
+                x1 = min(x + sw, cx + cw); y1 = min(y + sh, cy + ch)
+                if x1 <= x0 or y1 <= y0: return
+                part = (x0, y0, x1 - x0, y1 - y0)
+            self._fh.seek(offset)
+            blit_rle(framebuffer, fb_width, fb_height, bpp, self._fh, width, height,
+                     x - sx, y - sy, self._scratch(rle_buffer_size(width, bpp)), None, None, part)
+        else:
+            blit_region(framebuffer, fb_width, fb_height, bpp, self._fh, offset, width * bpp,
+                        sx, sy, sw, sh, x, y, self._scratch(width * bpp), None, None, clip)
+
+    def load(self, name):
+        """Decode an image into an iconcache.Icon."""
+        offset, width, height, bpp, flags = self._index[name]
+        self._fh.seek(offset)
+        return _load(self._fh, width, height, bpp, flags & FLAG_RLE)
@@ -2,7 +2,8 @@ from time import sleep_ms
 import gc
 import micropython
 from mipidcs import LANDSCAPE, REFLECT, USD, PORTRAIT, get_madctl, get_window_coords, MipiDisplay, \
-    _rgb565_swap_line, _rgb565_swap_upscale_line, _rgb332_to_565_line
+    _rgb565_swap_line, _rgb565_swap_upscale_line, _rgb332_to_565_line, _rgb332_to_565_upscale_line, \
+    _rgb565_swap_lines, _rgb332_to_565_lines
 
 # Display types
 GENERIC = (0, 0, 1, 0, True) # Default (x, y, orientation, bgr, inv)
@@ -15,9 +16,12 @@ ADAFRUIT_1_9 = (35, 0, PORTRAIT)
 class ST7789(MipiDisplay):
     def __init__(self, spi, cs, dc, backlight=None, height=240, width=240, 
                  disp_mode=LANDSCAPE, init_spi=False, display=GENERIC, 
-                 scale=1, source_color_mode='RGB565'):
+                 scale=1, source_color_mode='RGB565', dma_buffer_bytes=0):
+        if source_color_mode == 'RGB888':
+            raise ValueError("ST7789 takes RGB565 or RGB332 sources")
         
-        super().__init__(spi, cs, dc, backlight, width, height, scale, source_color_mode, 2, chunked_command_data=False)
+        super().__init__(spi, cs, dc, backlight, width, height, scale, source_color_mode, 2, chunked_command_data=False,
+                         dma_buffer_bytes=dma_buffer_bytes)
         
         self._offset = display[:2]
         self._spi_init = init_spi
@@ -35,7 +39,12 @@ class ST7789(MipiDisplay):
     def _get_line_conv(self, scale):
         if self.source_color_mode == 'RGB565':
             return _rgb565_swap_line if scale == 1 else _rgb565_swap_upscale_line
-        return _rgb332_to_565_line 
+        return _rgb332_to_565_line if scale == 1 else _rgb332_to_565_upscale_line
+
+    def _get_block_conv(self):
+        if self.source_color_mode == 'RGB565':
+            return _rgb565_swap_lines
+        return _rgb332_to_565_lines
 
     def _init(self, user_mode, orientation, cfg):
         bgr = cfg[0] if len(cfg) else False
@@ -54,15 +63,16 @@ class ST7789(MipiDisplay):
         self._current_mode = mode
         self.set_window(mode)
         self._wcd(b"\x36", int.to_bytes(mode, 1, "little"))
-        self._spi_ctrl.clear(self.width, self.height, self._linebuf)
+        self._spi_ctrl.clear(self.width, self.height, memoryview(self._linebuf)[:self.width * self._bpp])
         self._wcmd(b"\x29") # DISPON
 
     def set_rotation(self, disp_mode):
         mode = get_madctl(disp_mode, self._orientation, self._bgr)
         self._current_mode = mode
+        self.invalidate_tiles()
         self.set_window(mode)
         self._wcd(b"\x36", int.to_bytes(mode, 1, "little"))
-        self._spi_ctrl.clear(self.width, self.height, self._linebuf)
+        self._spi_ctrl.clear(self.width, self.height, memoryview(self._linebuf)[:self.width * self._bpp])
         self._wcmd(b"\x29") # DISPON
 
     def set_window(self, mode):
@@ -80,16 +90,5 @@ class ST7789(MipiDisplay):
         self._cmd_buf[3] = ye & 0xFF
         self._wcd(b"\x2b", self._cmd_buf)
 
-    def _set_region_window(self, x, y, rw, rh):
-        xs, xe, ys, ye = get_window_coords(240, 320, self.width, self.height, self._offset[0], self._offset[1], self._current_mode, x, y, rw, rh)
-        self._cmd_buf[0] = xs >> 8
-        self._cmd_buf[1] = xs & 0xFF
-        self._cmd_buf[2] = xe >> 8
-        self._cmd_buf[3] = xe & 0xFF
-        self._wcd(b"\x2a", self._cmd_buf)
-        
-        self._cmd_buf[0] = ys >> 8
-        self._cmd_buf[1] = ys & 0xFF
-        self._cmd_buf[2] = ye >> 8
-        self._cmd_buf[3] = ye & 0xFF
-        self._wcd(b"\x2b", self._cmd_buf)
\ No newline at end of file
+    def _window_coords(self, x, y, rw, rh):
+        return get_window_coords(240, 320, self.width, self.height, self._offset[0], self._offset[1], self._current_mode, x, y, rw, rh)
\ No newline at end of file
@@ -2,6 +2,9 @@ import asyncio
 from machine import SPI, Pin
 from st7789 import ST7789, LANDSCAPE
 from drawing import Drawing
+from bmfont import set_glyph_cache_budget
+from textbox import set_text_cache_budget
+from iconcache import set_icon_cache_budget
 
 # Default display dimensions
 DEFAULT_WIDTH = 320
@@ -42,12 +45,34 @@ class ST7789Display:
             display=(0, 0, 1, 0, True),
             scale=scale,
             source_color_mode=mode,
+            # Optional: bytes for the DMA ping-pong buffers (e.g. 8192)
+            dma_buffer_bytes=config.get('dma_buffer_bytes', 0),
         )
 
         # Optional rotation from config
         rotation = config.get('rotate', 0)  # degrees: 0/90/180/270
         st.set_rotation_degrees(int(rotation))
 
+        # Optional: skip unchanged tiles (size in framebuffer pixels, 0 = off)
+        tile_cache = config.get('tile_cache', 0)
+        if tile_cache:
+            st.set_tile_cache(int(tile_cache))
+
+        # Optional: RAM budget for cached font glyphs (bytes, 0 = off)
+        glyph_cache = config.get('glyph_cache_bytes')
+        if glyph_cache is not None:
+            set_glyph_cache_budget(int(glyph_cache))
+
+        # Optional: RAM budget for rendered text runs (bytes, 0 = off)
+        text_cache = config.get('text_cache_bytes')
+        if text_cache is not None:
+            set_text_cache_budget(int(text_cache))
+
+        # Optional: RAM budget for decoded icons (bytes, 0 = off)
+        icon_cache = config.get('icon_cache_bytes')
+        if icon_cache is not None:
+            set_icon_cache_budget(int(icon_cache))
+
         # Drawing uses reduced framebuffer dimensions
         drawing = Drawing(fb_width, fb_height, color_mode=mode)
         drawing.set_driver(st)
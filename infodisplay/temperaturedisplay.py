@@ -6,7 +6,7 @@ import asyncio
 import gc
 import random
 
-from httpstream import HttpRequest
+from httpstream import HttpRequest, NotModified
 from flatjson import load_array
 
 class TemperatureDisplay:
@@ -20,7 +20,7 @@ class TemperatureDisplay:
         self.display_width, self.display_height = self.display.get_bounds()
 
         # Pre-allocate HTTP request helper
-        self._http_request = HttpRequest(url)
+        self._http_request = HttpRequest(url, conditional=True)
     
     CREATION_PRIORITY = 1
     def create(provider):
@@ -30,20 +30,17 @@ class TemperatureDisplay:
         return TemperatureDisplay(provider['display'], config['url'], refresh_period, y_separator)
     
     async def fetch_temperature_data(self):
+        """Returns True if the readings changed (or failed to fetch), False if the server answered 304."""
         try:
             # Use unified HTTP request helper
-            reader, writer = await self._http_request.get()
-
-            # Stream parse JSON array into pre-allocated list
-            # Format: [current, min, max]
-            i = 0
-            async for element in load_array(reader):
-                if i < 3:
-                    self.temperature_data[i] = element
-                i += 1
-
-            writer.close()
-            await writer.wait_closed()
+            async with self._http_request.get_scoped() as (reader, writer):
+                # Stream parse JSON array into pre-allocated list
+                # Format: [current, min, max]
+                i = 0
+                async for element in load_array(reader):
+                    if i < 3:
+                        self.temperature_data[i] = element
+                    i += 1
 
             # Clean up after HTTP request
             import gc
@@ -51,14 +48,17 @@ class TemperatureDisplay:
 
             print(f"Temperature data fetched: current={self.temperature_data[0]}°C, min={self.temperature_data[1]}°C, max={self.temperature_data[2]}°C")
 
+        except NotModified:
+            return False
         except Exception as e:
             print(f"Error fetching temperature data: {e}")
+        return True
 
     async def start(self):
         await asyncio.sleep(random.randint(5, 10))
         while True:
-            await self.fetch_temperature_data()
-            await self.update()
+            if await self.fetch_temperature_data():
+                await self.update()
             await asyncio.sleep(self.refresh_period_seconds)
         
     async def update(self):
@@ -100,5 +100,5 @@ class TemperatureDisplay:
         await textbox.draw_textbox(self.display, min_temp_str, extent_left, text_y, text_size_x, text_size_y, color=white_pen, font='small', scale=font_scale)
         await textbox.draw_textbox(self.display, max_temp_str, centre_x, text_y, text_size_x, text_size_y, color=white_pen, font='small', scale=font_scale)
 
-        # Render only the temperature region
-        self.display.update((self.display_width - self.height, 0, self.height, self.height))
+        # Render only what was drawn in our (square) region
+        self.display.flush((self.display_width - self.height, 0, self.height, self.height))
@@ -1,12 +1,73 @@
 import math
 import random
 import asyncio
+import framebuf
 
 from bmfont import BMFont, draw_text, measure_text
 from font8 import Font8
+from framebuf888 import FrameBuffer888
 
 _BM_FONT_CACHE = {}
 
+class TextSprite:
+    """Minimal offscreen render target compatible with bmfont.draw_text
+    (which finds the pixel buffer via the _framebuffer attribute)."""
+    def __init__(self, w, h, bytes_per_pixel, mode):
+        self.width = w
+        self.height = h
+        self.bytes_per_pixel = bytes_per_pixel
+        self._framebuffer = bytearray(w * h * bytes_per_pixel)
+        if mode is None:
+            # RGB888 display: Drawing.blit needs a matching FrameBuffer888
+            self.fb = FrameBuffer888(self._framebuffer, w, h)
+        else:
+            self.fb = framebuf.FrameBuffer(self._framebuffer, w, h, mode)
+
+# Rendered BMFont text runs, keyed by everything that affects the pixels
+# inside the box: (font, text, color, scale, width, height, align, valign,
+# wrap) -> [last_use, sprite, dx, dy], where (dx, dy) is the sprite's
+# offset in the box. A hit is a single blit, skipping the measure, wrap
+# and per-glyph work. LRU by last_use within a byte budget, like the
+# bmfont glyph cache, and likewise off until the display config sets
+# text_cache_bytes.
+_TEXT_CACHE = {}
+_text_cache_budget = 0
+_text_cache_bytes = 0
+_text_cache_tick = 0
+_text_cache_hits = 0
+_text_cache_misses = 0
+
+def set_text_cache_budget(nbytes):
+    """Set the text sprite cache size in bytes (0 disables it)."""
+    global _text_cache_budget
+    _text_cache_budget = nbytes
+    _evict_text(0)
+
+def clear_text_cache():
+    """Drop every cached text sprite and reset the hit/miss counters."""
+    global _text_cache_bytes, _text_cache_hits, _text_cache_misses
+    _TEXT_CACHE.clear()
+    _text_cache_bytes = 0
+    _text_cache_hits = 0
+    _text_cache_misses = 0
+
+def text_cache_stats():
+    """Return (entries, bytes, hits, misses)."""
+    return len(_TEXT_CACHE), _text_cache_bytes, _text_cache_hits, _text_cache_misses
+
+def _evict_text(incoming):
+    global _text_cache_bytes
+    cache = _TEXT_CACHE
+    while cache and _text_cache_bytes + incoming > _text_cache_budget:
+        oldest_key = None
+        oldest = 0
+        for k in cache:
+            t = cache[k][0]
+            if oldest_key is None or t < oldest:
+                oldest_key = k
+                oldest = t
+        _text_cache_bytes -= len(cache.pop(oldest_key)[1]._framebuffer)
+
 def _get_bmfont(font_name):
     if font_name not in _BM_FONT_CACHE:
         font_path = f"fonts/{font_name}.fnt"
@@ -101,7 +162,7 @@ def draw_textbox_outline(display, x, y, width, height):
     display.rect(int(x), int(y), 1, int(height), c, True)  # left
     display.rect(int(x + width - 1), int(y), 1, int(height), c, True)  # right
 
-async def draw_textbox(display, text, x, y, width, height, *, color, font='bitmap8', scale=1, align='center', wrap=False, valign='center'):
+async def draw_textbox(display, text, x, y, width, height, *, color, font='bitmap8', scale=1, align='center', wrap=False, valign='center', cache=True, blend=False):
     """
     Draw text in a textbox with specified dimensions.
     
@@ -117,8 +178,32 @@ async def draw_textbox(display, text, x, y, width, height, *, color, font='bitma
         align: Text alignment - 'left', 'center', or 'right' (default: 'center')
         wrap: Whether to wrap text to fit within the textbox width (default: False)
         valign: Vertical alignment - 'top', 'center', or 'bottom' (default: 'center')
+        cache: Keep the rendered run for reuse; pass False for text that
+            rarely repeats, e.g. clock readouts (default: True)
+        blend: Blend anti-aliased bmfont edges into the existing background
+            instead of towards black; such text is drawn directly, never
+            from the cache (default: False)
     """
+    global _text_cache_tick, _text_cache_hits, _text_cache_misses, _text_cache_bytes
     is_bmfont = font != 'bitmap8'
+
+    # Sprites are blitted at integer positions, so only integer boxes
+    # can reuse one. They're blitted with colour 0 as the transparent key,
+    # so text that packs to 0 itself is always drawn directly.
+    cache_key = None
+    if cache and not blend and is_bmfont and _text_cache_budget and type(x) is int and type(y) is int \
+            and display.pack(color) != 0:
+        cache_key = (font, text, color, scale, width, height, align, valign, wrap)
+        entry = _TEXT_CACHE.get(cache_key)
+        if entry is not None:
+            _text_cache_tick += 1
+            entry[0] = _text_cache_tick
+            _text_cache_hits += 1
+            sprite = entry[1]
+            display.blit(sprite.fb, x + entry[2], y + entry[3], 0, None, sprite.width, sprite.height)
+            return
+        _text_cache_misses += 1
+
     if is_bmfont:
         bmfont_obj, bm_pages = _get_bmfont(font)
 
@@ -193,13 +278,39 @@ async def draw_textbox(display, text, x, y, width, height, *, color, font='bitma
         # Get scratch buffer from the drawing instance
         linebuf = display.get_scratch_buffer(bmfont_obj.scale_w)
 
+        sprite = None
+        if cache_key is not None:
+            # Sprite spans the box height and, unscaled, just the ink
+            # columns (the tight bounds); scaled runs keep the box width
+            sx0 = 0
+            sx1 = int(width)
+            if scale_up_i == 1 and scale_down_i == 1:
+                left = math.floor(text_x_position) - x
+                right = left + text_width_pixels + 1
+                if left > sx0: sx0 = left
+                if right < sx1: sx1 = right
+            sw = sx1 - sx0
+            sh = int(height)
+            nbytes = sw * sh * display.bytes_per_pixel
+            # Large runs would churn the whole cache: draw them directly
+            if sw > 0 and sh > 0 and nbytes <= _text_cache_budget // 4:
+                sprite = TextSprite(sw, sh, display.bytes_per_pixel, display.mode)
+                # Draw into the sprite as if it sat at (x + sx0, y)
+                dw, dh = sw, sh
+                origin_x -= x + sx0
+                current_y -= y
+                clip = (0, 0, sw, sh)
+                target = sprite
+        if sprite is None:
+            target = display
+
         lines = text.split('\n')
         line_h_pixels = bmfont_obj.line_height
         
         for i, line in enumerate(lines):
             # Optimization: check if this line is visible
             # Approximate check using current_y
-            if current_y + line_h_pixels < y or current_y > y + height:
+            if current_y + line_h_pixels < clip[1] or current_y > clip[1] + clip[3]:
                 if i > 0:
                      current_y += line_h_pixels
                 continue
@@ -208,14 +319,22 @@ async def draw_textbox(display, text, x, y, width, height, *, color, font='bitma
                 current_y += line_h_pixels
             
             draw_text(
-                display, dw, dh, bmfont_obj, bm_pages, line,
+                target, dw, dh, bmfont_obj, bm_pages, line,
                 # Shift origin by the tight-bounds min bearings so glyphs don't clip
                 origin_x,
                 current_y,
                 kerning=True, scale_up=scale_up_i, scale_down=scale_down_i, color=color,
-                linebuf=linebuf, clip=clip
+                linebuf=linebuf, clip=clip, blend=blend
             )
             await asyncio.sleep(0)
+
+        if sprite is not None:
+            _evict_text(nbytes)
+            _text_cache_tick += 1
+            _text_cache_bytes += nbytes
+            _TEXT_CACHE[cache_key] = [_text_cache_tick, sprite, sx0, 0]
+            display.blit(sprite.fb, x + sx0, y, 0, None, sw, sh)
+            return
     else:
         origin_x = math.floor(text_x_position)
         origin_y = math.floor(text_y_position)
@@ -237,5 +356,9 @@ async def draw_textbox(display, text, x, y, width, height, *, color, font='bitma
             Font8.draw_text(display, line, origin_x, math.floor(current_y), color, scale=scale, clip=clip)
             await asyncio.sleep(0)
     
+    # Glyphs go straight into the framebuffer via blit_region, so record
+    # the box as damage once rather than per glyph
+    display.invalidate(*clip)
+
     # DEBUG: Draw outline
     #draw_textbox_outline(display, x, y, width, height)
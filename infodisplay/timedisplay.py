@@ -1,19 +1,11 @@
 import math
 import asyncio
 import gc
-import framebuf
 import textbox
 
+from textbox import TextSprite
 from bmfont import draw_text, measure_text
 
-class _Cell:
-    """Minimal offscreen render target compatible with bmfont.draw_text
-    (which finds the pixel buffer via the _framebuffer attribute)."""
-    def __init__(self, w, h, bytes_per_pixel, mode):
-        self.bytes_per_pixel = bytes_per_pixel
-        self._framebuffer = bytearray(w * h * bytes_per_pixel)
-        self.fb = framebuf.FrameBuffer(self._framebuffer, w, h, mode)
-
 class TimeDisplay:
     MONTHS = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
     DAYS = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
@@ -53,12 +45,6 @@ class TimeDisplay:
         self.ms_x = self.sec_x + self.sec_width
         self.ms_width = self.date_seconds_width - self.sec_width
 
-        # Pre-built update regions (a fresh tuple per tick is avoidable churn)
-        self._time_region = (0, 0, self.time_width, height)
-        self._cal_region = (self.time_width, 0, self.date_seconds_width, self.section_height)
-        self._sec_region = (self.sec_x, self.section_height, self.sec_width, self.section_height)
-        self._ms_region = (self.ms_x, self.section_height, self.ms_width, self.section_height)
-
         # Prerendered '0'-'9' cells for the tenths box, built lazily on
         # first render (fonts load from flash on first use)
         self._tenth_cells = None
@@ -125,7 +111,7 @@ class TimeDisplay:
         cells = []
         for d in range(10):
             w, h, mx, my = measure_text(font, self._tenth_numbers[d])
-            cell = _Cell(cw, ch, bpp, mode)
+            cell = TextSprite(cw, ch, bpp, mode)
             origin_x = math.floor(box_x - (mx * up) // down) - ux
             draw_text(cell, cw, ch, font, pages, self._tenth_numbers[d],
                       origin_x, origin_y - uy,
@@ -154,10 +140,7 @@ class TimeDisplay:
 
             # Clear time area then draw
             self.display.rect(0, 0, time_width, height, 0x000000, True)
-            await textbox.draw_textbox(self.display, time_text, 0, 5, time_width, height - 5, color=0xFFFFFF, font='headline', scale=font_scale)
-
-            # Render only the time region
-            self.display.update(self._time_region)
+            await textbox.draw_textbox(self.display, time_text, 0, 5, time_width, height - 5, color=0xFFFFFF, font='headline', scale=font_scale, cache=False)
 
         # 2. Day / Date / Month Display
         day_region_changed = (
@@ -183,8 +166,6 @@ class TimeDisplay:
             await textbox.draw_textbox(self.display, day_date_text, cal_x, cal_y, cal_w, row_h, color=0xFFFFFF, font='small', scale=font_scale)
             await textbox.draw_textbox(self.display, month_text, cal_x, cal_y + row_h, cal_w, row_h, color=0xFFFFFF, font='small', scale=font_scale)
 
-            self.display.update(self._cal_region)
-
         # 3. Seconds Display
         if now[5] != self._last_second:
             self._last_second = now[5]
@@ -195,8 +176,7 @@ class TimeDisplay:
                 sec_text = "00" # Safety fallback
 
             self.display.rect(self.sec_x, section_height, self.sec_width, section_height, 0x000000, True)
-            await textbox.draw_textbox(self.display, sec_text, self.sec_x, section_height, self.sec_width, section_height, color=0xFFFFFF, font='regular', scale=font_scale, align='left')
-            self.display.update(self._sec_region)
+            await textbox.draw_textbox(self.display, sec_text, self.sec_x, section_height, self.sec_width, section_height, color=0xFFFFFF, font='regular', scale=font_scale, align='left', cache=False)
 
         # 4. Milliseconds (Tenths) Display
         tenth = (now[8] // 100) % 10 # Ensure 0-9 range
@@ -209,8 +189,12 @@ class TimeDisplay:
 
             self.display.rect(self.ms_x, section_height, self.ms_width, section_height, 0x000000, True)
             if self._tenth_cells:
-                self.display.blit(self._tenth_cells[tenth].fb, self._tenth_x, self._tenth_y)
+                cell = self._tenth_cells[tenth]
+                self.display.blit(cell.fb, self._tenth_x, self._tenth_y, -1, None, cell.width, cell.height)
             else:
                 # Box too small to prerender -- fall back to the textbox path
                 await textbox.draw_textbox(self.display, self._tenth_numbers[tenth], self.ms_x, section_height, self.ms_width, section_height, color=0xFFFFFF, font='small', scale=font_scale, align='left')
-            self.display.update(self._ms_region)
+
+        # Push everything redrawn this tick in our section; the seconds and
+        # tenths boxes sit side by side and go out as one window
+        self.display.flush((0, 0, self.display_width - self.height, self.height))
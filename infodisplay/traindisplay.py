@@ -3,7 +3,7 @@ import asyncio
 import gc
 import textbox
 import random
-from httpstream import HttpRequest
+from httpstream import HttpRequest, NotModified
 from flatjson import load_array
 
 def get_color_for_train_status(status, delay_minutes):
@@ -60,7 +60,7 @@ class TrainDisplay:
         self.departures_last_updated = utime.ticks_ms()
 
         # Pre-allocate HTTP request helper
-        self._http_request = HttpRequest(url)
+        self._http_request = HttpRequest(url, conditional=True, compressed=True)
 
     CREATION_PRIORITY = 1
     def create(provider):
@@ -139,6 +139,9 @@ class TrainDisplay:
             num_departures = len(self.departures) // FIELDS_PER_DEPARTURE
             print(f"Train data fetched: {num_departures} departures")
 
+        except NotModified:
+            # The departures held are still current
+            self.departures_last_updated = utime.ticks_ms()
         except Exception as e:
             print(f"Error fetching train data: {e}")
 
@@ -5,7 +5,7 @@ import colors
 import textbox
 import random
 
-from httpstream import HttpRequest
+from httpstream import HttpRequest, NotModified
 from flatjson import load_array
 
 _MAX_UV = 12
@@ -27,7 +27,7 @@ class UvDisplay:
         self.display_width, self.display_height = self.display.get_bounds()
 
         # Pre-allocate HTTP request helper
-        self._http_request = HttpRequest(url)
+        self._http_request = HttpRequest(url, conditional=True)
 
         self.tsf = asyncio.ThreadSafeFlag()
     
@@ -88,7 +88,9 @@ class UvDisplay:
             self._normalized_data = [uv / _MAX_UV for uv in self.uv_data]
 
             self.tsf.set()
-                
+
+        except NotModified:
+            pass
         except Exception as e:
             print(f"Error fetching UV data: {e}")
         
@@ -1,13 +1,13 @@
 import asyncio
 import gc
 import colors
-import struct
 import textbox
 import random
-import array
-from bitblt import blit_region
+import raster
+import iconcache
+from spritesheet import SpriteSheet
 
-from httpstream import HttpRequest
+from httpstream import HttpRequest, NotModified
 from flatjson import load_array
 
 _DAY_NAMES = ('MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN')
@@ -26,11 +26,15 @@ class WeatherDisplay:
         # Get bytes_per_pixel dynamically
         self.bytes_per_pixel = self.display.bytes_per_pixel
         
-        # Pre-allocate line buffer for blitting using a max size if needed (e.g. max icon width is 100)
-        self._line_buffer = bytearray(100 * 2)
-
         # Pre-allocate HTTP request helper to reduce memory allocations
-        self._http_request = HttpRequest(url)
+        self._http_request = HttpRequest(url, conditional=True)
+
+        # Icons packed into one bundle (imageconvert bundle) if present,
+        # otherwise one file per icon
+        try:
+            self._icons = SpriteSheet('icons/weather.bundle')
+        except OSError:
+            self._icons = None
 
         self.tsf = asyncio.ThreadSafeFlag()
     
@@ -73,35 +77,22 @@ class WeatherDisplay:
 
             self.tsf.set()
 
+        except NotModified:
+            # Forecast unchanged: nothing to parse or redraw
+            pass
         except Exception as e:
             print(f"Error fetching weather data: {e}")
     
     def draw_icon(self, icon_name, framebuffer, x, y, box_width, box_height):
         try:
-            with open(f'icons/weather_{icon_name}.bin', 'rb') as icon_file:
-                icon_width, icon_height = struct.unpack('<HH', icon_file.read(4))
-                # Center the icon in the given box
-                icon_x = x + (box_width - icon_width) // 2
-                icon_y = y + (box_height - icon_height) // 2
-
-                # Calculate file size to determine bpp
-                icon_file.seek(0, 2) # seek to end
-                file_size = icon_file.tell()
-                icon_file.seek(4) # seek back exactly following the 4-byte header
-
-                icon_bpp = (file_size - 4) // (icon_width * icon_height)
-                if icon_bpp <= 0: icon_bpp = 1
-                
-                icon_row_bytes = icon_width * icon_bpp
-                
-                # Make sure the line buffer is large enough
-                if len(self._line_buffer) < icon_width * icon_bpp:
-                     self._line_buffer = bytearray(icon_width * icon_bpp)
-
-                blit_region(framebuffer, self.display_width, self.display_height, icon_bpp,
-                            icon_file, 4, icon_row_bytes,
-                            0, 0, icon_width, icon_height,
-                            icon_x, icon_y, buffer=self._line_buffer)
+            name = f'weather_{icon_name}'
+            if self._icons is not None and name in self._icons:
+                ix, iy, w, h = iconcache.draw_sprite(framebuffer, self.display_width, self.display_height,
+                                                     self._icons, name, x, y, box_width, box_height)
+            else:
+                ix, iy, w, h = iconcache.draw_icon(framebuffer, self.display_width, self.display_height,
+                                                   f'icons/{name}.bin', x, y, box_width, box_height)
+            framebuffer.invalidate(ix, iy, w, h)
         except OSError as e:
             print(f"Warning: Could not load icon '{icon_name}': {e}")
             return
@@ -155,14 +146,12 @@ class WeatherDisplay:
                 cx = sx + column_width // 2
                 cy = day_row_y + slot_height // 2
                 
-                # Triangle points (downward arrow)
-                # (x1, y1), (x2, y2), (x3, y3) relative to (cx, cy)
-                pts = array.array('h', [
-                    -tri_w // 2, -tri_h // 2,   # Top-left
-                    tri_w // 2, -tri_h // 2,    # Top-right
-                    0, tri_h // 2               # Bottom-center
-                ])
-                self.display.poly(cx, cy, pts, 0xFFFF00, True)
+                # Triangle points (downward arrow), anti-aliased
+                raster.polygon(self.display, (
+                    cx - tri_w // 2, cy - tri_h // 2,   # Top-left
+                    cx + tri_w // 2, cy - tri_h // 2,   # Top-right
+                    cx, cy + tri_h // 2                 # Bottom-center
+                ), 0xFFFF00)
             else:
                 # Get current day of week (0 = Monday, 6 = Sunday)
                 day_of_week = (now[6] + i) % 7
@@ -188,9 +177,9 @@ class WeatherDisplay:
             rain_color = colors.get_color_for_rain_percentage(rain)
             await textbox.draw_textbox(self.display, f"{rain}%", sx, rain_row_y, column_width, slot_height, color=rain_color, font=font_name)
 
-
-            # Update just this column
-            self.display.update((sx, y_start, column_width, self.display_height - y_start))
-
             # Allow other work to continue
-            await asyncio.sleep(0)
\ No newline at end of file
+            await asyncio.sleep(0)
+
+        # Adjacent columns coalesce into a single damaged rectangle; push
+        # it without holding up the event loop
+        await self.display.flush_async((0, y_start, self.display_width, self.display_height - y_start))
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Hostname lookups cached for their TTL, shared by httpstream, ws and
+remotetime so a request doesn't wait on a DNS round trip (a blocking
+call on MicroPython) each time it connects.
+
+Entries older than refresh_ms are looked up again in a separate task
+while the cached addresses keep being served, so a host in regular use
+is never looked up on a request's path. That task still calls the
+blocking socket.getaddrinfo on the event loop, so on MicroPython the
+refresh stalls other tasks (e.g. display updates) just as an uncached
+lookup would; it only moves the stall off the request path.
+Failed lookups are remembered for negative_ttl_ms, so a missing host
+doesn't cost a blocking lookup on every attempt either.
+"""
+import asyncio
+import socket
+import utime
+
+class Resolver:
+    def __init__(self, ttl_ms=600_000, refresh_ms=300_000, negative_ttl_ms=30_000, max_entries=16):
+        self.ttl_ms = ttl_ms
+        self.refresh_ms = refresh_ms
+        self.negative_ttl_ms = negative_ttl_ms
+        self.max_entries = max_entries
+        # (host, port) -> [getaddrinfo result or OSError, ticks resolved, refreshing]
+        self._entries = {}
+
+    def _lookup(self, key):
+        try:
+            result = socket.getaddrinfo(key[0], key[1])
+            if not result:
+                raise OSError('No addresses for %s' % key[0])
+        except OSError as e:
+            result = e
+        if key not in self._entries and len(self._entries) >= self.max_entries:
+            # Drop the oldest entry
+            oldest = None
+            for k, entry in self._entries.items():
+                if oldest is None or utime.ticks_diff(entry[1], self._entries[oldest][1]) < 0:
+                    oldest = k
+            del self._entries[oldest]
+        entry = [result, utime.ticks_ms(), False]
+        self._entries[key] = entry
+        return entry
+
+    async def _refresh(self, key, entry):
+        # Yield first so the request that found the entry goes ahead. The
+        # lookup below still blocks the event loop while it runs.
+        await asyncio.sleep(0)
+        try:
+            result = socket.getaddrinfo(key[0], key[1])
+            if result and self._entries.get(key) is entry:
+                entry[0] = result
+                entry[1] = utime.ticks_ms()
+        except OSError:
+            # Keep the stale addresses; the next lookup after ttl_ms retries
+            pass
+        entry[2] = False
+
+    def getaddrinfo(self, host, port):
+        """
+        Cached socket.getaddrinfo(host, port).
+
+        Raises:
+            OSError: If the host doesn't resolve (also while cached)
+        """
+        key = (host, port)
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = utime.ticks_diff(utime.ticks_ms(), entry[1])
+            if isinstance(entry[0], OSError):
+                if age >= self.negative_ttl_ms:
+                    entry = None
+            elif age >= self.ttl_ms:
+                entry = None
+            elif age >= self.refresh_ms and not entry[2]:
+                entry[2] = True
+                try:
+                    asyncio.create_task(self._refresh(key, entry))
+                except RuntimeError:
+                    # No running event loop to refresh on
+                    entry[2] = False
+        if entry is None:
+            entry = self._lookup(key)
+        if isinstance(entry[0], OSError):
+            raise entry[0]
+        return entry[0]
+
+    def forget(self, host, port):
+        """Drop a host, e.g. when connecting to its cached address failed."""
+        self._entries.pop((host, port), None)
+
+    async def open_connection(self, host, port, ssl=False):
+        """
+        asyncio.open_connection to the host's cached address. With TLS the
+        hostname is still used for SNI (and any certificate check).
+        """
+        address = self.getaddrinfo(host, port)[0][-1][0]
+        try:
+            if ssl:
+                return await asyncio.open_connection(address, port, ssl=ssl, server_hostname=host)
+            return await asyncio.open_connection(address, port)
+        except OSError:
+            self.forget(host, port)
+            raise
+
+
+# Shared by every network client
+default_resolver = Resolver()
+
+def getaddrinfo(host, port):
+    return default_resolver.getaddrinfo(host, port)
+
+async def open_connection(host, port, ssl=False):
+    return await default_resolver.open_connection(host, port, ssl)
@@ -4,7 +4,7 @@ except ModuleNotFoundError:
     import json as ujson
 
 import asyncio
-from httpstream import parse_url, ScopedConnection
+from httpstream import parse_url, request
 
 class Hass:
 
@@ -14,15 +14,26 @@ class Hass:
         self.keep_alive = keep_alive
 
         # Pre-allocate commonly used header strings to reduce memory allocations
-        self._hostname_bytes = self.uri.hostname.encode('utf-8')
         self._path_bytes = self.uri.path.encode('utf-8')
         self._token_bytes = self.token.encode('utf-8')
-        self._host_header = b'Host: %s\r\n' % self._hostname_bytes
         self._auth_header = b'Authorization: Bearer %s\r\n' % self._token_bytes
         self._json_content_type = b'Content-Type: application/json; charset=utf-8\r\n'
-
-    async def _connect(self):
-        return await asyncio.open_connection(self.uri.hostname, self.uri.port, ssl=self.uri.port == 443)
+        self._get_headers = (self._auth_header,)
+        self._post_headers = (self._auth_header, self._json_content_type)
+
+    async def _request(self, method, path, payload=None):
+        # Requests share the pooled keep-alive connection to Home Assistant
+        headers, body = self._get_headers, None
+        if payload is not None:
+            headers, body = self._post_headers, ujson.dumps(payload).encode('utf-8')
+        response = await request(self.uri, method, b'%sapi%s' % (self._path_bytes, path), headers, body)
+        try:
+            if response.status not in (200, 201):
+                raise Exception(f"HTTP {response.status}")
+            return await response.reader.read()
+        finally:
+            response.close()
+            await response.wait_closed()
         
     def create(provider):
         config = provider['config']['hass']
@@ -38,14 +49,7 @@ class Hass:
         await asyncio.Event().wait()
             
     async def ensure_api_reachable(self):
-        async with ScopedConnection(self._connect) as (reader, writer):
-            self.write_protocol(writer, b'GET', b'/')
-            self.write_auth_header(writer)
-            writer.write(b'\r\n')
-            await writer.drain()
-            await self.ensure_success_status_code(reader)
-            content_length = await self.get_content_length(reader)
-            print(await reader.readexactly(content_length))
+        print(await self._request(b'GET', b'/'))
 
     async def send_update(self, state, unit, device_class, friendly_name, sensor):
         data = { "state": state, "attributes": {} }
@@ -63,16 +67,7 @@ class Hass:
         return await self.post_state(sensor, data)
     
     async def post_state(self, sensor_type, payload):
-        async with ScopedConnection(self._connect) as (reader, writer):
-            self.write_protocol(writer, b'POST', b'/states/%s' % sensor_type.encode('utf-8'))
-            self.write_auth_header(writer)
-            self.write_json_content_type_header(writer)
-            self.write_content(writer, ujson.dumps(payload).encode('utf-8'))
-            await writer.drain()
-            await self.ensure_success_status_code(reader)
-
-            content_length = await self.get_content_length(reader)
-            content = await reader.readexactly(content_length)
+        content = await self._request(b'POST', b'/states/%s' % sensor_type.encode('utf-8'), payload)
 
         print(content)
 
@@ -83,16 +78,7 @@ class Hass:
         return content
     
     async def post_event(self, event_type, payload):
-        async with ScopedConnection(self._connect) as (reader, writer):
-            self.write_protocol(writer, b'POST', b'/events/%s' % event_type.encode('utf-8'))
-            self.write_auth_header(writer)
-            self.write_json_content_type_header(writer)
-            self.write_content(writer, ujson.dumps(payload).encode('utf-8'))
-            await writer.drain()
-            await self.ensure_success_status_code(reader)
-
-            content_length = await self.get_content_length(reader)
-            content = await reader.readexactly(content_length)
+        content = await self._request(b'POST', b'/events/%s' % event_type.encode('utf-8'), payload)
 
         print(content)
 
@@ -102,52 +88,10 @@ class Hass:
 
         return content
     
-    def write_protocol(self, writer, method, path):
-        writer.write(b'%s %sapi%s HTTP/1.0\r\n' % (method, self._path_bytes, path))
-        writer.write(self._host_header)
-
-    def write_auth_header(self, writer):
-        writer.write(self._auth_header)
-
-    def write_json_content_type_header(self, writer):
-        writer.write(self._json_content_type)
-
-    def write_content(self, writer, content):
-        writer.write(b'Content-Length: %i\r\n' % len(content))
-        writer.write(b'\r\n')
-        writer.write(content)
-    
-    async def ensure_success_status_code(self, reader):
-        line = await reader.readline()
-        status = line.split(b' ', 2)
-        status_code = int(status[1])
-        if not status_code in [200, 201]:
-            raise Exception(line)
-        
-    async def get_content_length(self, reader):
-        content_length = None
-        while True:
-            line = await reader.readline()
-            parts = line.lower().split(b'content-length: ', 2)
-            if len(parts) > 1:
-                content_length = int(parts[1])
-            elif line == b'\r\n':
-                break
-        return content_length
-    
     async def render_template(self, template):
         data = { "template": template }
 
-        async with ScopedConnection(self._connect) as (reader, writer):
-            self.write_protocol(writer, b'POST', b'/template')
-            self.write_auth_header(writer)
-            self.write_json_content_type_header(writer)
-            self.write_content(writer, ujson.dumps(data).encode('utf-8'))
-            await writer.drain()
-            await self.ensure_success_status_code(reader)
-
-            content_length = await self.get_content_length(reader)
-            content = await reader.readexactly(content_length)
+        content = await self._request(b'POST', b'/template', data)
 
         # Clean up after HTTP request
         import gc
@@ -1,8 +1,33 @@
 from collections import namedtuple
 import asyncio
+import io
+import random
+import utime
+import dnscache
+
+try:
+    # CPython: incremental decompression
+    from zlib import decompressobj
+except ImportError:
+    decompressobj = None
+
+try:
+    # MicroPython 1.21+
+    import deflate
+except ImportError:
+    deflate = None
 
 URI = namedtuple('URI', ('hostname', 'port', 'path', 'secure', 'protocol'))
 
+# Milliseconds allowed to open a connection, to receive the status line
+# and headers, and for any one read of the body to make progress
+Timeouts = namedtuple('Timeouts', ('connect_ms', 'header_ms', 'body_ms'))
+DEFAULT_TIMEOUTS = Timeouts(10_000, 15_000, 15_000)
+
+# Largest compressed body InflateReader will hold in RAM on MicroPython;
+# HttpRequest asks for an identity body from then on instead
+MAX_BUFFERED_INFLATE = 8 * 1024
+
 def parse_url(url):
     """
     Parse a URL into its components using string operations instead of regex.
@@ -74,28 +99,609 @@ def parse_url(url):
     
     return URI(host, port, path, secure, protocol)
 
+class TimedOut(OSError):
+    """
+    A connect, header or body read timeout. An OSError, so callers that
+    already handle network errors handle it too (MicroPython's
+    asyncio.TimeoutError is not one).
+    """
+
+
+async def _wait_for(awaitable, timeout_ms, message):
+    if not timeout_ms:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, timeout_ms / 1000)
+    except asyncio.TimeoutError:
+        raise TimedOut(message)
+
+
+class BodyReader:
+    """
+    Reader over one response body, delimited by Content-Length or chunked
+    transfer encoding (or the connection closing, when neither is given),
+    so a kept-alive connection is never read past its response. Reads
+    return b'' at the end of the body, like a stream at EOF.
+    """
+
+    def __init__(self, reader, length=None, chunked=False):
+        self._reader = reader
+        self._chunked = chunked
+        # Bytes left in the body, or in the current chunk when chunked;
+        # None reads until the connection closes
+        self._remaining = 0 if chunked else length
+        self._pending = b''
+        self.done = length == 0 and not chunked
+        # Ticks when the pending stream read started (None when idle) and
+        # the task waiting on it, for the Response watchdog; timed_out is
+        # set when it gave up on the read
+        self.waiting_since = None
+        self.waiting_task = None
+        self.timed_out = False
+
+    async def _wait(self, awaitable):
+        if self.timed_out:
+            raise TimedOut('Body read timed out')
+        self.waiting_since = utime.ticks_ms()
+        self.waiting_task = asyncio.current_task()
+        try:
+            return await awaitable
+        except asyncio.CancelledError:
+            if not self.timed_out:
+                raise
+            task = self.waiting_task
+            if hasattr(task, 'uncancel'):
+                # CPython: this cancellation has been handled
+                task.uncancel()
+        finally:
+            self.waiting_since = None
+            self.waiting_task = None
+        raise TimedOut('Body read timed out')
+
+    def cancel_wait(self):
+        """Make a stalled read raise TimedOut. Closing the stream doesn't
+        wake a pending read on MicroPython, so the reading task is
+        cancelled."""
+        self.timed_out = True
+        if self.waiting_task is not None:
+            self.waiting_task.cancel()
+
+    async def _next_chunk(self):
+        line = await self._wait(self._reader.readline())
+        if not line:
+            raise OSError('Connection closed mid-body')
+        size = int(line.split(b';', 1)[0].strip(), 16)
+        if size == 0:
+            # Skip any trailers up to the blank line ending the body
+            while True:
+                line = await self._wait(self._reader.readline())
+                if not line or line == b'\r\n' or line == b'\n':
+                    break
+            self.done = True
+        self._remaining = size
+
+    async def _read_raw(self, n):
+        if self._remaining is None:
+            data = await self._wait(self._reader.read(n))
+            if not data:
+                self.done = True
+            return data
+        if self._chunked and self._remaining == 0:
+            await self._next_chunk()
+            if self.done:
+                return b''
+        if n < 0 or n > self._remaining:
+            n = self._remaining
+        data = await self._wait(self._reader.read(n))
+        if not data:
+            raise OSError('Connection closed mid-body')
+        self._remaining -= len(data)
+        if self._remaining == 0:
+            if self._chunked:
+                # CRLF after each chunk's data
+                await self._wait(self._reader.readexactly(2))
+            else:
+                self.done = True
+        return data
+
+    async def read(self, n=-1):
+        """Read up to n bytes of the body (all of it for n < 0)."""
+        if self._pending:
+            data = self._pending
+            if 0 <= n < len(data):
+                self._pending = data[n:]
+                return data[:n]
+            self._pending = b''
+            return data
+        if self.done:
+            return b''
+        if n >= 0:
+            return await self._read_raw(n)
+        parts = []
+        while not self.done:
+            data = await self._read_raw(512)
+            if not data:
+                break
+            parts.append(data)
+        return b''.join(parts)
+
+    async def readinto(self, buf):
+        """Read into buf, returning the byte count (0 at the end)."""
+        if self._pending or self.done or self._remaining is None or self._chunked \
+                or not hasattr(self._reader, 'readinto'):
+            data = await self.read(len(buf))
+            buf[:len(data)] = data
+            return len(data)
+        # Straight from the stream into buf (MicroPython)
+        n = len(buf) if len(buf) < self._remaining else self._remaining
+        got = await self._wait(self._reader.readinto(memoryview(buf)[:n]))
+        if not got:
+            raise OSError('Connection closed mid-body')
+        self._remaining -= got
+        if self._remaining == 0:
+            self.done = True
+        return got
+
+    async def readexactly(self, n):
+        parts = []
+        while n > 0:
+            data = await self.read(n)
+            if not data:
+                raise EOFError('Body ended early')
+            parts.append(data)
+            n -= len(data)
+        return b''.join(parts)
+
+    async def readline(self):
+        """Read up to and including the next newline (or the body's end)."""
+        line = b''
+        while True:
+            data = await self.read(64)
+            if not data:
+                return line
+            nl = data.find(b'\n')
+            if nl >= 0:
+                self._pending = data[nl + 1:] + self._pending
+                return line + data[:nl + 1]
+            line += data
+
+
+class InflateReader:
+    """
+    Decodes a deflate (zlib) or gzip encoded body as it is read, e.g. for
+    flatjson.load_array. Only read(n) is provided.
+
+    On CPython the body is inflated incrementally. MicroPython's
+    deflate.DeflateIO reads a blocking stream, so there the compressed
+    body is read in full first and inflated from memory as it is
+    consumed; HttpRequest only hands it bodies with a Content-Length of
+    at most MAX_BUFFERED_INFLATE.
+    """
+
+    def __init__(self, reader):
+        self._reader = reader
+        self._stream = None
+        # 32 + 15: accept a zlib or gzip header with up to a 32K window
+        self._decoder = decompressobj(47) if decompressobj else None
+
+    async def read(self, n=-1):
+        if self._decoder is None:
+            if self._stream is None:
+                self._stream = deflate.DeflateIO(io.BytesIO(await self._reader.read()), deflate.AUTO)
+            return self._stream.read() if n < 0 else self._stream.read(n)
+        if n < 0:
+            parts = []
+            while True:
+                data = await self.read(512)
+                if not data:
+                    return b''.join(parts)
+                parts.append(data)
+        decoder = self._decoder
+        while n > 0 and not decoder.eof:
+            data = decoder.unconsumed_tail
+            if not data:
+                data = await self._reader.read(512)
+                if not data:
+                    raise OSError('Compressed body ended early')
+            data = decoder.decompress(data, n)
+            if data:
+                return data
+        return b''
+
+
+class NoResponse(OSError):
+    """
+    The connection failed before any byte of a response arrived (while
+    sending the request, or closed with no reply), e.g. a kept-alive
+    connection the server had already dropped.
+    """
+
+
+async def read_response_head(reader):
+    """
+    Read a status line and headers.
+
+    Returns:
+        tuple: (status_code, headers) with header names lower-cased
+
+    Raises:
+        NoResponse: If the connection closed before a status line arrived
+        OSError: If it closed part way through the status line or headers
+    """
+    line = await reader.readline()
+    if not line:
+        raise NoResponse('Connection closed')
+    if not line.endswith(b'\n'):
+        raise OSError('Connection closed mid-response')
+    status_code = int(line.split(b' ', 2)[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if not line.endswith(b'\n'):
+            raise OSError('Connection closed mid-response')
+        if line == b'\r\n' or line == b'\n':
+            break
+        colon = line.find(b':')
+        if colon > 0:
+            headers[line[:colon].strip().lower().decode()] = line[colon + 1:].strip().decode()
+    return status_code, headers
+
+
+async def _close(writer):
+    # MicroPython's Stream.close() does nothing: the socket (and any TLS
+    # context) is only freed by wait_closed()
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+
+
+class CircuitOpen(OSError):
+    """
+    Raised instead of connecting while a host's circuit breaker is open.
+    """
+
+
+class ConnectionPool:
+    """
+    Idle keep-alive connections per (hostname, port, secure), so repeated
+    requests to a host skip the TCP and TLS handshakes. At most
+    max_per_host connections per host are open at once (further
+    requests wait for one to be released). Idle connections are closed
+    once idle_timeout_ms passes, whether or not the host is requested
+    again, and beyond max_idle across all hosts the oldest is closed.
+
+    The pool also keeps a circuit breaker per host: after
+    breaker_threshold consecutive failures to connect or get a response,
+    requests fail fast with CircuitOpen for breaker_reset_ms, so every
+    component polling a host that has gone away (or the Wi-Fi) doesn't
+    retry it at once. The next attempt after that either closes the
+    breaker again or re-opens it.
+    """
+
+    def __init__(self, max_per_host=2, idle_timeout_ms=20_000, max_idle=4, breaker_threshold=3, breaker_reset_ms=30_000):
+        self.max_per_host = max_per_host
+        self.idle_timeout_ms = idle_timeout_ms
+        self.max_idle = max_idle
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset_ms = breaker_reset_ms
+        self._idle = {}
+        self._active = {}
+        # key -> (consecutive failures, ticks of the last failure)
+        self._failures = {}
+        self._released = asyncio.Event()
+        self._reaper = None
+
+    def failed(self, key):
+        """Count a failure to connect to, or get a response from, a host."""
+        failures = self._failures.get(key)
+        self._failures[key] = ((failures[0] if failures else 0) + 1, utime.ticks_ms())
+
+    def succeeded(self, key):
+        """Close the host's breaker after a response."""
+        if key in self._failures:
+            del self._failures[key]
+
+    def _check_breaker(self, key):
+        failures = self._failures.get(key)
+        if failures and failures[0] >= self.breaker_threshold and \
+                utime.ticks_diff(utime.ticks_ms(), failures[1]) < self.breaker_reset_ms:
+            raise CircuitOpen(f'{key[0]}:{key[1]} unreachable, retrying later')
+
+    async def acquire(self, hostname, port, secure, connect_timeout_ms=None):
+        """
+        Return (reader, writer, reused) for the host, reusing an idle
+        connection where one is fresh enough. Pair with release() or
+        discard().
+
+        Raises:
+            CircuitOpen: If the host's circuit breaker is open
+        """
+        key = (hostname, port, secure)
+        self._check_breaker(key)
+        while self._active.get(key, 0) >= self.max_per_host:
+            self._released.clear()
+            await self._released.wait()
+        self._active[key] = self._active.get(key, 0) + 1
+        try:
+            idle = self._idle.get(key)
+            now = utime.ticks_ms()
+            while idle:
+                reader, writer, released = idle.pop()
+                if utime.ticks_diff(now, released) < self.idle_timeout_ms:
+                    return reader, writer, True
+                await _close(writer)
+            try:
+                reader, writer = await _wait_for(dnscache.open_connection(hostname, port, secure),
+                                                 connect_timeout_ms, 'Connect timed out')
+            except Exception:
+                self.failed(key)
+                raise
+            return reader, writer, False
+        except BaseException:
+            self._done(key)
+            raise
+
+    def release(self, key, reader, writer):
+        """Return a connection whose last response was fully read."""
+        self._idle.setdefault(key, []).append((reader, writer, utime.ticks_ms()))
+        self._done(key)
+        if sum(len(connections) for connections in self._idle.values()) > self.max_idle:
+            asyncio.create_task(_close(self._pop_oldest()))
+        if self._reaper is None:
+            self._reaper = asyncio.create_task(self._reap())
+
+    def _pop_oldest(self):
+        # Each host's list is in release order, oldest first
+        now = utime.ticks_ms()
+        oldest = None
+        for connections in self._idle.values():
+            if connections and (oldest is None or
+                    utime.ticks_diff(now, connections[0][2]) > utime.ticks_diff(now, oldest[0][2])):
+                oldest = connections
+        return oldest.pop(0)[1]
+
+    async def _reap(self):
+        # Closes idle connections as they expire: the displays poll every
+        # few minutes, so waiting for a host's next request to notice
+        # would hold its socket and TLS context in between
+        try:
+            while self._idle:
+                now = utime.ticks_ms()
+                wait_ms = self.idle_timeout_ms
+                expired = []
+                for key in list(self._idle):
+                    connections = self._idle[key]
+                    for connection in connections[:]:
+                        age = utime.ticks_diff(now, connection[2])
+                        if age >= self.idle_timeout_ms:
+                            connections.remove(connection)
+                            expired.append(connection[1])
+                        elif self.idle_timeout_ms - age < wait_ms:
+                            wait_ms = self.idle_timeout_ms - age
+                    if not connections:
+                        del self._idle[key]
+                for writer in expired:
+                    await _close(writer)
+                if self._idle:
+                    await asyncio.sleep(wait_ms / 1000)
+        finally:
+            if self._reaper is asyncio.current_task():
+                self._reaper = None
+
+    async def discard(self, key, writer):
+        """Close a connection that can't be reused."""
+        self._done(key)
+        await _close(writer)
+
+    def _done(self, key):
+        self._active[key] -= 1
+        self._released.set()
+
+    async def close_idle(self):
+        """Close every idle connection (e.g. after Wi-Fi drops)."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for reader, writer, released in connections:
+                await _close(writer)
+
+
+# Shared by every HttpRequest, Hass and ManifestDownloader
+default_pool = ConnectionPool()
+
+
+class Response:
+    """
+    A response on a pooled connection. Read the body from .reader, then
+    close() (and await wait_closed(), like a StreamWriter): the
+    connection goes back to the pool if the body was read to the end
+    and the server allows keep-alive, and is closed otherwise.
+    """
+
+    def __init__(self, pool, key, reader, writer, status, headers, body_timeout_ms=None):
+        self._pool = pool
+        self._key = key
+        self._writer = writer
+        self._stream = reader
+        self._closed = False
+        self.status = status
+        self.headers = headers
+        # Called with the headers by finish(), once the caller has
+        # consumed the body without error
+        self.on_finish = None
+        self.keep_alive = headers.get('connection', '').lower() != 'close'
+        # 204 and 304 never carry a body, whatever the headers say
+        length = '0' if status == 204 or status == 304 else headers.get('content-length')
+        chunked = 'chunked' in headers.get('transfer-encoding', '').lower()
+        if length is None and not chunked:
+            # Delimited by the connection closing: never reusable
+            self.keep_alive = False
+        self.reader = BodyReader(reader, None if length is None else int(length), chunked)
+        self._watchdog = None
+        if body_timeout_ms and not self.reader.done:
+            self._watchdog = asyncio.create_task(self._watch(body_timeout_ms))
+
+    async def _watch(self, timeout_ms):
+        # Fails a body read that stalls for timeout_ms; the connection is
+        # then dropped rather than pooled when the response closes. Only
+        # time spent waiting on the socket counts, so a caller pacing its
+        # reads (e.g. VideoDisplay between frames) is not cut off.
+        reader = self.reader
+        while not self._closed:
+            await asyncio.sleep(timeout_ms / 4000)
+            started = reader.waiting_since
+            if started is not None and utime.ticks_diff(utime.ticks_ms(), started) >= timeout_ms:
+                self.keep_alive = False
+                reader.cancel_wait()
+                return
+
+    async def finish(self, limit=512):
+        """Mark the body as successfully consumed: read and drop a short
+        unread tail (e.g. a trailing newline after a JSON array) so the
+        connection can still be reused, then call on_finish."""
+        reader = self.reader
+        while not self._closed and self.keep_alive and not reader.done and limit > 0:
+            data = await reader.read(limit)
+            if not data:
+                break
+            limit -= len(data)
+        if self.on_finish:
+            self.on_finish(self.headers)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._watchdog:
+            self._watchdog.cancel()
+        if self.keep_alive and self.reader.done and not self.reader._pending:
+            self._pool.release(self._key, self._stream, self._writer)
+            self._writer = None
+        else:
+            # The socket itself is freed by wait_closed()
+            self._writer.close()
+            self._pool._done(self._key)
+
+    async def wait_closed(self):
+        if self._writer is not None:
+            writer, self._writer = self._writer, None
+            await _close(writer)
+
+
+async def _exchange(uri, reader, writer, method, path, headers, body):
+    try:
+        writer.write(b'%s %s HTTP/1.1\r\nHost: %s\r\n' % (method, path, uri.hostname.encode('utf-8')))
+        for header in headers:
+            writer.write(header)
+        if body is not None:
+            writer.write(b'Content-Length: %i\r\n\r\n' % len(body))
+            writer.write(body)
+        else:
+            writer.write(b'\r\n')
+        await writer.drain()
+    except OSError as e:
+        raise NoResponse(e)
+    return await read_response_head(reader)
+
+
+async def request(uri, method, path, headers=(), body=None, pool=None, timeouts=DEFAULT_TIMEOUTS):
+    """
+    Send an HTTP/1.1 request over a pooled keep-alive connection.
+
+    Args:
+        uri (URI): Target from parse_url (host, port and TLS)
+        method (bytes): e.g. b'GET'
+        path (bytes): Request path
+        headers (iterable): Pre-encoded header lines (b'Name: value\\r\\n')
+        body (bytes, optional): Request body; sets Content-Length
+        pool (ConnectionPool, optional): Defaults to default_pool
+        timeouts (Timeouts, optional): None waits indefinitely
+
+    Returns:
+        Response: Status, headers and body reader; the caller closes it
+
+    Raises:
+        CircuitOpen: If the host has been failing; nothing is sent
+        TimedOut: If connecting or the response headers timed out
+        OSError: If the request failed
+    """
+    pool = pool or default_pool
+    timeouts = timeouts or Timeouts(None, None, None)
+    key = (uri.hostname, uri.port, uri.secure)
+    while True:
+        reader, writer, reused = await pool.acquire(uri.hostname, uri.port, uri.secure, timeouts.connect_ms)
+        try:
+            status, response_headers = await _wait_for(_exchange(uri, reader, writer, method, path, headers, body),
+                                                       timeouts.header_ms, 'Response timed out')
+        except BaseException as e:
+            # Including cancellation (e.g. a caller's wait_for), which would
+            # otherwise leave the slot taken and the socket open for good
+            await pool.discard(key, writer)
+            if not isinstance(e, Exception):
+                raise
+            # The server may have closed the idle connection: retry on a
+            # new one, unless a non-idempotent request (e.g. a Hass POST)
+            # might have been acted on already
+            if reused and (method == b'GET' or method == b'HEAD' or isinstance(e, NoResponse)):
+                continue
+            pool.failed(key)
+            raise
+        pool.succeeded(key)
+        return Response(pool, key, reader, writer, status, response_headers, timeouts.body_ms)
+
+
+class NotModified(Exception):
+    """
+    Raised by a conditional HttpRequest when the server answers 304: the
+    body last fetched from the URL is still current.
+    """
+
+
 class HttpRequest:
     """
     Memory-efficient HTTP request helper that pre-allocates headers.
     Reduces memory fragmentation by caching encoded strings.
     """
 
-    def __init__(self, url, headers=None):
+    def __init__(self, url, headers=None, pool=None, conditional=False, compressed=False,
+                 timeouts=DEFAULT_TIMEOUTS, retries=2, backoff_ms=1000):
         """
         Initialize HTTP request helper.
 
         Args:
             url (str): The URL to request
             headers (dict, optional): Additional headers as key-value pairs
+            pool (ConnectionPool, optional): Defaults to default_pool
+            conditional (bool): Remember the ETag/Last-Modified of each
+                finished response and send them back as
+                If-None-Match/If-Modified-Since; get() then raises
+                NotModified when the server answers 304
+            compressed (bool): Ask for a deflate/gzip encoded body (where
+                this build can inflate one), and have get() return an
+                InflateReader over it. On MicroPython a compressed body
+                without a Content-Length of at most MAX_BUFFERED_INFLATE
+                is refetched uncompressed, and compression not asked for
+                again
+            timeouts (Timeouts, optional): Connect, header and body read
+                timeouts, see request()
+            retries (int): Further attempts after a connection failure,
+                timeout or 5xx status
+            backoff_ms (int): Delay before the first retry, doubling (with
+                jitter) for each one after
         """
         self.uri = parse_url(url)
+        self.pool = pool
+        self.conditional = conditional
+        self.timeouts = timeouts
+        self.retries = retries
+        self.backoff_ms = backoff_ms
 
         # Pre-allocate commonly used header strings to reduce allocations
         self._path_bytes = self.uri.path.encode('utf-8')
-        self._hostname_bytes = self.uri.hostname.encode('utf-8')
-        self._get_line = b'GET %s HTTP/1.0\r\n' % self._path_bytes
-        self._host_header = b'Host: %s\r\n' % self._hostname_bytes
-        self._crlf = b'\r\n'
 
         # Pre-encode additional headers if provided
         self._extra_headers = []
@@ -103,55 +709,87 @@ class HttpRequest:
             for key, value in headers.items():
                 header_line = b'%s: %s\r\n' % (key.encode('utf-8'), value.encode('utf-8'))
                 self._extra_headers.append(header_line)
+        self._compressed = bool(compressed and (decompressobj or deflate))
+        if self._compressed:
+            # MicroPython: one encoding is enough, the body is buffered anyway
+            self._extra_headers.append(b'Accept-Encoding: deflate, gzip\r\n' if decompressobj
+                                       else b'Accept-Encoding: deflate\r\n')
+        # Extra headers plus any remembered validators
+        self._headers = self._extra_headers
+
+    def _remember_validators(self, headers):
+        # Only stored once a body has been consumed, so a fetch that failed
+        # part way is never answered with 304 next time
+        self._headers = list(self._extra_headers)
+        etag = headers.get('etag')
+        if etag:
+            self._headers.append(b'If-None-Match: %s\r\n' % etag.encode('utf-8'))
+        last_modified = headers.get('last-modified')
+        if last_modified:
+            self._headers.append(b'If-Modified-Since: %s\r\n' % last_modified.encode('utf-8'))
 
     async def get(self):
         """
-        Perform HTTP GET request and return (reader, writer) tuple.
-        Caller is responsible for closing the writer.
+        Perform HTTP GET request and return (reader, response) tuple.
+        The reader yields just the body; the response closes like a
+        StreamWriter (close() then wait_closed()), returning the
+        connection to the pool when the body was read to the end.
+        Call response.finish() before closing once the body has been
+        consumed (get_scoped() does this on a clean exit).
 
         Returns:
-            tuple: (reader, writer) from asyncio.open_connection
+            tuple: (BodyReader or InflateReader, Response)
 
         Raises:
+            NotModified: If conditional and the server answered 304
+            CircuitOpen: If the host has been failing (not retried)
+            OSError: If every attempt failed (TimedOut for a timeout)
             Exception: If status code is not 200
         """
-        import asyncio
-
-        reader, writer = await asyncio.open_connection(
-            self.uri.hostname,
-            self.uri.port,
-            ssl=self.uri.secure
-        )
-
-        try:
-            # Write pre-allocated headers
-            writer.write(self._get_line)
-            writer.write(self._host_header)
-            for header in self._extra_headers:
-                writer.write(header)
-            writer.write(self._crlf)
-            await writer.drain()
-
-            # Read and check status
-            line = await reader.readline()
-            status = line.split(b' ', 2)
-            status_code = int(status[1])
-
-            if status_code != 200:
-                raise Exception(f"HTTP {status_code}")
-
-            # Skip headers until blank line
-            while True:
-                line = await reader.readline()
-                if line == b'\r\n':
+        attempt = 0
+        while True:
+            try:
+                response = await request(self.uri, b'GET', self._path_bytes, self._headers, None, self.pool, self.timeouts)
+                if response.status < 500 or attempt >= self.retries:
                     break
-            
-            return reader, writer
-        
-        except Exception:
-            writer.close()
-            await writer.wait_closed()
-            raise
+                response.close()
+                await response.wait_closed()
+            except CircuitOpen:
+                raise
+            except OSError:
+                if attempt >= self.retries:
+                    raise
+            # Equal jitter, so components that failed together spread out
+            delay = self.backoff_ms << attempt
+            await asyncio.sleep((delay // 2 + random.randint(0, delay // 2)) / 1000)
+            attempt += 1
+
+        if response.status != 200:
+            response.close()
+            await response.wait_closed()
+            if response.status == 304 and self.conditional:
+                raise NotModified()
+            raise Exception(f"HTTP {response.status}")
+        encoding = response.headers.get('content-encoding')
+        compressed = encoding == 'deflate' or encoding == 'gzip'
+        if compressed and decompressobj is None and self._compressed:
+            length = response.headers.get('content-length')
+            if length is None or int(length) > MAX_BUFFERED_INFLATE:
+                # Too big (or of unknown size) to buffer: stream this URL
+                # uncompressed from now on
+                response.close()
+                await response.wait_closed()
+                self._compressed = False
+                self._extra_headers = [h for h in self._extra_headers if not h.startswith(b'Accept-Encoding:')]
+                self._headers = self._extra_headers
+                return await self.get()
+        if self.conditional:
+            # Forget the old validators until this body is finished
+            self._headers = self._extra_headers
+            response.on_finish = self._remember_validators
+        if compressed:
+            return InflateReader(response.reader), response
+        return response.reader, response
 
     def get_scoped(self):
         """
@@ -209,6 +847,8 @@ class ScopedConnection:
 
     async def __aexit__(self, exc_type, exc, tb):
         if self.writer:
+            if exc_type is None and hasattr(self.writer, 'finish'):
+                await self.writer.finish()
             self.writer.close()
             await self.writer.wait_closed()
 
@@ -3,6 +3,7 @@ import struct
 import socket
 import asyncio
 from httpstream import parse_url
+import dnscache
 
 class RemoteTime:
     def __init__(self, endpoint, update_time_ms, nic, offset_seconds=0, dst_delegate=None, write_initial_time=False):
@@ -44,7 +45,7 @@ class RemoteTime:
     async def acquire_time(self):
         NTP_QUERY = bytearray(48)
         NTP_QUERY[0] = 0x1B
-        addr = socket.getaddrinfo(self.uri.hostname, self.uri.port)[0][-1]
+        addr = dnscache.getaddrinfo(self.uri.hostname, self.uri.port)[0][-1]
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         receive_milliseconds = 0
         try:
@@ -2,7 +2,7 @@ import gc
 import asyncio
 import os
 import hashlib
-from httpstream import parse_url
+from httpstream import parse_url, request
 
 try:
     from micropython import const
@@ -62,17 +62,10 @@ class ManifestDownloader:
         base_folder = '/'.join(path_parts[:-1])
         base_url = f"http{'s' if manifest_uri.port == 443 else ''}://{manifest_uri.hostname}:{manifest_uri.port}{base_folder}"
         
-        reader, writer = await asyncio.open_connection(
-            manifest_uri.hostname,
-            manifest_uri.port,
-            ssl=manifest_uri.port == 443
-        )
+        response = await self._get(manifest_uri)
         
         try:
-            self._write_http_request(writer, manifest_uri)
-            await writer.drain()
-            await self._ensure_success_status_code(reader)
-            await self._skip_headers(reader)
+            reader = response.reader
             
             # Parse line by line from the stream — no full-body accumulation
             file_list = []
@@ -90,8 +83,8 @@ class ManifestDownloader:
             
             return base_url, file_list
         finally:
-            writer.close()
-            await writer.wait_closed()
+            response.close()
+            await response.wait_closed()
     
     async def download_manifest_item(self, base_url, manifest_item, destination_folder):
         """Download a single item from a manifest item tuple (filename, expected_hash).
@@ -139,24 +132,14 @@ class ManifestDownloader:
         except OSError:
             pass
         
-        reader, writer = await asyncio.open_connection(
-            uri.hostname, 
-            uri.port, 
-            ssl=uri.port == 443
-        )
+        # Files from one manifest reuse the pooled keep-alive connection
+        response = await self._get(uri)
         
         try:
-            self._write_http_request(writer, uri)
-            await writer.drain()
-            
-            await self._ensure_success_status_code(reader)
-            await self._skip_headers(reader)
-            
-            await self._download_to_file(reader, destination_path)
-            
+            await self._download_to_file(response.reader, destination_path)
         finally:
-            writer.close()
-            await writer.wait_closed()
+            response.close()
+            await response.wait_closed()
         
         # Verify hash if expected_hash is provided
         if expected_hash:
@@ -166,24 +149,13 @@ class ManifestDownloader:
         
         return filename
     
-    def _write_http_request(self, writer, uri):
-        writer.write(b'GET %s HTTP/1.0\r\n' % uri.path.encode('utf-8'))
-        writer.write(b'Host: %s\r\n' % uri.hostname.encode('utf-8'))
-        writer.write(b'Connection: close\r\n')
-        writer.write(b'\r\n')
-    
-    async def _ensure_success_status_code(self, reader):
-        line = await reader.readline()
-        status = line.split(b' ', 2)
-        status_code = int(status[1])
-        if status_code not in [200, 201]:
-            raise Exception(f"HTTP {status_code}: {line.decode('utf-8', errors='ignore')}")
-    
-    async def _skip_headers(self, reader):
-        while True:
-            line = await reader.readline()
-            if line == b'\r\n':
-                break
+    async def _get(self, uri):
+        response = await request(uri, b'GET', uri.path.encode('utf-8'))
+        if response.status not in (200, 201):
+            response.close()
+            await response.wait_closed()
+            raise Exception(f"HTTP {response.status}")
+        return response
     
     async def _download_to_file(self, reader, destination_path):
         with open(destination_path, 'wb') as file:
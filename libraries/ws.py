@@ -3,6 +3,7 @@ import random
 import struct
 import asyncio
 from httpstream import parse_url
+import dnscache
 
 try:
     from micropython import const
@@ -264,7 +265,7 @@ async def connect(uri):
 
     print("open connection %s:%s" % (uri.hostname, uri.port))
     
-    reader, writer = await asyncio.open_connection(uri.hostname, uri.port, ssl = uri.port == 443)
+    reader, writer = await dnscache.open_connection(uri.hostname, uri.port, uri.port == 443)
     
     try:
         # Sec-WebSocket-Key is 16 bytes of random base64 encoded
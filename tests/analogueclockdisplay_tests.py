@@ -0,0 +1,106 @@
+import sys
+import io
+import asyncio
+import unittest
+import os
+import tempfile
+# Add project root, infodisplay and cpython to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../infodisplay')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../cpython')))
+
+import textbox
+from analogueclockdisplay import AnalogueClockDisplay
+from bmfont import BMFont
+from drawing import Drawing
+
+# Digits as 5x7 glyphs in a 64x8 GS8 atlas, standing in for fonts/small
+FNT = "common lineHeight=9 base=7 scaleW=64 scaleH=8 pages=1\npage id=0 file=\"small_0.bin\"\nchars count=10\n" + \
+    "".join(f"char id={48 + d} x={d * 6} y=0 width=5 height=7 xoffset=0 yoffset=0 xadvance=6 page=0\n" for d in range(10))
+ATLAS = b'\x40\x00\x08\x00' + bytes((x * 5 + y * 31) & 0xFF for y in range(8) for x in range(64))
+
+class Time:
+    def __init__(self):
+        self.now = (2024, 1, 1, 10, 9, 0, 0, 0)
+
+    def local_time(self):
+        return self.now
+
+class Driver:
+    def __init__(self):
+        self.regions = []
+
+    def render(self, fb, width, height, region):
+        self.regions.append(region)
+
+async def _clock(time, cached):
+    drawing = Drawing(320, 240)
+    driver = Driver()
+    drawing.set_driver(driver)
+    clock = AnalogueClockDisplay(drawing, time, 70)
+    drawing.rect(0, 70, 320, 170, 0x000000, True)
+    await clock._draw_dial()
+    if cached:
+        clock._save_dial()
+    return clock, drawing, driver
+
+class TestAnalogueClock(unittest.TestCase):
+    def setUp(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.fnt', delete=False) as f:
+            f.write(FNT)
+        font = BMFont.load(f.name)
+        os.unlink(f.name)
+        self._font = textbox._BM_FONT_CACHE.get('small')
+        textbox._BM_FONT_CACHE['small'] = (font, [io.BytesIO(ATLAS)])
+
+    def tearDown(self):
+        if self._font is None:
+            textbox._BM_FONT_CACHE.pop('small', None)
+        else:
+            textbox._BM_FONT_CACHE['small'] = self._font
+
+    def test_tick_restores_face_and_pushes_hands_only(self):
+        async def run():
+            time = Time()
+            clock, drawing, driver = await _clock(time, True)
+            self.assertIsNotNone(clock._dial)
+            for t in ((10, 9, 0), (10, 9, 1), (10, 9, 37), (10, 10, 0), (3, 45, 59)):
+                time.now = (2024, 1, 1) + t + (0, 0)
+                driver.regions = []
+                await clock.update()
+                # The uncached path redraws the whole clock
+                expected, drawing_expected, _ = await _clock(time, False)
+                await expected.update()
+                self.assertEqual(drawing._framebuffer, drawing_expected._framebuffer, t)
+                # At most the old and new box of each hand, each well
+                # inside the dial
+                self.assertLessEqual(len(driver.regions), 6)
+                _, _, dw, dh = clock._dial_rect()
+                for x, y, w, h in driver.regions:
+                    self.assertLess(w * h, dw * dh // 2)
+
+        asyncio.run(run())
+
+    def test_activate_pushes_face(self):
+        async def run():
+            drawing = Drawing(320, 240)
+            driver = Driver()
+            drawing.set_driver(driver)
+            clock = AnalogueClockDisplay(drawing, Time(), 70)
+            task = asyncio.create_task(clock.activate())
+            await asyncio.sleep(0.05)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            self.assertEqual((0, 70, 320, 170), driver.regions[0])
+            self.assertEqual([], drawing.get_damage())
+            # The face copy is released when another screen takes over
+            self.assertIsNone(clock._dial)
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../infodisplay')))
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../cpython')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../tools')))
 
 try:
     import framebuf
@@ -13,7 +14,8 @@ except ImportError:
     # If not in path, try direct import from cpython
     from cpython import framebuf
 
-from bitblt import blit_region
+from bitblt import blit_region, blit_buffer, blit_buffer_scaled, blit_rle, rle_buffer_size
+import imageconvert
 
 class TestBitBlt(unittest.TestCase):
     def setUp(self):
@@ -166,6 +168,102 @@ class TestBitBlt(unittest.TestCase):
                     
         self.assertEqual(fb8_data[0], 0xAA)
         self.assertEqual(fb8_data[1], 0xFF)
+    def _fb8(self, w, h):
+        data = bytearray(w * h)
+        fb = framebuf.FrameBuffer(data, w, h, framebuf.GS8)
+        fb.bytes_per_pixel = 1
+        return data, fb
+
+    def test_scaled_nearest_upscale(self):
+        data, fb = self._fb8(6, 6)
+        palette = bytearray(range(256))
+        src = bytearray([1, 2, 3, 4]) # 2x2
+        blit_buffer_scaled(fb, 6, 6, src, 2, 2, 1, 1, 2, 1, palette)
+        self.assertEqual(bytes(data[7:11]), b'\x01\x01\x02\x02')
+        self.assertEqual(bytes(data[13:17]), b'\x01\x01\x02\x02')
+        self.assertEqual(bytes(data[19:23]), b'\x03\x03\x04\x04')
+        self.assertEqual(data[0], 0)
+        # Clipped to the lower right quadrant: sampling starts mid-source
+        data[:] = bytes(36)
+        blit_buffer_scaled(fb, 6, 6, src, 2, 2, 0, 0, 2, 1, palette, clip=(3, 2, 3, 4))
+        self.assertEqual(bytes(data[0:6]), bytes(6))
+        self.assertEqual(bytes(data[12:18]), b'\x00\x00\x00\x04\x00\x00')
+
+    def test_scaled_box_downscale(self):
+        data, fb = self._fb8(4, 4)
+        palette = bytearray(range(256))
+        src = bytearray([0, 100, 8, 8,
+                         100, 0, 8, 8]) # 4x2
+        blit_buffer_scaled(fb, 4, 4, src, 4, 2, 0, 0, 1, 2, palette)
+        self.assertEqual(bytes(data[0:3]), bytes([50, 8, 0]))
+        blit_buffer_scaled(fb, 4, 4, src, 4, 2, 0, 1, 1, 2, palette, box=False)
+        self.assertEqual(bytes(data[4:6]), bytes([0, 8]))
+
+    def test_scaled_rgb565_key(self):
+        palette = bytearray([0x00] * 512)
+        palette[2] = 0x00; palette[3] = 0xF8
+        src = bytearray([0, 1])
+        blit_buffer_scaled(self.fb, self.width, self.height, src, 2, 1, 0, 0, 3, 1, palette, key=0)
+        px = [(self.fb_data[i * 2 + 1] << 8) | self.fb_data[i * 2] for i in range(6)]
+        self.assertEqual(px, [0, 0, 0, 0xF800, 0xF800, 0xF800])
+        self.assertEqual(self.fb_data[self.width * 2 * 3 + 7], 0)
+    def test_alpha_blends_over_background_rgb565(self):
+        # Grey background; white text coverage 0, 128 and 255
+        for i in range(0, len(self.fb_data), 2):
+            self.fb_data[i] = 0x08; self.fb_data[i + 1] = 0x42 # 0x4208
+        src = bytearray([0, 128, 255])
+        blit_buffer(self.fb, self.width, self.height, src, 3, 1, 0, 0, color=0xFFFF)
+        px = [(self.fb_data[i * 2 + 1] << 8) | self.fb_data[i * 2] for i in range(3)]
+        self.assertEqual(px[0], 0x4208)
+        self.assertEqual(px[2], 0xFFFF)
+        # Half coverage lands half way between grey (8, 16, 8) and white
+        self.assertEqual((px[1] >> 11, (px[1] >> 5) & 0x3F, px[1] & 0x1F), (20, 40, 20))
+
+    def test_alpha_from_file_rgb332(self):
+        data, fb = self._fb8(4, 1)
+        data[:] = bytes([0xE0] * 4) # red
+        fh = io.BytesIO(bytearray([0, 255, 128, 64]))
+        blit_region(fb, 4, 1, 1, fh, 0, 4, 0, 0, 4, 1, 0, 0, src_format=6, color=0x03) # blue
+        self.assertEqual(data[0], 0xE0)
+        self.assertEqual(data[1], 0x03)
+        self.assertEqual(data[2], (3 << 5) | 2) # about half way: red 7 -> 3, blue 0 -> 2
+        self.assertEqual(data[3], (5 << 5) | 1) # a quarter: red 7 -> 5, blue 0 -> 1
+    def _icon(self, w, h, bpp):
+        # Mostly-black icon with a block of noise, like the weather icons
+        raw = bytearray(w * h * bpp)
+        for y in range(2, h - 2):
+            for x in range(w // 3, w - 3):
+                raw[(y * w + x) * bpp] = (x * 31 + y * 17) & 0xFF if x % 5 else 0x7F
+        return raw
+
+    def test_rle_matches_raw_blit(self):
+        w, h = 150, 12 # wider than one 128 pixel run
+        raw = self._icon(w, h, 2)
+        rle = imageconvert._rle_encode(raw, w, h, 2)
+        self.assertLess(len(rle), len(raw) // 2)
+        self.assertEqual(imageconvert._rle_decode(rle, w, h, 2), bytes(raw))
+        for clip in (None, (-3, 4, 60, 5), (20, 0, 100, 100)):
+            expected = bytearray(self.fb_data)
+            expected_fb = framebuf.FrameBuffer(expected, self.width, self.height, framebuf.RGB565)
+            expected_fb.bytes_per_pixel = 2
+            blit_region(expected_fb, self.width, self.height, 2, io.BytesIO(raw), 0, w * 2,
+                        0, 0, w, h, -5, 3, clip=clip)
+            # Smallest buffer: forces refills and a partial row at the edge
+            blit_rle(self.fb, self.width, self.height, 2, io.BytesIO(rle), w, h, -5, 3,
+                     buffer=bytearray(rle_buffer_size(w, 2)), clip=clip)
+            self.assertEqual(self.fb_data, expected, clip)
+
+    def test_rle_8bit_and_truncation(self):
+        data, fb = self._fb8(20, 10)
+        raw = self._icon(16, 8, 1)
+        rle = imageconvert._rle_encode(raw, 16, 8, 1)
+        blit_rle(fb, 20, 10, 1, io.BytesIO(rle), 16, 8, 2, 1)
+        for y in range(8):
+            self.assertEqual(bytes(data[(y + 1) * 20 + 2:(y + 1) * 20 + 18]), bytes(raw[y * 16:(y + 1) * 16]))
+        # A truncated file draws what it has rather than raising
+        data[:] = bytes(200)
+        blit_rle(fb, 20, 10, 1, io.BytesIO(rle[:len(rle) // 2]), 16, 8, 2, 1)
+        self.assertEqual(bytes(data[22:38]), bytes(raw[:16]))
 
 if __name__ == '__main__':
     unittest.main()
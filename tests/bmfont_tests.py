@@ -0,0 +1,129 @@
+import sys
+import io
+import unittest
+import os
+import tempfile
+# Add project root, infodisplay and cpython to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../infodisplay')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../cpython')))
+
+import bmfont
+from bmfont import BMFont, draw_text
+
+# Three 6x8 glyphs side by side in a 32x8 GS8 atlas
+FNT = """common lineHeight=10 base=8 scaleW=32 scaleH=8 pages=1
+page id=0 file="test_0.bin"
+chars count=3
+char id=97 x=0 y=0 width=6 height=8 xoffset=0 yoffset=1 xadvance=7 page=0
+char id=98 x=6 y=0 width=6 height=8 xoffset=0 yoffset=0 xadvance=7 page=0
+char id=99 x=12 y=0 width=6 height=8 xoffset=1 yoffset=0 xadvance=7 page=0
+"""
+ATLAS = b'\x20\x00\x08\x00' + bytes((x * 7 + y * 13) & 0xFF for y in range(8) for x in range(32))
+
+class Target:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.bytes_per_pixel = 2
+        self._framebuffer = bytearray(width * height * 2)
+
+class CountingFile:
+    """Page file wrapper counting seeks, to prove cache hits skip it."""
+    def __init__(self, fh):
+        self._fh = fh
+        self.seeks = 0
+
+    def seek(self, pos):
+        self.seeks += 1
+        return self._fh.seek(pos)
+
+    def read(self, n):
+        return self._fh.read(n)
+
+    def readinto(self, buf):
+        return self._fh.readinto(buf)
+
+class TestGlyphCache(unittest.TestCase):
+    def setUp(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.fnt', delete=False) as f:
+            f.write(FNT)
+        self.font = BMFont.load(f.name)
+        os.unlink(f.name)
+        self.page = CountingFile(io.BytesIO(ATLAS))
+        self._budget = bmfont._glyph_cache_budget
+        bmfont.clear_glyph_cache()
+
+    def tearDown(self):
+        bmfont.set_glyph_cache_budget(self._budget)
+        bmfont.clear_glyph_cache()
+
+    def _draw(self, text, clip=None, budget=8192, scale_up=1, size=(40, 12), linebuf=-1):
+        bmfont.set_glyph_cache_budget(budget)
+        target = Target(*size)
+        if linebuf == -1:
+            linebuf = bytearray(self.font.scale_w * 4)
+        draw_text(target, size[0], size[1], self.font, [self.page], text, 2, 2,
+                  scale_up=scale_up, color=0xFFFFFF,
+                  linebuf=linebuf, clip=clip)
+        return target._framebuffer
+
+    def test_cached_draw_matches_file_blit(self):
+        expected = self._draw('abcab', budget=0)
+        self.assertEqual(bmfont.glyph_cache_stats()[0], 0)
+        self.assertNotEqual(expected, bytes(len(expected)))
+        self.assertEqual(self._draw('abcab'), expected)
+        clip = (4, 3, 17, 6)
+        self.assertEqual(self._draw('abcab', clip), self._draw('abcab', clip, budget=0))
+
+    def test_hits_skip_the_page_file(self):
+        self._draw('aaa')
+        entries, nbytes, hits, misses = bmfont.glyph_cache_stats()
+        self.assertEqual((entries, hits, misses), (1, 2, 1))
+        seeks = self.page.seeks
+        self._draw('aaa')
+        self.assertEqual(self.page.seeks, seeks)
+
+    def test_budget_evicts_least_recently_used(self):
+        self._draw('a')
+        size = bmfont.glyph_cache_stats()[1]
+        # Room for roughly two 'a'-sized glyphs: drawing a, b, a, c must
+        # evict b (least recently used), not a
+        budget = size * 2 + size // 2
+        self._draw('b', budget=budget)
+        self._draw('a', budget=budget)
+        self._draw('c', budget=budget)
+        keys = set(bmfont._GLYPH_CACHE)
+        fid = self.font._cache_id
+        self.assertIn(fid | ord('a'), keys)
+        self.assertNotIn(fid | ord('b'), keys)
+        self.assertLessEqual(bmfont.glyph_cache_stats()[1], budget)
+
+    def test_scale_up_enlarges_glyphs(self):
+        small = self._draw('b', size=(40, 24))
+        big = self._draw('b', budget=0, scale_up=2, size=(40, 24))
+        self.assertEqual(self._draw('b', scale_up=2, size=(40, 24)), big)
+        # Each glyph pixel becomes a 2x2 block at the scaled offset
+        for gy in range(8):
+            for gx in range(6):
+                o = ((2 + gy) * 40 + 2 + gx) * 2
+                for sy in range(2):
+                    for sx in range(2):
+                        d = ((2 + gy * 2 + sy) * 40 + 2 + gx * 2 + sx) * 2
+                        self.assertEqual(big[d:d + 2], small[o:o + 2])
+
+    def test_uncached_scaled_glyphs_reuse_scratch(self):
+        expected = self._draw('abc', scale_up=2, size=(48, 24))
+        linebuf = bytearray(self.font.scale_w * 4)
+        self.assertEqual(self._draw('abc', budget=0, scale_up=2, size=(48, 24), linebuf=linebuf), expected)
+        # The glyphs were read into the caller's linebuf
+        self.assertNotEqual(linebuf, bytearray(len(linebuf)))
+        # Too small (or no) linebuf: one module scratch, kept across draws
+        self.assertEqual(self._draw('abc', budget=0, scale_up=2, size=(48, 24), linebuf=bytearray(8)), expected)
+        scratch = bmfont._glyph_scratch
+        self.assertEqual(self._draw('abc', budget=0, scale_up=2, size=(48, 24), linebuf=None), expected)
+        self.assertIs(bmfont._glyph_scratch, scratch)
+
+
+if __name__ == '__main__':
+    unittest.main()
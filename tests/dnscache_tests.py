@@ -0,0 +1,84 @@
+import sys
+sys.path.insert(1, '../libraries')
+sys.path.insert(1, '../cpython')
+
+import asyncio
+import socket
+import unittest
+from unittest import mock
+import dnscache
+
+ADDRESS = [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('127.0.0.1', 80))]
+
+class TestDnsCache(unittest.IsolatedAsyncioTestCase):
+
+    async def test_cached_until_ttl(self):
+        resolver = dnscache.Resolver(ttl_ms=50, refresh_ms=50)
+        with mock.patch.object(dnscache.socket, 'getaddrinfo', return_value=ADDRESS) as lookup:
+            self.assertEqual(ADDRESS, resolver.getaddrinfo('example', 80))
+            self.assertEqual(ADDRESS, resolver.getaddrinfo('example', 80))
+            self.assertEqual(1, lookup.call_count)
+            await asyncio.sleep(0.06)
+            resolver.getaddrinfo('example', 80)
+            self.assertEqual(2, lookup.call_count)
+
+    async def test_negative_caching(self):
+        resolver = dnscache.Resolver(negative_ttl_ms=50)
+        with mock.patch.object(dnscache.socket, 'getaddrinfo', side_effect=OSError(-2)) as lookup:
+            for _ in range(3):
+                with self.assertRaises(OSError):
+                    resolver.getaddrinfo('missing', 80)
+            self.assertEqual(1, lookup.call_count)
+        await asyncio.sleep(0.06)
+        with mock.patch.object(dnscache.socket, 'getaddrinfo', return_value=ADDRESS):
+            self.assertEqual(ADDRESS, resolver.getaddrinfo('missing', 80))
+
+    async def test_background_refresh(self):
+        resolver = dnscache.Resolver(ttl_ms=10_000, refresh_ms=20)
+        moved = [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('127.0.0.2', 80))]
+        with mock.patch.object(dnscache.socket, 'getaddrinfo', return_value=ADDRESS):
+            resolver.getaddrinfo('example', 80)
+        await asyncio.sleep(0.03)
+        with mock.patch.object(dnscache.socket, 'getaddrinfo', return_value=moved) as lookup:
+            # Served from the cache while the refresh runs
+            self.assertEqual(ADDRESS, resolver.getaddrinfo('example', 80))
+            self.assertEqual(ADDRESS, resolver.getaddrinfo('example', 80))
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            self.assertEqual(1, lookup.call_count)
+            self.assertEqual(moved, resolver.getaddrinfo('example', 80))
+
+    async def test_max_entries(self):
+        resolver = dnscache.Resolver(max_entries=2)
+        with mock.patch.object(dnscache.socket, 'getaddrinfo', return_value=ADDRESS) as lookup:
+            for host in ('a', 'b', 'c', 'c', 'a'):
+                resolver.getaddrinfo(host, 80)
+                await asyncio.sleep(0.002)
+            self.assertEqual(4, lookup.call_count)
+            self.assertEqual({('c', 80), ('a', 80)}, set(resolver._entries))
+
+    async def test_open_connection(self):
+        async def handle(reader, writer):
+            writer.write(b'hi')
+            writer.close()
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        resolver = dnscache.Resolver()
+        address = [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('127.0.0.1', port))]
+        with mock.patch.object(dnscache.socket, 'getaddrinfo', return_value=address) as lookup:
+            for _ in range(2):
+                reader, writer = await resolver.open_connection('server.local', port)
+                self.assertEqual(b'hi', await reader.read())
+                writer.close()
+            self.assertEqual(1, lookup.call_count)
+        server.close()
+        await server.wait_closed()
+        # A refused connection drops the cached address
+        with mock.patch.object(dnscache.socket, 'getaddrinfo', return_value=address):
+            with self.assertRaises(OSError):
+                await resolver.open_connection('server.local', port)
+        self.assertNotIn(('server.local', port), resolver._entries)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import sys
+import asyncio
+import unittest
+import os
+# Add project root, infodisplay and cpython to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../infodisplay')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../cpython')))
+
+from drawing import Drawing
+
+class RecordingDriver:
+    def __init__(self):
+        self.regions = []
+
+    def render(self, fb, width, height, region):
+        self.regions.append(region)
+
+class TestDamageTracking(unittest.TestCase):
+    def setUp(self):
+        self.drawing = Drawing(100, 50)
+        self.driver = RecordingDriver()
+        self.drawing.set_driver(self.driver)
+
+    def test_adjacent_columns_coalesce(self):
+        # Equal-height strips side by side (weather columns) merge into one
+        for i in range(5):
+            self.drawing.rect(i * 20, 10, 20, 40, 0, True)
+        self.drawing.flush()
+        self.assertEqual(self.driver.regions, [(0, 10, 100, 40)])
+
+    def test_contained_draws_do_not_grow_damage(self):
+        self.drawing.rect(10, 10, 30, 20, 0, True)
+        self.drawing.hline(12, 15, 10, 0xFFFFFF)
+        self.drawing.pixel(20, 20, 0xFFFFFF)
+        self.assertEqual(self.drawing.get_damage(), [(10, 10, 30, 20)])
+
+    def test_distant_rects_stay_separate(self):
+        self.drawing.rect(0, 0, 5, 5, 0, True)
+        self.drawing.rect(90, 40, 5, 5, 0, True)
+        self.assertEqual(self.drawing.get_damage(), [(0, 0, 5, 5), (90, 40, 5, 5)])
+
+    def test_damage_clipped_to_bounds(self):
+        self.drawing.rect(-10, 45, 20, 20, 0, True)
+        self.assertEqual(self.drawing.get_damage(), [(0, 45, 10, 5)])
+        self.drawing.rect(200, 0, 10, 10, 0, True)
+        self.assertEqual(len(self.drawing.get_damage()), 1)
+
+    def test_pixel_not_tracked(self):
+        self.drawing.pixel(20, 20, 0xFFFFFF)
+        self.assertEqual(self.drawing.get_damage(), [])
+
+    def test_rect_count_is_bounded(self):
+        for i in range(20):
+            self.drawing.fill_rect((i * 7) % 100, (i * 13) % 50, 1, 1, 0xFFFFFF)
+        damage = self.drawing.get_damage()
+        self.assertLessEqual(len(damage), 8)
+        # Every pixel drawn is still covered by some rectangle
+        for i in range(20):
+            px, py = (i * 7) % 100, (i * 13) % 50
+            self.assertTrue(any(x <= px < x + w and y <= py < y + h for x, y, w, h in damage))
+
+    def test_flush_clears_damage(self):
+        self.drawing.rect(0, 0, 10, 10, 0, True)
+        self.drawing.flush()
+        self.drawing.flush()
+        self.assertEqual(len(self.driver.regions), 1)
+
+    def test_update_consumes_contained_damage(self):
+        self.drawing.rect(10, 10, 10, 10, 0, True)
+        self.drawing.rect(80, 0, 10, 10, 0, True)
+        self.drawing.update((0, 0, 50, 50))
+        self.assertEqual(self.drawing.get_damage(), [(80, 0, 10, 10)])
+        self.assertEqual(self.driver.regions, [(0, 0, 50, 50)])
+
+    def test_flush_region_leaves_other_damage(self):
+        # Another component's half-drawn area stays pending
+        self.drawing.rect(0, 0, 20, 10, 0, True)
+        self.drawing.rect(60, 30, 20, 10, 0, True)
+        self.drawing.flush((0, 0, 50, 50))
+        self.assertEqual(self.driver.regions, [(0, 0, 20, 10)])
+        self.assertEqual(self.drawing.get_damage(), [(60, 30, 20, 10)])
+
+    def test_flush_region_splits_straddling_damage(self):
+        self.drawing.rect(10, 10, 40, 20, 0, True)
+        self.drawing.flush((20, 0, 10, 50))
+        self.assertEqual(self.driver.regions, [(20, 10, 10, 20)])
+        self.assertEqual(sorted(self.drawing.get_damage()), [(10, 10, 10, 20), (30, 10, 20, 20)])
+
+    def test_flush_region_keeps_rect_count_bounded(self):
+        for n in range(5):
+            for i in range(8):
+                self.drawing.rect(i * 12, (i * 5 + n * 3) % 40, 10, 10, 0, True)
+            # Each straddled rectangle splits into up to four pieces
+            self.drawing.flush((n * 9 + 5, 12, 7, 9))
+            self.assertLessEqual(len(self.drawing.get_damage()), 8)
+
+    def test_flush_async_falls_back_to_render(self):
+        self.drawing.rect(0, 0, 10, 10, 0, True)
+        asyncio.run(self.drawing.flush_async())
+        self.assertEqual(self.driver.regions, [(0, 0, 10, 10)])
+        self.assertEqual(self.drawing.get_damage(), [])
+
+
+class TestRgb888(unittest.TestCase):
+    def test_pixels_stored_as_rgb_bytes(self):
+        drawing = Drawing(4, 3, 'RGB888')
+        self.assertEqual(drawing.bytes_per_pixel, 3)
+        drawing.fill_rect(1, 1, 2, 1, 0x123456)
+        drawing.pixel(0, 2, 0xABCDEF)
+        fb = drawing._framebuffer
+        self.assertEqual(bytes(fb[15:21]), b'\x12\x34\x56\x12\x34\x56')
+        self.assertEqual(bytes(fb[24:27]), b'\xab\xcd\xef')
+        self.assertEqual(drawing.fb.pixel(2, 1), 0x123456)
+        self.assertEqual(bytes(fb[:12]), bytes(12))
+
+    def test_ellipse_and_clipping(self):
+        drawing = Drawing(9, 9, 'RGB888')
+        drawing.ellipse(4, 4, 3, 3, 0xFFFFFF, True)
+        self.assertEqual(drawing.fb.pixel(4, 1), 0xFFFFFF)
+        self.assertEqual(drawing.fb.pixel(0, 0), 0)
+        drawing.rect(-5, -5, 7, 7, 0x0000FF, True)
+        self.assertEqual(drawing.fb.pixel(1, 1), 0x0000FF)
+        self.assertEqual(drawing.fb.pixel(2, 2), 0xFFFFFF)
+
+
+class TestAaLine(unittest.TestCase):
+    def test_horizontal_line_covers_whole_pixels(self):
+        drawing = Drawing(20, 12, 'RGB888')
+        drawing.aa_line(2, 5, 17, 5, 3, 0xFF0000)
+        for y in range(12):
+            for x in range(20):
+                expected = 0xFF0000 if 2 <= x <= 17 and 4 <= y <= 6 else 0
+                self.assertEqual(drawing.fb.pixel(x, y), expected, (x, y))
+        self.assertEqual(drawing.get_damage(), [(0, 2, 20, 7)])
+
+    def test_diagonal_edges_blend_with_background(self):
+        drawing = Drawing(16, 16)
+        drawing.fill(0x0000FF)
+        drawing.aa_line(2, 2, 13, 13, 1, 0xFFFFFF)
+        self.assertEqual(drawing.fb.pixel(7, 7), drawing.pack(0xFFFFFF))
+        # Half a pixel off the line: part line colour, part background
+        edge = drawing.fb.pixel(8, 7)
+        self.assertEqual(edge, drawing.fb.pixel(7, 8))
+        self.assertNotIn(edge, (drawing.pack(0xFFFFFF), drawing.pack(0x0000FF)))
+        self.assertEqual(edge & 0x1F, 0x1F)
+        self.assertEqual(drawing.fb.pixel(12, 2), drawing.pack(0x0000FF))
+
+    def test_off_screen_and_degenerate(self):
+        drawing = Drawing(8, 8, 'GS8')
+        drawing.aa_line(-50, -50, -10, -20, 4, 0xFFFFFF)
+        drawing.aa_line(100, 3, 200, 3, 2, 0xFFFFFF)
+        self.assertEqual(bytes(drawing._framebuffer), bytes(64))
+        drawing.aa_line(-20, 3, 30, 3, 1, 0xFFFFFF)
+        self.assertEqual(bytes(drawing._framebuffer[24:32]), b'\xff' * 8)
+        drawing.aa_line(5, 6, 5, 6, 1, 0xFFFFFF)
+        self.assertEqual(drawing.fb.pixel(5, 6), 0xFF)
+
+
+if __name__ == '__main__':
+    unittest.main()
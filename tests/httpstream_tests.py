@@ -0,0 +1,448 @@
+import sys
+sys.path.insert(1, '../libraries')
+sys.path.insert(1, '../cpython')
+
+import asyncio
+import gzip
+import unittest
+import zlib
+import httpstream
+from flatjson import load_array
+
+class Server:
+    """Local HTTP/1.1 server replying with queued raw responses, counting connections."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.connections = 0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        while self.responses:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except asyncio.IncompleteReadError:
+                # Client closed the connection
+                break
+            self.requests.append(head)
+            for line in head.split(b'\r\n'):
+                if line.lower().startswith(b'content-length:'):
+                    self.requests.append(await reader.readexactly(int(line[15:])))
+            response = self.responses.pop(0)
+            writer.write(response)
+            await writer.drain()
+            if b'Connection: close' in response:
+                break
+        writer.close()
+
+    def url(self, path='/'):
+        return f'http://127.0.0.1:{self.port}{path}'
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+class TestHttpStream(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.pool = httpstream.ConnectionPool()
+
+    async def asyncTearDown(self):
+        await self.pool.close_idle()
+
+    async def _get(self, url):
+        async with httpstream.HttpRequest(url, pool=self.pool).get_scoped() as (reader, writer):
+            return await reader.read()
+
+    async def test_keep_alive_reuses_connection(self):
+        server = await Server([
+            b'HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nhello',
+            b'HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nworld',
+        ]).start()
+        self.assertEqual(b'hello', await self._get(server.url('/a')))
+        self.assertEqual(b'world', await self._get(server.url('/b')))
+        self.assertEqual(1, server.connections)
+        self.assertTrue(server.requests[0].startswith(b'GET /a HTTP/1.1\r\nHost: 127.0.0.1\r\n'))
+        await server.stop()
+
+    async def test_chunked_body(self):
+        server = await Server([
+            b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n'
+            b'4\r\n[1,2\r\n3;ext=1\r\n,3]\r\n0\r\nX-Trailer: 1\r\n\r\n',
+            b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok',
+        ]).start()
+        self.assertEqual(b'[1,2,3]', await self._get(server.url()))
+        self.assertEqual(b'ok', await self._get(server.url()))
+        self.assertEqual(1, server.connections)
+        await server.stop()
+
+    async def test_readline_and_readinto(self):
+        server = await Server([b'HTTP/1.1 200 OK\r\nContent-Length: 12\r\n\r\nab\ncd\nefghij']).start()
+        async with httpstream.HttpRequest(server.url(), pool=self.pool).get_scoped() as (reader, writer):
+            self.assertEqual(b'ab\n', await reader.readline())
+            self.assertEqual(b'cd\n', await reader.readline())
+            buf = bytearray(4)
+            self.assertEqual(4, await reader.readinto(buf))
+            self.assertEqual(b'efgh', buf)
+            self.assertEqual(b'ij', await reader.readline())
+            self.assertEqual(b'', await reader.read(1))
+        await server.stop()
+
+    async def test_connection_close_not_pooled(self):
+        server = await Server([
+            b'HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: 1\r\n\r\na',
+            b'HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\nb',
+        ]).start()
+        self.assertEqual(b'a', await self._get(server.url()))
+        self.assertEqual(b'b', await self._get(server.url()))
+        self.assertEqual(2, server.connections)
+        await server.stop()
+
+    async def test_stale_connection_retried(self):
+        # Server closes after each response despite allowing keep-alive
+        server = await Server([b'HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\na']).start()
+        self.assertEqual(b'a', await self._get(server.url()))
+        server.responses.append(b'HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\nb')
+        await asyncio.sleep(0.05)
+        self.assertEqual(b'b', await self._get(server.url()))
+        self.assertEqual(2, server.connections)
+        await server.stop()
+
+    async def test_post_not_resent_after_partial_response(self):
+        async def handle(reader, writer):
+            await reader.readuntil(b'\r\n\r\n')
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\na')
+            await reader.readuntil(b'\r\n\r\n')
+            posts.append(await reader.readexactly(2))
+            # Acted on, then dropped mid-response
+            writer.write(b'HTTP/1.1 2')
+            await writer.drain()
+            writer.close()
+        posts = []
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        uri = httpstream.parse_url(f'http://127.0.0.1:{server.sockets[0].getsockname()[1]}/')
+        response = await httpstream.request(uri, b'GET', b'/', pool=self.pool)
+        await response.reader.read()
+        response.close()
+        await response.wait_closed()
+        with self.assertRaises(Exception):
+            await httpstream.request(uri, b'POST', b'/', body=b'{}', pool=self.pool)
+        self.assertEqual([b'{}'], posts)
+        server.close()
+        await server.wait_closed()
+
+    async def test_post_retried_when_idle_connection_dropped(self):
+        server = await Server([b'HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\na']).start()
+        self.assertEqual(b'a', await self._get(server.url()))
+        server.responses.append(b'HTTP/1.1 201 Created\r\nContent-Length: 0\r\n\r\n')
+        await asyncio.sleep(0.05)
+        response = await httpstream.request(httpstream.parse_url(server.url()), b'POST', b'/', body=b'{}', pool=self.pool)
+        self.assertEqual(201, response.status)
+        response.close()
+        await response.wait_closed()
+        await server.stop()
+
+    async def test_post_body_and_error_status(self):
+        server = await Server([b'HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n']).start()
+        response = await httpstream.request(httpstream.parse_url(server.url()), b'POST', b'/x', (b'X-A: 1\r\n',), b'{}', self.pool)
+        self.assertEqual(404, response.status)
+        self.assertTrue(response.reader.done)
+        response.close()
+        await response.wait_closed()
+        self.assertEqual(b'{}', server.requests[1])
+        with self.assertRaises(Exception):
+            await httpstream.HttpRequest(server.url(), pool=self.pool, retries=0).get()
+        await server.stop()
+
+    async def test_conditional_get(self):
+        server = await Server([
+            b'HTTP/1.1 200 OK\r\nETag: "v1"\r\nLast-Modified: Wed, 21 Oct 2026 07:28:00 GMT\r\nContent-Length: 3\r\n\r\n[1]',
+            b'HTTP/1.1 304 Not Modified\r\nETag: "v1"\r\n\r\n',
+            b'HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\n[2]',
+        ]).start()
+        http_request = httpstream.HttpRequest(server.url(), pool=self.pool, conditional=True)
+        async with http_request.get_scoped() as (reader, writer):
+            self.assertEqual(b'[1]', await reader.read())
+        self.assertNotIn(b'If-None-Match', server.requests[0])
+        with self.assertRaises(httpstream.NotModified):
+            async with http_request.get_scoped() as (reader, writer):
+                self.fail('body of a 304')
+        self.assertIn(b'If-None-Match: "v1"\r\n', server.requests[1])
+        self.assertIn(b'If-Modified-Since: Wed, 21 Oct 2026 07:28:00 GMT\r\n', server.requests[1])
+        # The 304 left the connection reusable
+        async with http_request.get_scoped() as (reader, writer):
+            self.assertEqual(b'[2]', await reader.read())
+        self.assertEqual(1, server.connections)
+        await server.stop()
+
+    async def test_failed_body_forgets_validators(self):
+        server = await Server([
+            b'HTTP/1.1 200 OK\r\nETag: "v1"\r\nContent-Length: 3\r\n\r\n[1]',
+            b'HTTP/1.1 200 OK\r\nETag: "v2"\r\nContent-Length: 3\r\n\r\n[2]',
+            b'HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\n[3]',
+        ]).start()
+        http_request = httpstream.HttpRequest(server.url(), pool=self.pool, conditional=True)
+        async with http_request.get_scoped() as (reader, writer):
+            await reader.read()
+        with self.assertRaises(ValueError):
+            async with http_request.get_scoped() as (reader, writer):
+                raise ValueError()
+        self.assertIn(b'If-None-Match: "v1"', server.requests[1])
+        async with http_request.get_scoped() as (reader, writer):
+            await reader.read()
+        self.assertNotIn(b'If-None-Match', server.requests[2])
+        await server.stop()
+
+    async def test_unconditional_by_default(self):
+        server = await Server([
+            b'HTTP/1.1 200 OK\r\nETag: "v1"\r\nContent-Length: 1\r\n\r\na',
+            b'HTTP/1.1 200 OK\r\nETag: "v1"\r\nContent-Length: 1\r\n\r\na',
+        ]).start()
+        self.assertEqual(b'a', await self._get(server.url()))
+        self.assertEqual(b'a', await self._get(server.url()))
+        self.assertNotIn(b'If-None-Match', server.requests[1])
+        await server.stop()
+
+    async def test_compressed_json(self):
+        body = b'[' + b','.join(b'"story %i"' % i for i in range(200)) + b']\n'
+        deflated = zlib.compress(body)
+        gzipped = gzip.compress(body)
+        server = await Server([
+            b'HTTP/1.1 200 OK\r\nContent-Encoding: deflate\r\nContent-Length: %i\r\n\r\n%s' % (len(deflated), deflated),
+            b'HTTP/1.1 200 OK\r\nContent-Encoding: gzip\r\nTransfer-Encoding: chunked\r\n\r\n%x\r\n%s\r\n0\r\n\r\n' % (len(gzipped), gzipped),
+            b'HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\n[1]',
+        ]).start()
+        http_request = httpstream.HttpRequest(server.url(), pool=self.pool, compressed=True)
+        for _ in range(2):
+            async with http_request.get_scoped() as (reader, writer):
+                self.assertIsInstance(reader, httpstream.InflateReader)
+                stories = [story async for story in load_array(reader)]
+            self.assertEqual(['story %i' % i for i in range(200)], stories)
+        self.assertIn(b'Accept-Encoding: deflate, gzip\r\n', server.requests[0])
+        # Identity responses are passed through
+        async with http_request.get_scoped() as (reader, writer):
+            self.assertEqual(b'[1]', await reader.read())
+        self.assertEqual(1, server.connections)
+        await server.stop()
+
+    async def test_inflate_read_all(self):
+        server = await Server([
+            b'HTTP/1.1 200 OK\r\nContent-Encoding: deflate\r\nContent-Length: %i\r\n\r\n' % len(zlib.compress(b'x' * 5000)) + zlib.compress(b'x' * 5000),
+        ]).start()
+        async with httpstream.HttpRequest(server.url(), pool=self.pool, compressed=True).get_scoped() as (reader, writer):
+            self.assertEqual(b'x' * 5000, await reader.read())
+        await server.stop()
+
+    async def test_large_compressed_body_refetched_uncompressed(self):
+        # MicroPython: the compressed body would be buffered whole
+        self.addCleanup(setattr, httpstream, 'decompressobj', httpstream.decompressobj)
+        self.addCleanup(setattr, httpstream, 'deflate', httpstream.deflate)
+        httpstream.decompressobj = None
+        httpstream.deflate = object()
+        deflated = b'x' * (httpstream.MAX_BUFFERED_INFLATE + 1)
+        server = await Server([
+            b'HTTP/1.1 200 OK\r\nContent-Encoding: deflate\r\nContent-Length: %i\r\n\r\n%s' % (len(deflated), deflated),
+            b'HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\n[1]',
+            b'HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\n[2]',
+        ]).start()
+        http_request = httpstream.HttpRequest(server.url(), pool=self.pool, compressed=True)
+        async with http_request.get_scoped() as (reader, writer):
+            self.assertEqual(b'[1]', await reader.read())
+        async with http_request.get_scoped() as (reader, writer):
+            self.assertEqual(b'[2]', await reader.read())
+        self.assertIn(b'Accept-Encoding: deflate\r\n', server.requests[0])
+        self.assertNotIn(b'Accept-Encoding', server.requests[1])
+        self.assertNotIn(b'Accept-Encoding', server.requests[2])
+        await server.stop()
+
+    async def _serve(self, handler):
+        server = await asyncio.start_server(handler, '127.0.0.1', 0)
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        return f'http://127.0.0.1:{server.sockets[0].getsockname()[1]}/'
+
+    async def test_header_timeout(self):
+        async def stall(reader, writer):
+            await reader.readuntil(b'\r\n\r\n')
+            # Stall until the client gives up
+            await reader.read()
+            writer.close()
+        url = await self._serve(stall)
+        http_request = httpstream.HttpRequest(url, pool=self.pool, timeouts=httpstream.Timeouts(1000, 100, 100), retries=0)
+        # An OSError, so callers catching network errors (e.g. VideoDisplay) carry on
+        with self.assertRaises(httpstream.TimedOut):
+            await http_request.get()
+
+    async def test_cancelled_request_frees_slot(self):
+        async def stall(reader, writer):
+            await reader.readuntil(b'\r\n\r\n')
+            # Never answer
+            await reader.read()
+            writer.close()
+        url = await self._serve(stall)
+        uri = httpstream.parse_url(url)
+        key = (uri.hostname, uri.port, uri.secure)
+        for _ in range(self.pool.max_per_host + 1):
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(httpstream.request(uri, b'GET', b'/', pool=self.pool, timeouts=None), 0.1)
+            self.assertEqual(0, self.pool._active[key])
+        self.assertNotIn(key, self.pool._idle)
+
+    async def test_body_stall_times_out(self):
+        async def stall(reader, writer):
+            await reader.readuntil(b'\r\n\r\n')
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\nabc')
+            # Stall until the client gives up
+            await reader.read()
+            writer.close()
+        url = await self._serve(stall)
+        http_request = httpstream.HttpRequest(url, pool=self.pool, timeouts=httpstream.Timeouts(1000, 1000, 100))
+        with self.assertRaises(httpstream.TimedOut):
+            async with http_request.get_scoped() as (reader, writer):
+                self.assertEqual(b'abc', await reader.read(3))
+                await reader.read(7)
+
+    async def test_body_timeout_wakes_read_on_silent_stream(self):
+        # Like a MicroPython Stream: close() neither frees the socket nor
+        # wakes a pending read
+        class Stream:
+            def __init__(self):
+                self.calls = []
+            async def read(self, n):
+                await asyncio.Event().wait()
+            def close(self):
+                self.calls.append('close')
+            async def wait_closed(self):
+                self.calls.append('wait_closed')
+        stream = Stream()
+        key = ('stalled', 80, False)
+        self.pool._active[key] = 1
+        response = httpstream.Response(self.pool, key, stream, stream, 200, {'content-length': '10'}, 50)
+        with self.assertRaises(OSError):
+            await asyncio.wait_for(response.reader.read(5), 1)
+        self.assertTrue(response.reader.timed_out)
+        with self.assertRaises(OSError):
+            await response.reader.read(5)
+        response.close()
+        await response.wait_closed()
+        self.assertEqual('wait_closed', stream.calls[-1])
+        self.assertEqual(0, self.pool._active[key])
+        self.assertNotIn(key, self.pool._idle)
+
+    async def test_paced_reads_not_timed_out(self):
+        server = await Server([b'HTTP/1.1 200 OK\r\nContent-Length: 4\r\n\r\nabcd']).start()
+        http_request = httpstream.HttpRequest(server.url(), pool=self.pool, timeouts=httpstream.Timeouts(1000, 1000, 50))
+        async with http_request.get_scoped() as (reader, writer):
+            self.assertEqual(b'ab', await reader.read(2))
+            await asyncio.sleep(0.2)
+            self.assertEqual(b'cd', await reader.read(2))
+        await server.stop()
+
+    async def test_retries_server_error(self):
+        server = await Server([
+            b'HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n\r\n',
+            b'HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n\r\n',
+            b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok',
+        ]).start()
+        http_request = httpstream.HttpRequest(server.url(), pool=self.pool, backoff_ms=10)
+        async with http_request.get_scoped() as (reader, writer):
+            self.assertEqual(b'ok', await reader.read())
+        self.assertEqual(3, len(server.requests))
+        await server.stop()
+
+    async def test_circuit_breaker(self):
+        server = await asyncio.start_server(lambda r, w: None, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()
+        pool = httpstream.ConnectionPool(breaker_threshold=2, breaker_reset_ms=100)
+        http_request = httpstream.HttpRequest(f'http://127.0.0.1:{port}/', pool=pool, retries=1, backoff_ms=10)
+        with self.assertRaises(OSError) as error:
+            await http_request.get()
+        self.assertNotIsInstance(error.exception, httpstream.CircuitOpen)
+        # Two refused attempts open the breaker: no further connections
+        with self.assertRaises(httpstream.CircuitOpen):
+            await http_request.get()
+        await asyncio.sleep(0.15)
+        with self.assertRaises(OSError) as error:
+            await httpstream.request(http_request.uri, b'GET', b'/', pool=pool)
+        self.assertNotIsInstance(error.exception, httpstream.CircuitOpen)
+
+    async def test_dropped_connections_wait_closed(self):
+        class Writer:
+            def __init__(self):
+                self.calls = []
+            def close(self):
+                self.calls.append('close')
+            async def wait_closed(self):
+                self.calls.append('wait_closed')
+        server = await Server([b'HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\na']).start()
+        key = ('127.0.0.1', server.port, False)
+        stale, idle = Writer(), Writer()
+        self.pool._idle[key] = [(None, idle, 0), (None, stale, 0)]
+        self.pool.idle_timeout_ms = 0
+        self.assertEqual(b'a', await self._get(server.url()))
+        # Expired idle connections are torn down, not just closed
+        self.assertEqual(['close', 'wait_closed'], stale.calls)
+        self.assertEqual(['close', 'wait_closed'], idle.calls)
+        pooled = Writer()
+        self.pool._idle[key] = [(None, pooled, 0)]
+        await self.pool.close_idle()
+        self.assertEqual(['close', 'wait_closed'], pooled.calls)
+        await server.stop()
+
+    async def test_idle_connections_reaped(self):
+        pool = httpstream.ConnectionPool(idle_timeout_ms=50)
+        server = await Server([b'HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\na']).start()
+        async with httpstream.HttpRequest(server.url(), pool=pool).get_scoped() as (reader, writer):
+            await reader.read()
+        self.assertEqual(1, len(pool._idle[('127.0.0.1', server.port, False)]))
+        # Closed without the host being requested again
+        await asyncio.sleep(0.15)
+        self.assertEqual({}, pool._idle)
+        self.assertIsNone(pool._reaper)
+        await server.stop()
+
+    async def test_max_idle_across_hosts(self):
+        pool = httpstream.ConnectionPool(max_idle=1)
+        first = await Server([b'HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\na']).start()
+        second = await Server([b'HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\nb']).start()
+        for server in (first, second):
+            async with httpstream.HttpRequest(server.url(), pool=pool).get_scoped() as (reader, writer):
+                await reader.read()
+        # The older connection made way for the newer one
+        self.assertEqual([], pool._idle.get(('127.0.0.1', first.port, False), []))
+        self.assertEqual(1, len(pool._idle[('127.0.0.1', second.port, False)]))
+        await pool.close_idle()
+        await first.stop()
+        await second.stop()
+
+    async def test_max_per_host(self):
+        pool = httpstream.ConnectionPool(max_per_host=1)
+        server = await Server([
+            b'HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\na',
+            b'HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\nb',
+        ]).start()
+        uri = httpstream.parse_url(server.url())
+        first = await httpstream.request(uri, b'GET', b'/', pool=pool)
+        second = asyncio.create_task(httpstream.request(uri, b'GET', b'/', pool=pool))
+        await asyncio.sleep(0.05)
+        self.assertFalse(second.done())
+        self.assertEqual(b'a', await first.reader.read())
+        first.close()
+        second = await second
+        self.assertEqual(b'b', await second.reader.read())
+        second.close()
+        self.assertEqual(1, server.connections)
+        await pool.close_idle()
+        await server.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import sys
+import struct
+import unittest
+import os
+import tempfile
+# Add project root, infodisplay, cpython and tools to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../infodisplay')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../cpython')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../tools')))
+
+import iconcache
+import imageconvert
+
+class Target:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.bytes_per_pixel = 2
+        self._framebuffer = bytearray(width * height * 2)
+
+def _pixels(w, h):
+    return bytes((x * 11 + y * 5) & 0xFF if 2 <= x < w - 2 else 0 for y in range(h) for x in range(w * 2))
+
+class TestIconCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.raw = os.path.join(self.dir, 'raw.bin')
+        self.rle = os.path.join(self.dir, 'rle.bin')
+        pixels = _pixels(10, 6)
+        with open(self.raw, 'wb') as f:
+            f.write(struct.pack('<HH', 10, 6) + pixels)
+        with open(self.rle, 'wb') as f:
+            f.write(struct.pack('<HHBB', 10 | imageconvert.RLE_FLAG, 6, 2, 0))
+            f.write(imageconvert._rle_encode(pixels, 10, 6, 2))
+        self._budget = iconcache._icon_cache_budget
+        iconcache.clear_icon_cache()
+
+    def tearDown(self):
+        iconcache.set_icon_cache_budget(self._budget)
+        iconcache.clear_icon_cache()
+        for name in os.listdir(self.dir):
+            os.unlink(os.path.join(self.dir, name))
+        os.rmdir(self.dir)
+
+    def _draw(self, path, budget=32768, clip=None):
+        iconcache.set_icon_cache_budget(budget)
+        target = Target(30, 20)
+        rect = iconcache.draw_icon(target, 30, 20, path, 0, 0, 30, 20, clip)
+        self.assertEqual(rect, (10, 7, 10, 6))
+        return target._framebuffer
+
+    def test_cached_and_streamed_draws_match(self):
+        expected = self._draw(self.raw, budget=0)
+        self.assertEqual(iconcache.icon_cache_stats()[0], 0)
+        self.assertEqual(self._draw(self.raw), expected)
+        self.assertEqual(self._draw(self.rle, budget=0), expected)
+        self.assertEqual(self._draw(self.rle), expected)
+        clip = (12, 8, 5, 3)
+        self.assertEqual(self._draw(self.rle, clip=clip), self._draw(self.raw, budget=0, clip=clip))
+
+    def test_hit_skips_the_file(self):
+        expected = self._draw(self.rle)
+        os.unlink(self.rle)
+        self.assertEqual(self._draw(self.rle), expected)
+        entries, nbytes, hits, misses = iconcache.icon_cache_stats()
+        self.assertEqual((entries, nbytes, hits, misses), (1, 120, 1, 1))
+
+    def test_budget_evicts_least_recently_used(self):
+        self._draw(self.raw, budget=240)
+        self._draw(self.rle, budget=240)
+        self._draw(self.raw, budget=240)
+        iconcache.set_icon_cache_budget(200)
+        self.assertEqual(list(iconcache._ICON_CACHE), [self.raw])
+
+    def test_missing_file_raises(self):
+        with self.assertRaises(OSError):
+            iconcache.draw_icon(Target(4, 4), 4, 4, os.path.join(self.dir, 'none.bin'), 0, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
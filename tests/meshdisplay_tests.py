@@ -0,0 +1,69 @@
+import sys
+import math
+import unittest
+import os
+# Add project root, infodisplay and cpython to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../infodisplay')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../cpython')))
+
+import meshdisplay
+from drawing import Drawing
+
+CUBE_VERTS = [[-1, -1, -1], [1, -1, -1], [1, 1, -1], [-1, 1, -1],
+              [-1, -1, 1], [1, -1, 1], [1, 1, 1], [-1, 1, 1]]
+CUBE_FACES = [[0, 1, 2, 3], [4, 5, 6, 7], [0, 1, 5, 4],
+              [2, 3, 7, 6], [0, 3, 7, 4], [1, 2, 6, 5]]
+
+def _reference(v, angle, width, height):
+    # The float pipeline the fixed-point one replaces
+    s, c = math.sin(angle), math.cos(angle)
+    x = v[0] * c - v[2] * s
+    z = v[0] * s + v[2] * c
+    y = v[1] * c - z * s
+    z2 = v[1] * s + z * c
+    d = 256 / (z2 + 4)
+    return x * d + width // 2, -y * d + height // 2, z2
+
+class TestMesh(unittest.TestCase):
+    def test_projection_matches_float_pipeline(self):
+        drawing = Drawing(320, 240)
+        display = meshdisplay.MeshDisplay(drawing, CUBE_VERTS, CUBE_FACES)
+        mesh = display.mesh
+        for angle in (0.0, 0.4, 2.5, 5.0):
+            meshdisplay.draw_mesh(drawing, angle, mesh, display.colors, display.edge_color)
+            for i, v in enumerate(CUBE_VERTS):
+                px, py, _ = _reference(v, angle, 320, 240)
+                self.assertLessEqual(abs(mesh.screen[i * 3] - px), 1.5)
+                self.assertLessEqual(abs(mesh.screen[i * 3 + 1] - py), 1.5)
+            # Farthest first
+            depths = [mesh.depth[t] for t in mesh.order]
+            self.assertEqual(depths, sorted(depths, reverse=True))
+
+    def test_anti_aliased_edges(self):
+        drawing = Drawing(320, 240)
+        display = meshdisplay.MeshDisplay(drawing, CUBE_VERTS, CUBE_FACES, edge_width=2)
+        meshdisplay.draw_mesh(drawing, 0.4, display.mesh, display.colors, display.edge_color, display.edge_width)
+        screen = display.mesh.screen
+        for i in range(len(CUBE_VERTS)):
+            self.assertEqual(drawing.fb.pixel(screen[i * 3], screen[i * 3 + 1]), 0xFFFF)
+
+    def test_triangle_fill(self):
+        drawing = Drawing(20, 20)
+        fb = meshdisplay._as_ptr8(drawing)
+        # (2, 2), (17, 2), (2, 17): lower left half of the square
+        meshdisplay._fill_triangle(fb, 20, 20, 2, 2, 2, 17, 2 << 16, 17 << 16,
+                                   0, -1 << 16, -1 << 16, 0xF800)
+        self.assertEqual(drawing.fb.pixel(2, 2), 0xF800)
+        self.assertEqual(drawing.fb.pixel(16, 2), 0xF800)
+        self.assertEqual(drawing.fb.pixel(2, 16), 0xF800)
+        self.assertEqual(drawing.fb.pixel(16, 16), 0)
+        self.assertEqual(drawing.fb.pixel(1, 10), 0)
+        # Off-screen triangles clip rather than write out of bounds
+        meshdisplay._fill_triangle(fb, 20, 20, 2, -30, -5, 40, -50 << 16, 60 << 16,
+                                   0, 8 << 16, -2 << 16, 0x001F)
+        self.assertEqual(len(drawing._framebuffer), 800)
+
+
+if __name__ == '__main__':
+    unittest.main()
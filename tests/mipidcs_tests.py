@@ -1,4 +1,5 @@
 import sys
+import asyncio
 import unittest
 import os
 from unittest.mock import MagicMock, patch
@@ -92,6 +93,38 @@ class TestMipiDcs(unittest.TestCase):
         ctrl.write_cd(b"\x2a", b"\x00\x10\x01\x3f")
         self.assertEqual(written, [b"\x2a", b"\x00", b"\x10", b"\x01", b"\x3f"])
 
+    def test_window_cache_skips_unchanged_caset_raset(self):
+        written = []
+        mock_spi = MagicMock()
+        mock_spi.write.side_effect = lambda buf: written.append(bytes(buf))
+        ctrl = mipidcs.SpiController(mock_spi, MagicMock(), MagicMock(), chunked_data=False)
+
+        ctrl.begin_write(0, 9, 20, 29)
+        ctrl.end_data()
+        self.assertEqual(written, [b"\x2a", b"\x00\x00\x00\x09", b"\x2b", b"\x00\x14\x00\x1d", b"\x2c"])
+
+        # Same rows, new columns (next weather column): RASET is skipped
+        written.clear()
+        ctrl.begin_write(10, 19, 20, 29)
+        self.assertEqual(written, [b"\x2a", b"\x00\x0a\x00\x13", b"\x2c"])
+
+        written.clear()
+        ctrl.begin_write(10, 19, 20, 29)
+        self.assertEqual(written, [b"\x2c"])
+
+        # Any other command may have moved the window: resend both
+        ctrl.write_cd(b"\x36", b"\x48")
+        written.clear()
+        ctrl.begin_write(10, 19, 20, 29)
+        self.assertEqual(len(written), 5)
+
+    def test_begin_write_bulk_single_cs_frame(self):
+        cs_calls = []
+        ctrl = mipidcs.SpiController(MagicMock(), MagicMock(), cs_calls.append, chunked_data=False)
+        ctrl.begin_write(0, 9, 0, 9)
+        ctrl.end_data()
+        self.assertEqual(cs_calls, [1, 0, 1])
+
     def test_rgb332_lut_matches_bit_math(self):
         # The LUT-driven converter must reproduce the original per-pixel
         # bit-expansion formulas exactly, for every RGB332 code
@@ -106,6 +139,28 @@ class TestMipiDcs(unittest.TestCase):
             self.assertEqual((out[c * 3], out[c * 3 + 1], out[c * 3 + 2]), (r, g, b),
                              'code %d' % c)
 
+    def test_lines_converters_match_line_converters(self):
+        # 7 of 8 pixels per row: each row runs the unrolled loop once and
+        # the tail loop three times, and must match the per-line output
+        lut = bytearray(i * 7 & 0xFF for i in range(768))
+        src8 = bytearray((i * 37) & 0xFF for i in range(24))
+        src16 = memoryview(bytearray((i * 91) & 0xFF for i in range(48))).cast('H')
+        cases = [
+            (mipidcs._rgb565_to_888_lines, mipidcs._rgb565_to_888_line, src16, 3),
+            (mipidcs._rgb565_swap_lines, mipidcs._rgb565_swap_line, src16, 1),
+            (mipidcs._rgb332_to_888_lines, mipidcs._rgb332_to_888_line, src8, 3),
+            (mipidcs._rgb332_to_565_lines, mipidcs._rgb332_to_565_line, src8, 2),
+        ]
+        for lines_conv, line_conv, src, per_pixel in cases:
+            out = [0] * (3 * 7 * per_pixel)
+            lines_conv(out, src, 1, 8, 7, 3, lut)
+            expected = []
+            for y in range(3):
+                line = [0] * (7 * per_pixel)
+                line_conv(line, src, y * 8 + 1, 7, lut)
+                expected += line
+            self.assertEqual(out, expected, lines_conv.__name__)
+
     def test_render_spi_dma_double_buffer(self):
         # With a DMA writer present, lines 0..N-2 must go out via DMA in
         # order and the final line via blocking spi.write, with no line
@@ -139,6 +194,75 @@ class TestMipiDcs(unittest.TestCase):
         self.assertEqual(sent, [('dma', line(0)), ('dma', line(1)),
                                 ('dma', line(2)), ('spi', line(3))])
 
+    def test_render_spi_dma_scaled(self):
+        # Scaled lines are converted once and repeated `scale` times, the
+        # last repeat of the last line via blocking spi.write
+        mock_spi = MagicMock()
+        disp = mipidcs.MipiDisplay(mock_spi, MagicMock(), MagicMock(), None,
+                                   4, 4, 2, 'RGB332', 3)
+        disp._linebuf2 = bytearray(len(disp._linebuf))
+        sent = []
+
+        class FakeDma:
+            def start(self, buf, length):
+                sent.append(('dma', bytes(buf[:length])))
+            def wait(self):
+                pass
+
+        disp._spi_dma = FakeDma()
+        mock_spi.write.side_effect = lambda b: sent.append(('spi', bytes(b)))
+
+        lut = mipidcs.build_rgb332_888_lut()
+        fb = bytearray([0x00, 0xFF, 0xE0, 0x03])  # 2x2 framebuffer
+        disp._render_spi(fb, 2, 0, 2, 2, 2, 3, lut, mipidcs._rgb332_to_888_upscale_line)
+
+        line0 = b'\x00' * 6 + b'\xff' * 6
+        line1 = b'\xff\x00\x00' * 2 + b'\x00\x00\xff' * 2
+        self.assertEqual(sent, [('dma', line0), ('dma', line0),
+                                ('dma', line1), ('spi', line1)])
+
+    def test_render_stats(self):
+        disp = mipidcs.MipiDisplay(MagicMock(), MagicMock(), MagicMock(), None,
+                                   4, 4, 1, 'RGB332', 3)
+        disp._render_rect = lambda fb, width, x, y, rw, rh: None
+        disp.render(bytearray(16), 4, 4, (0, 0, 4, 4))
+        disp.render(bytearray(16), 4, 4, (0, 0, 4, 4))
+        self.assertEqual(disp.get_render_stats(reset=True)[0], 2)
+        self.assertEqual(disp.get_render_stats()[0], 0)
+
+    def test_render_spi_dma_batched_lines(self):
+        # With room for two lines per buffer, each DMA transfer carries
+        # two packed lines and the remainder goes out via spi.write
+        mock_spi = MagicMock()
+        disp = mipidcs.MipiDisplay(mock_spi, MagicMock(), MagicMock(), None,
+                                   4, 5, 1, 'RGB332', 3)
+        disp._linebuf = bytearray(24)
+        disp._linebuf2 = bytearray(24)
+        disp._get_block_conv = lambda: mipidcs._rgb332_to_888_lines
+        sent = []
+
+        class FakeDma:
+            def start(self, buf, length):
+                sent.append(('dma', bytes(buf[:length])))
+            def wait(self):
+                pass
+
+        disp._spi_dma = FakeDma()
+        mock_spi.write.side_effect = lambda b: sent.append(('spi', bytes(b)))
+
+        lut = mipidcs.build_rgb332_888_lut()
+        fb = bytearray(range(20))  # 4x5 framebuffer, pixel value = index
+        # 3-pixel-wide rect starting at column 1
+        disp._render_spi(fb, 4, 1, 3, 5, 1, 3, lut, None)
+
+        def rows(*ys):
+            out = bytearray(len(ys) * 9)
+            mipidcs._rgb332_to_888_lines(out, fb, ys[0] * 4 + 1, 4, 3, len(ys), lut)
+            return bytes(out)
+
+        self.assertEqual(sent, [('dma', rows(0, 1)), ('dma', rows(2, 3)), ('spi', rows(4))])
+        self.assertEqual(rows(0)[:3], bytes(lut[3:6]))
+
     def test_render_spi_without_dma_unchanged(self):
         # No DMA writer: every line goes out via blocking spi.write
         mock_spi = MagicMock()
@@ -159,6 +283,100 @@ class TestMipiDcs(unittest.TestCase):
         self.assertEqual(written[0][:3], b'\x00\x00\x00')
         self.assertEqual(written[2][:3], b'\x08\x08\x08')
 
+    def test_render_spi_rgb888_passthrough(self):
+        # RGB888 source on a 3-byte panel: rows go out without conversion,
+        # full-width rects as a single write
+        mock_spi = MagicMock()
+        disp = mipidcs.MipiDisplay(mock_spi, MagicMock(), MagicMock(), None,
+                                   4, 3, 1, 'RGB888', 3)
+        written = []
+        mock_spi.write.side_effect = lambda b: written.append(bytes(b))
+        fb = bytearray(range(36))
+
+        def conv(*args):
+            raise AssertionError('converter called')
+
+        disp._render_spi(fb, 4, 0, 4, 3, 1, 3, None, conv)
+        self.assertEqual(written, [bytes(fb)])
+
+        written.clear()
+        disp._render_spi(fb, 4, 4 + 1, 2, 2, 1, 3, None, conv)
+        self.assertEqual(written, [bytes(fb[15:21]), bytes(fb[27:33])])
+
+    def test_tile_cache_skips_unchanged_tiles(self):
+        disp = mipidcs.MipiDisplay(MagicMock(), MagicMock(), MagicMock(), None,
+                                   8, 8, 1, 'RGB332', 3)
+        disp.set_tile_cache(4)
+        sent = []
+        disp._render_rect = lambda fb, width, x, y, rw, rh: sent.append((x, y, rw, rh))
+        fb = bytearray(64)
+
+        # First push: every tile is unknown, and the two bands' identical
+        # runs merge vertically into a single window
+        disp.render(fb, 8, 8, (0, 0, 8, 8))
+        self.assertEqual(sent, [(0, 0, 8, 8)])
+
+        sent.clear()
+        disp.render(fb, 8, 8, (0, 0, 8, 8))
+        self.assertEqual(sent, [])
+
+        # One changed pixel resends only its tile
+        fb[6 * 8 + 5] = 0xFF
+        disp.render(fb, 8, 8, (0, 0, 8, 8))
+        self.assertEqual(sent, [(4, 4, 4, 4)])
+
+        # A bbox cutting through a tile still sends the whole tile
+        sent.clear()
+        fb[1 * 8 + 1] = 0xFF
+        disp.render(fb, 8, 8, (0, 0, 2, 2))
+        self.assertEqual(sent, [(0, 0, 4, 4)])
+
+        sent.clear()
+        disp.invalidate_tiles()
+        disp.render(fb, 8, 8, (4, 0, 4, 8))
+        self.assertEqual(sent, [(4, 0, 4, 8)])
+
+    def test_tile_cache_partial_edge_tiles(self):
+        # 6x5 framebuffer with 4px tiles: right and bottom tiles are partial
+        disp = mipidcs.MipiDisplay(MagicMock(), MagicMock(), MagicMock(), None,
+                                   6, 5, 1, 'RGB565', 2)
+        disp.set_tile_cache(4)
+        sent = []
+        disp._render_rect = lambda fb, width, x, y, rw, rh: sent.append((x, y, rw, rh))
+        fb = bytearray(6 * 5 * 2)
+        disp.render(fb, 6, 5, (0, 0, 6, 5))
+        self.assertEqual(sent, [(0, 0, 6, 5)])
+
+        sent.clear()
+        fb[(4 * 6 + 5) * 2] = 1
+        disp.render(fb, 6, 5, (0, 0, 6, 5))
+        self.assertEqual(sent, [(4, 4, 2, 1)])
+
+    def test_render_async_resumes_with_ramwc(self):
+        # Batches after the first continue the window with RAMWC, and a
+        # sync render arriving mid-push is deferred until the end
+        disp = mipidcs.MipiDisplay(MagicMock(), MagicMock(), MagicMock(), None,
+                                   4, 5, 1, 'RGB332', 3)
+        disp._window_coords = lambda x, y, rw, rh: (x, x + rw - 1, y, y + rh - 1)
+        disp._get_line_conv = lambda scale: (lambda dest, src, off, px, lut: None)
+        events = []
+        disp._spi_ctrl.begin_write = lambda xs, xe, ys, ye: events.append(b'\x2c')
+        disp._spi_ctrl.resume_write = lambda: events.append(b'\x3c')
+        fb = bytearray(20)
+
+        async def interloper():
+            # Runs at render_async's first yield
+            disp.render(fb, 4, 5, (0, 0, 1, 1))
+            events.append('sync')
+
+        async def run():
+            await asyncio.gather(disp.render_async(fb, 4, 5, (0, 0, 4, 5), lines_per_yield=2),
+                                 interloper())
+
+        asyncio.run(run())
+        self.assertEqual(events, [b'\x2c', 'sync', b'\x3c', b'\x3c', b'\x2c'])
+        self.assertFalse(disp._async_active)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,76 @@
+import sys
+import unittest
+import os
+# Add project root, infodisplay and cpython to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../infodisplay')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../cpython')))
+
+import raster
+from drawing import Drawing
+
+def _red(drawing, x, y):
+    # Red channel of an RGB888 pixel
+    return drawing._framebuffer[(y * drawing.width + x) * 3]
+
+class TestRaster(unittest.TestCase):
+    def test_disc_matches_ellipse_extent(self):
+        drawing = Drawing(21, 21, 'RGB888')
+        raster.disc(drawing, 10, 10, 6, 0xFF0000)
+        self.assertEqual(_red(drawing, 10, 10), 0xFF)
+        self.assertEqual(_red(drawing, 16, 10), 0xFF)
+        self.assertEqual(_red(drawing, 17, 10), 0)
+        self.assertEqual(_red(drawing, 10, 3), 0)
+        # Diagonal edge is partially covered
+        self.assertTrue(0 < _red(drawing, 15, 14) < 0xFF)
+        self.assertEqual(drawing.get_damage(), [(2, 2, 17, 17)])
+
+    def test_ring_leaves_hole(self):
+        drawing = Drawing(21, 21, 'RGB888')
+        raster.ring(drawing, 10, 10, 8, 4, 0xFF0000)
+        self.assertEqual(_red(drawing, 10, 10), 0)
+        self.assertEqual(_red(drawing, 14, 10), 0)
+        self.assertEqual(_red(drawing, 16, 10), 0xFF)
+        self.assertEqual(_red(drawing, 10, 18), 0xFF)
+        self.assertEqual(_red(drawing, 10, 19), 0)
+
+    def test_rounded_rect(self):
+        drawing = Drawing(20, 12, 'RGB888')
+        raster.rounded_rect(drawing, 2, 1, 16, 10, 4, 0xFF0000)
+        for x in range(20):
+            self.assertEqual(_red(drawing, x, 6), 0xFF if 2 <= x <= 17 else 0, x)
+        for y in range(12):
+            self.assertEqual(_red(drawing, 9, y), 0xFF if 1 <= y <= 10 else 0, y)
+        self.assertEqual(_red(drawing, 2, 1), 0)
+        self.assertLess(_red(drawing, 3, 2), 0xFF)
+        # Square corners when the radius is 0
+        drawing = Drawing(20, 12, 'RGB888')
+        raster.rounded_rect(drawing, 2, 1, 16, 10, 0, 0xFF0000)
+        self.assertEqual(_red(drawing, 2, 1), 0xFF)
+        self.assertEqual(_red(drawing, 1, 1), 0)
+
+    def test_polygon_either_winding(self):
+        expected = None
+        for pts in ((2, 2, 17, 2, 9, 14), (9, 14, 17, 2, 2, 2)):
+            drawing = Drawing(20, 16)
+            drawing.fill(0x0000FF)
+            raster.polygon(drawing, pts, 0xFFFF00)
+            self.assertEqual(drawing.fb.pixel(9, 6), drawing.pack(0xFFFF00))
+            self.assertEqual(drawing.fb.pixel(2, 10), drawing.pack(0x0000FF))
+            if expected is None:
+                expected = bytes(drawing._framebuffer)
+            self.assertEqual(bytes(drawing._framebuffer), expected)
+
+    def test_polygon_vertex_limit(self):
+        with self.assertRaises(ValueError):
+            raster.polygon(Drawing(4, 4), (0, 0, 1, 1), 0xFFFFFF)
+
+    def test_gs8_blend(self):
+        drawing = Drawing(12, 12, 'GS8')
+        raster.disc(drawing, 5, 5, 3, 0xFFFFFF)
+        self.assertEqual(drawing._framebuffer[5 * 12 + 5], 0xFF)
+        self.assertEqual(drawing._framebuffer[0], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import sys
+import math
+import unittest
+import os
+# Add project root, infodisplay and cpython to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../infodisplay')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../cpython')))
+
+from solarsystemdisplay import SolarSystemDisplay
+from drawing import Drawing
+
+class TestSolarSystem(unittest.TestCase):
+    def _full(self, day):
+        drawing = Drawing(320, 240)
+        display = SolarSystemDisplay(drawing, 70)
+        display._build_orbits()
+        display._draw_all(display._ephemeris(day), day)
+        return display, drawing
+
+    def test_ephemeris_cached_per_day(self):
+        display, _ = self._full(9000)
+        eph = display._ephemeris(9000)
+        self.assertIs(display._ephemeris(9000), eph)
+        self.assertEqual(eph.typecode, 'h')
+        self.assertEqual(len(eph), 4 * len(display._bodies))
+
+    def test_redraw_moved_matches_full_draw(self):
+        for day in (9000, 9137, 9500):
+            display, drawing = self._full(day)
+            display._redraw_moved(day + 1)
+            _, expected = self._full(day + 1)
+            self.assertEqual(drawing._framebuffer, expected._framebuffer, day)
+
+    def test_orbit_runs_match_dots(self):
+        drawing = Drawing(320, 240)
+        display = SolarSystemDisplay(drawing, 70)
+        display._build_orbits()
+        eph = display._ephemeris(9000)
+        display._draw_orbits(eph)
+        expected = Drawing(320, 240)
+        for i, body in enumerate(display._bodies):
+            if not display._visible(i, eph):
+                continue
+            steps = 40 if i >= display._comet_start else 60
+            color = 0x212021 if i >= display._comet_start else display.orbit_color
+            for k in range(steps):
+                v = display._solve_kepler(k / steps * 2 * math.pi, body['e'])
+                r = display._get_orbital_radius(body['a'], body['e'], v)
+                px, py = display._project_to_screen(*display._to_heliocentric_coords(r, v, body['node'], body['i'], body['arg_p']))
+                if 70 <= py < 240:
+                    expected.rect(px, py, 2, 2, color, True)
+        self.assertEqual(drawing._framebuffer, expected._framebuffer)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import sys
+import unittest
+import os
+import tempfile
+# Add project root, infodisplay, cpython and tools to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../infodisplay')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../cpython')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../tools')))
+
+import iconcache
+import imageconvert
+from spritesheet import SpriteSheet
+
+class Target:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.bytes_per_pixel = 2
+        self._framebuffer = bytearray(width * height * 2)
+
+def _image(name, w, h, seed):
+    return (name, w, h, [((x * seed) & 0xFF, (y * 40) & 0xFF, seed * 20) for y in range(h) for x in range(w)])
+
+IMAGES = [_image('sun', 8, 5, 9), _image('rain', 6, 7, 3)]
+
+class TestSpriteSheet(unittest.TestCase):
+    def setUp(self):
+        self.paths = []
+        self._budget = iconcache._icon_cache_budget
+        iconcache.clear_icon_cache()
+
+    def tearDown(self):
+        iconcache.set_icon_cache_budget(self._budget)
+        iconcache.clear_icon_cache()
+        for path in self.paths:
+            os.unlink(path)
+
+    def _sheet(self, rle):
+        with tempfile.NamedTemporaryFile('wb', suffix='.bundle', delete=False) as f:
+            f.write(imageconvert.build_bundle(IMAGES, 'rgb565', rle))
+        self.paths.append(f.name)
+        sheet = SpriteSheet(f.name)
+        self.addCleanup(sheet.close)
+        return sheet
+
+    def _expected(self, name, x, y, sx=0, sy=0, sw=None, sh=None):
+        target = Target(20, 12)
+        _, w, h, pixels = next(i for i in IMAGES if i[0] == name)
+        data = imageconvert._encode_pixels(pixels, 'rgb565')
+        sw = w - sx if sw is None else sw
+        sh = h - sy if sh is None else sh
+        for r in range(sh):
+            o = ((sy + r) * w + sx) * 2
+            d = ((y + r) * 20 + x) * 2
+            target._framebuffer[d:d + sw * 2] = data[o:o + sw * 2]
+        return target._framebuffer
+
+    def test_index(self):
+        sheet = self._sheet(False)
+        self.assertEqual(sorted(sheet.names()), ['rain', 'sun'])
+        self.assertEqual(sheet.info('rain'), (6, 7, 2, False))
+        self.assertNotIn('snow', sheet)
+
+    def test_draw_whole_and_part(self):
+        for rle in (False, True):
+            sheet = self._sheet(rle)
+            for name in ('sun', 'rain'):
+                target = Target(20, 12)
+                sheet.draw(target, 20, 12, name, 3, 2)
+                self.assertEqual(target._framebuffer, self._expected(name, 3, 2), (rle, name))
+            target = Target(20, 12)
+            sheet.draw(target, 20, 12, 'sun', 1, 1, 2, 1, 4, 3)
+            self.assertEqual(target._framebuffer, self._expected('sun', 1, 1, 2, 1, 4, 3), rle)
+
+    def test_draw_sprite_caches(self):
+        iconcache.set_icon_cache_budget(32768)
+        sheet = self._sheet(True)
+        target = Target(20, 12)
+        rect = iconcache.draw_sprite(target, 20, 12, sheet, 'rain', 0, 0, 20, 12)
+        self.assertEqual(rect, (7, 2, 6, 7))
+        iconcache.draw_sprite(target, 20, 12, sheet, 'rain', 0, 0, 20, 12)
+        self.assertEqual(target._framebuffer, self._expected('rain', 7, 2))
+        self.assertEqual(iconcache.icon_cache_stats()[2:], (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -59,8 +59,8 @@ class TestDisplay(MipiDisplay):
             pass
         return dummy_conv
     
-    def _set_region_window(self, x, y, rw, rh):
-        pass
+    def _window_coords(self, x, y, rw, rh):
+        return x, x + rw - 1, y, y + rh - 1
 
 def test_mpi_render_performance(benchmark):
     """
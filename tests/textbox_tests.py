@@ -0,0 +1,91 @@
+import sys
+import io
+import asyncio
+import unittest
+import os
+import tempfile
+# Add project root, infodisplay and cpython to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../infodisplay')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../cpython')))
+
+import textbox
+from bmfont import BMFont
+from drawing import Drawing
+
+# Three 6x8 glyphs side by side in a 32x8 GS8 atlas
+FNT = """common lineHeight=10 base=8 scaleW=32 scaleH=8 pages=1
+page id=0 file="test_0.bin"
+chars count=3
+char id=97 x=0 y=0 width=6 height=8 xoffset=0 yoffset=1 xadvance=7 page=0
+char id=98 x=6 y=0 width=6 height=8 xoffset=0 yoffset=0 xadvance=7 page=0
+char id=99 x=12 y=0 width=6 height=8 xoffset=1 yoffset=0 xadvance=7 page=0
+"""
+ATLAS = b'\x20\x00\x08\x00' + bytes((x * 7 + y * 13) & 0xFF for y in range(8) for x in range(32))
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.fnt', delete=False) as f:
+            f.write(FNT)
+        font = BMFont.load(f.name)
+        os.unlink(f.name)
+        textbox._BM_FONT_CACHE['test'] = (font, [io.BytesIO(ATLAS)])
+        self._budget = textbox._text_cache_budget
+        textbox.clear_text_cache()
+
+    def tearDown(self):
+        textbox._BM_FONT_CACHE.pop('test', None)
+        textbox.set_text_cache_budget(self._budget)
+        textbox.clear_text_cache()
+
+    def _draw(self, text, x=5, budget=16384, **kwargs):
+        textbox.set_text_cache_budget(budget)
+        drawing = Drawing(60, 20)
+        asyncio.run(textbox.draw_textbox(drawing, text, x, 3, 40, 12, color=0xFFCC00, font='test', **kwargs))
+        return drawing
+
+    def test_cached_run_matches_direct_draw(self):
+        for align in ('left', 'center', 'right'):
+            expected = bytes(self._draw('abc', align=align, budget=0)._framebuffer)
+            self._draw('abc', align=align)  # miss: renders the sprite
+            drawing = self._draw('abc', align=align)  # hit
+            self.assertEqual(bytes(drawing._framebuffer), expected, align)
+        entries, nbytes, hits, misses = textbox.text_cache_stats()
+        self.assertEqual((hits, misses), (3, 3))
+
+    def test_hit_blits_at_new_position(self):
+        self._draw('ab', x=0)
+        drawing = self._draw('ab', x=15)
+        self.assertEqual(bytes(drawing._framebuffer), bytes(self._draw('ab', x=15, budget=0)._framebuffer))
+        self.assertEqual(textbox.text_cache_stats()[2], 1)
+
+    def test_blend_keeps_background_and_skips_cache(self):
+        textbox.set_text_cache_budget(16384)
+        drawing = Drawing(60, 20)
+        drawing.rect(0, 0, 60, 20, 0x404040, True)
+        grey = drawing.pack(0x404040)
+        asyncio.run(textbox.draw_textbox(drawing, 'abc', 5, 3, 40, 12, color=0xFFCC00,
+                                         font='test', blend=True))
+        self.assertEqual(textbox.text_cache_stats()[0], 0)
+        fb = drawing.fb
+        pixels = [fb.pixel(x, y) for y in range(20) for x in range(60)]
+        # Nothing is darker than the background it was drawn over
+        self.assertNotIn(0, pixels)
+        self.assertGreater(sum(1 for p in pixels if p != grey), 0)
+
+    def test_budget_evicts_least_recently_used(self):
+        self._draw('a')
+        size = textbox.text_cache_stats()[1]
+        budget = size * 4  # room for four single-glyph sprites
+        for text, align in (('a', 'left'), ('b', 'left'), ('c', 'left'), ('a', 'right'),
+                            ('a', 'left'), ('b', 'right')):
+            self._draw(text, budget=budget, align=align)
+            self.assertLessEqual(textbox.text_cache_stats()[1], budget)
+        keys = [(k[1], k[6]) for k in textbox._TEXT_CACHE]
+        # ('a', 'left') was reused, so ('b', 'left') was the oldest
+        self.assertIn(('a', 'left'), keys)
+        self.assertNotIn(('b', 'left'), keys)
+        self.assertIn(('b', 'right'), keys)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,78 @@ import sys
 import os
 import glob
 
-def convert_image(input_path, output_path, fmt='rgb24'):
+_FORMAT_BPP = {'rgb8': 1, 'gs8': 1, 'rgb565': 2, 'rgb565be': 2, 'rgb24': 3, 'bgra8888': 4}
+
+# RLE variant: the header width has RLE_FLAG set and is followed by the
+# bytes per pixel and a pad byte; each row is then packed on its own.
+# A control byte c >= 0x80 repeats the next pixel (c & 0x7F) + 1 times,
+# c < 0x80 is followed by c + 1 literal pixels. Decoded on the device by
+# bitblt.blit_rle.
+RLE_FLAG = 0x8000
+
+def _rle_encode(data, width, height, bpp):
+    out = bytearray()
+    row_bytes = width * bpp
+    for y in range(height):
+        row = data[y * row_bytes:(y + 1) * row_bytes]
+        px = [bytes(row[i * bpp:(i + 1) * bpp]) for i in range(width)]
+        i = 0
+        while i < width:
+            run = 1
+            while i + run < width and run < 128 and px[i + run] == px[i]:
+                run += 1
+            if run >= 2:
+                out.append(0x80 | (run - 1))
+                out.extend(px[i])
+                i += run
+                continue
+            # Literal until the next repeat (or 128 pixels)
+            j = i + 1
+            while j < width and j - i < 128 and not (j + 1 < width and px[j + 1] == px[j]):
+                j += 1
+            out.append(j - i - 1)
+            for p in px[i:j]:
+                out.extend(p)
+            i = j
+    return bytes(out)
+
+def _rle_decode(data, width, height, bpp):
+    out = bytearray()
+    i = 0
+    for _ in range(height):
+        end = len(out) + width * bpp
+        while len(out) < end:
+            c = data[i]
+            if c & 0x80:
+                out.extend(data[i + 1:i + 1 + bpp] * ((c & 0x7F) + 1))
+                i += 1 + bpp
+            else:
+                n = (c + 1) * bpp
+                out.extend(data[i + 1:i + 1 + n])
+                i += 1 + n
+    return bytes(out)
+
+def _write_bin(f, width, height, encoded, fmt, rle):
+    if rle:
+        bpp = _FORMAT_BPP[fmt]
+        f.write(struct.pack('<HHBB', width | RLE_FLAG, height, bpp, 0))
+        f.write(_rle_encode(encoded, width, height, bpp))
+    else:
+        f.write(struct.pack('<HH', width, height))
+        f.write(encoded)
+
+def _read_bin(f):
+    """Return (width, height, raw pixel bytes), expanding RLE files."""
+    width, height = struct.unpack('<HH', f.read(4))
+    if width & RLE_FLAG:
+        width &= ~RLE_FLAG
+        bpp = f.read(2)[0]
+        return width, height, _rle_decode(f.read(), width, height, bpp)
+    return width, height, f.read()
+
+def _load_image(input_path):
+    """Return (width, height, RGB pixels), cropped to the opaque area and
+    composited over black."""
     from PIL import Image
     img = Image.open(input_path).convert('RGBA')
     # Find bounding box of non-transparent pixels BEFORE compositing
@@ -17,52 +88,40 @@ def convert_image(input_path, output_path, fmt='rgb24'):
     width, height = img.size
 
     # Get RGB pixels (no alpha)
-    pixels = list(img.convert('RGB').getdata())
+    return width, height, list(img.convert('RGB').getdata())
 
+def convert_image(input_path, output_path, fmt='rgb24', rle=False):
+    width, height, pixels = _load_image(input_path)
+    # rgb8: RGB332; gs8: luma ~ Rec.601; rgb565/rgb565be: little/big-endian;
+    # rgb24: 8 bits per channel; bgra8888: BGRA with alpha=255
+    encoded = _encode_pixels(pixels, fmt)
     with open(output_path, 'wb') as f:
-        f.write(struct.pack('<HH', width, height))
-
-        if fmt == 'rgb8':
-            # 8-bit RGB332: 3 bits red, 3 bits green, 2 bits blue
-            for r, g, b in pixels:
-                rgb8 = ((r & 0xE0) | ((g & 0xE0) >> 3) | (b >> 6))
-                f.write(bytes([rgb8]))
-        elif fmt == 'gs8':
-            # 8-bit grayscale (luma ~ Rec.601)
-            for r, g, b in pixels:
-                y = int(0.299 * r + 0.587 * g + 0.114 * b)
-                f.write(bytes([y]))
-        elif fmt == 'rgb565be':
-            # 16-bit RGB565, big-endian
-            for r, g, b in pixels:
-                rgb565 = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
-                f.write(struct.pack('>H', rgb565))
-        elif fmt == 'rgb565':
-            # 16-bit RGB565, little-endian (default)
-            for r, g, b in pixels:
-                rgb565 = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
-                f.write(struct.pack('<H', rgb565))
-        elif fmt == 'rgb24':
-            # 24-bit RGB, 8 bits per channel
-            for r, g, b in pixels:
-                f.write(bytes([r, g, b]))
-        elif fmt == 'bgra8888':
-            # 32-bit BGRA8888, 8 bits per channel (BGRA with alpha=255)
-            for r, g, b in pixels:
-                f.write(struct.pack('<BBBB', b, g, r, 255))
-        else:
-            print(f"Unknown format: {fmt}")
-            sys.exit(1)
+        _write_bin(f, width, height, encoded, fmt, rle)
 
-    print(f"Converted '{input_path}' to '{output_path}' ({width}x{height}, format: {fmt})")
+    kind = ', rle' if rle else ''
+    print(f"Converted '{input_path}' to '{output_path}' ({width}x{height}, format: {fmt}{kind})")
 
 def info_image(bin_path):
     with open(bin_path, 'rb') as f:
+        if f.read(4) == BUNDLE_MAGIC:
+            count = struct.unpack('<H', f.read(2))[0]
+            print(f"Bundle: {count} image(s)")
+            for _ in range(count):
+                name = f.read(f.read(1)[0]).decode()
+                offset, width, height, bpp, flags = struct.unpack('<IHHBB', f.read(10))
+                kind = ', rle' if flags & BUNDLE_FLAG_RLE else ''
+                print(f"  {name}: {width}x{height}, {bpp} bytes per pixel{kind}, offset {offset}")
+            return
+        f.seek(0)
         width, height = struct.unpack('<HH', f.read(4))
-        print(f"Image size: {width}x{height}")
+        if width & RLE_FLAG:
+            bpp = f.read(2)[0]
+            print(f"Image size: {width & ~RLE_FLAG}x{height} (rle, {bpp} bytes per pixel)")
+        else:
+            print(f"Image size: {width}x{height}")
         # Not printing pixel data, as format is now variable
 
-def convert_images(input_path, output_dir, fmt='rgb24'):
+def convert_images(input_path, output_dir, fmt='rgb24', rle=False):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     image_files = []
@@ -73,7 +132,53 @@ def convert_images(input_path, output_dir, fmt='rgb24'):
     for img_file in image_files:
         base = os.path.splitext(os.path.basename(img_file))[0]
         out_file = os.path.join(output_dir, base + '.bin')
-        convert_image(img_file, out_file, fmt)
+        convert_image(img_file, out_file, fmt, rle)
+
+# Bundle: many images in one file, read by infodisplay/spritesheet.py.
+# Magic, '<H' count, per image '<B' name length + UTF-8 name +
+# '<IHHBB' (offset, width, height, bytes per pixel, flags), then the
+# pixel blocks (raw rows, or RLE rows without a header if flags & 1).
+BUNDLE_MAGIC = b'AEIB'
+BUNDLE_FLAG_RLE = 0x01
+
+def build_bundle(images, fmt='rgb565', rle=False):
+    """images: [(name, width, height, RGB pixels)] -> bundle bytes."""
+    bpp = _FORMAT_BPP[fmt]
+    blocks = []
+    for name, width, height, pixels in images:
+        data = _encode_pixels(pixels, fmt)
+        if rle:
+            data = _rle_encode(data, width, height, bpp)
+        blocks.append(data)
+    index_size = 6 + sum(1 + len(name.encode()) + 10 for name, _, _, _ in images)
+    out = bytearray(BUNDLE_MAGIC)
+    out.extend(struct.pack('<H', len(images)))
+    offset = index_size
+    for (name, width, height, _), data in zip(images, blocks):
+        encoded_name = name.encode()
+        out.append(len(encoded_name))
+        out.extend(encoded_name)
+        out.extend(struct.pack('<IHHBB', offset, width, height, bpp, BUNDLE_FLAG_RLE if rle else 0))
+        offset += len(data)
+    for data in blocks:
+        out.extend(data)
+    return bytes(out)
+
+def bundle_images(input_path, output_path, fmt='rgb565', rle=False):
+    if os.path.isdir(input_path):
+        image_files = sorted(glob.glob(os.path.join(input_path, '*.png')))
+    else:
+        image_files = [input_path]
+    images = []
+    for img_file in image_files:
+        name = os.path.splitext(os.path.basename(img_file))[0]
+        width, height, pixels = _load_image(img_file)
+        images.append((name, width, height, pixels))
+    data = build_bundle(images, fmt, rle)
+    with open(output_path, 'wb') as f:
+        f.write(data)
+    kind = ', rle' if rle else ''
+    print(f"Bundled {len(images)} image(s) into '{output_path}' ({len(data)} bytes, format: {fmt}{kind})")
 
 def _expand_5_to_8(v):
     return (v << 3) | (v >> 2)
@@ -161,18 +266,17 @@ def _encode_pixels(pixels, fmt):
         sys.exit(1)
     return bytes(out)
 
-def convert_bin_image(input_path, output_path, in_fmt='rgb565be', out_fmt='bgra8888'):
+def convert_bin_image(input_path, output_path, in_fmt='rgb565be', out_fmt='bgra8888', rle=False):
     with open(input_path, 'rb') as f:
-        width, height = struct.unpack('<HH', f.read(4))
-        data = f.read()
+        width, height, data = _read_bin(f)
     pixels = _decode_pixels(data, width, height, in_fmt)
     encoded = _encode_pixels(pixels, out_fmt)
     with open(output_path, 'wb') as f:
-        f.write(struct.pack('<HH', width, height))
-        f.write(encoded)
-    print(f"Converted '{input_path}' to '{output_path}' ({width}x{height}, {in_fmt} -> {out_fmt})")
+        _write_bin(f, width, height, encoded, out_fmt, rle)
+    kind = ', rle' if rle else ''
+    print(f"Converted '{input_path}' to '{output_path}' ({width}x{height}, {in_fmt} -> {out_fmt}{kind})")
 
-def convert_bin_images(input_path, output_dir, in_fmt='rgb565be', out_fmt='bgra8888'):
+def convert_bin_images(input_path, output_dir, in_fmt='rgb565be', out_fmt='bgra8888', rle=False):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     bin_files = []
@@ -183,7 +287,7 @@ def convert_bin_images(input_path, output_dir, in_fmt='rgb565be', out_fmt='bgra8
     for bin_file in bin_files:
         base = os.path.splitext(os.path.basename(bin_file))[0]
         out_file = os.path.join(output_dir, base + '.bin')
-        convert_bin_image(bin_file, out_file, in_fmt, out_fmt)
+        convert_bin_image(bin_file, out_file, in_fmt, out_fmt, rle)
 
 def main():
     parser = argparse.ArgumentParser(description="Image format converter utility")
@@ -194,6 +298,8 @@ def main():
     convert_parser.add_argument('output', nargs='?', help='Output binary file or directory (default: input name with .bin)')
     convert_parser.add_argument('--format', choices=['rgb8', 'gs8', 'rgb565', 'rgb565be', 'rgb24', 'bgra8888'], default='rgb24',
                                help='Output format: rgb8, rgb565 (LE), rgb565be, rgb24, bgra8888 (default: rgb24)')
+    convert_parser.add_argument('--rle', action='store_true',
+                               help='Run-length encode rows (smaller icons with large flat areas)')
 
     convertbin_parser = subparsers.add_parser('convertbin', help='Convert BIN(s) between raw formats')
     convertbin_parser.add_argument('input', help='Input BIN file or directory')
@@ -202,6 +308,16 @@ def main():
                                   help='Input pixel format (default: rgb565, little-endian)')
     convertbin_parser.add_argument('--out-format', choices=['rgb8', 'gs8', 'rgb565', 'rgb565be', 'rgb24', 'bgra8888'], default='bgra8888',
                                    help='Output pixel format (default: bgra8888)')
+    convertbin_parser.add_argument('--rle', action='store_true',
+                                   help='Run-length encode rows (RLE input is always accepted)')
+
+    bundle_parser = subparsers.add_parser('bundle', help='Pack PNG image(s) into one indexed bundle file')
+    bundle_parser.add_argument('input', help='Input image file or directory')
+    bundle_parser.add_argument('output', help='Output bundle file')
+    bundle_parser.add_argument('--format', choices=['rgb8', 'gs8', 'rgb565', 'rgb565be', 'rgb24', 'bgra8888'], default='rgb565',
+                               help='Pixel format for every image (default: rgb565)')
+    bundle_parser.add_argument('--rle', action='store_true',
+                               help='Run-length encode each image')
 
     info_parser = subparsers.add_parser('info', help='Show info about binary image file')
     info_parser.add_argument('input', help='Input binary file')
@@ -211,19 +327,21 @@ def main():
     if args.command == 'convert':
         if os.path.isdir(args.input):
             output_dir = args.output if args.output else args.input
-            convert_images(args.input, output_dir, args.format)
+            convert_images(args.input, output_dir, args.format, args.rle)
         else:
             default_output = os.path.splitext(args.input)[0] + '.bin'
             output_file = args.output if args.output else default_output
-            convert_image(args.input, output_file, args.format)
+            convert_image(args.input, output_file, args.format, args.rle)
     elif args.command == 'convertbin':
         if os.path.isdir(args.input):
             output_dir = args.output if args.output else args.input
-            convert_bin_images(args.input, output_dir, args.in_format, args.out_format)
+            convert_bin_images(args.input, output_dir, args.in_format, args.out_format, args.rle)
         else:
             default_output = os.path.splitext(args.input)[0] + '.bin'
             output_file = args.output if args.output else default_output
-            convert_bin_image(args.input, output_file, args.in_format, args.out_format)
+            convert_bin_image(args.input, output_file, args.in_format, args.out_format, args.rle)
+    elif args.command == 'bundle':
+        bundle_images(args.input, args.output, args.format, args.rle)
     elif args.command == 'info':
         info_image(args.input)
     else: